@@ -0,0 +1,40 @@
+"""Add articles.sections_indexed_at to tell unindexed articles from sectionless ones
+
+Revision ID: a3b4c5d6e7f8
+Revises: f2a3b4c5d6e7
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision: str = "a3b4c5d6e7f8"
+down_revision: Union[str, None] = "f2a3b4c5d6e7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    article_columns = {column["name"] for column in inspector.get_columns("articles")}
+    if "sections_indexed_at" not in article_columns:
+        op.add_column("articles", sa.Column("sections_indexed_at", sa.DateTime(), nullable=True))
+        # Articles with sections were indexed; the rest are indexed lazily on first read
+        op.execute(
+            "UPDATE articles SET sections_indexed_at = CURRENT_TIMESTAMP "
+            "WHERE id IN (SELECT DISTINCT article_id FROM article_sections)"
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    article_columns = {column["name"] for column in inspector.get_columns("articles")}
+    if "sections_indexed_at" in article_columns:
+        op.drop_column("articles", "sections_indexed_at")
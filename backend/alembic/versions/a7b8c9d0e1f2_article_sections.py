@@ -0,0 +1,56 @@
+"""Add article_sections table with the section index of each article
+
+Revision ID: a7b8c9d0e1f2
+Revises: f6a7b8c9d0e1
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision: str = "a7b8c9d0e1f2"
+down_revision: Union[str, None] = "f6a7b8c9d0e1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    # Existing articles are indexed lazily from their stored text
+    if not inspector.has_table("article_sections"):
+        op.create_table(
+            "article_sections",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("article_id", sa.Integer(), nullable=False),
+            sa.Column("name", sa.String(length=50), nullable=False),
+            sa.Column("position", sa.Integer(), nullable=False),
+            sa.Column("start_page", sa.Integer(), nullable=False),
+            sa.Column("start_line", sa.Integer(), nullable=False),
+            sa.Column("end_page", sa.Integer(), nullable=False),
+            sa.Column("end_line", sa.Integer(), nullable=False),
+            sa.Column("char_start", sa.Integer(), nullable=False),
+            sa.Column("char_end", sa.Integer(), nullable=False),
+            sa.Column("content", sa.LargeBinary(), nullable=False),
+            sa.ForeignKeyConstraint(["article_id"], ["articles.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint("article_id", "name", name="uq_article_sections_article_name"),
+        )
+        op.create_index(op.f("ix_article_sections_id"), "article_sections", ["id"], unique=False)
+        op.create_index(
+            op.f("ix_article_sections_article_id"), "article_sections", ["article_id"], unique=False
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if inspector.has_table("article_sections"):
+        op.drop_index(op.f("ix_article_sections_article_id"), table_name="article_sections")
+        op.drop_index(op.f("ix_article_sections_id"), table_name="article_sections")
+        op.drop_table("article_sections")
@@ -0,0 +1,74 @@
+"""Add MinHash signatures, LSH buckets and articles.duplicate_of_id
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision: str = "b8c9d0e1f2a3"
+down_revision: Union[str, None] = "a7b8c9d0e1f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    article_columns = {column["name"] for column in inspector.get_columns("articles")}
+    if "duplicate_of_id" not in article_columns:
+        op.add_column("articles", sa.Column("duplicate_of_id", sa.Integer(), nullable=True))
+        op.create_foreign_key(
+            "fk_articles_duplicate_of_id",
+            "articles",
+            "articles",
+            ["duplicate_of_id"],
+            ["id"],
+            ondelete="SET NULL",
+        )
+        op.create_index(op.f("ix_articles_duplicate_of_id"), "articles", ["duplicate_of_id"], unique=False)
+
+    if not inspector.has_table("article_signatures"):
+        op.create_table(
+            "article_signatures",
+            sa.Column("article_id", sa.Integer(), nullable=False),
+            sa.Column("signature", sa.LargeBinary(), nullable=False),
+            sa.ForeignKeyConstraint(["article_id"], ["articles.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("article_id"),
+        )
+
+    if not inspector.has_table("article_lsh_buckets"):
+        op.create_table(
+            "article_lsh_buckets",
+            sa.Column("band", sa.Integer(), nullable=False),
+            sa.Column("bucket", sa.String(length=16), nullable=False),
+            sa.Column("article_id", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(["article_id"], ["articles.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("band", "bucket", "article_id"),
+        )
+        op.create_index(
+            "ix_article_lsh_buckets_band_bucket", "article_lsh_buckets", ["band", "bucket"], unique=False
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if inspector.has_table("article_lsh_buckets"):
+        op.drop_index("ix_article_lsh_buckets_band_bucket", table_name="article_lsh_buckets")
+        op.drop_table("article_lsh_buckets")
+    if inspector.has_table("article_signatures"):
+        op.drop_table("article_signatures")
+
+    article_columns = {column["name"] for column in inspector.get_columns("articles")}
+    if "duplicate_of_id" in article_columns:
+        op.drop_index(op.f("ix_articles_duplicate_of_id"), table_name="articles")
+        op.drop_constraint("fk_articles_duplicate_of_id", "articles", type_="foreignkey")
+        op.drop_column("articles", "duplicate_of_id")
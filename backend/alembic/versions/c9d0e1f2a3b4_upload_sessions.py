@@ -0,0 +1,51 @@
+"""Add upload_sessions table for resumable uploads
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision: str = "c9d0e1f2a3b4"
+down_revision: Union[str, None] = "b8c9d0e1f2a3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if not inspector.has_table("upload_sessions"):
+        op.create_table(
+            "upload_sessions",
+            sa.Column("id", sa.String(length=32), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("filename", sa.String(length=500), nullable=False),
+            sa.Column("extension", sa.String(length=10), nullable=False),
+            sa.Column("category_id", sa.Integer(), nullable=True),
+            sa.Column("total_size", sa.BigInteger(), nullable=False),
+            sa.Column("offset", sa.BigInteger(), nullable=False, server_default="0"),
+            sa.Column("temp_path", sa.String(length=500), nullable=False),
+            sa.Column("status", sa.String(length=20), nullable=True),
+            sa.Column("expires_at", sa.DateTime(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index(op.f("ix_upload_sessions_id"), "upload_sessions", ["id"], unique=False)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if inspector.has_table("upload_sessions"):
+        op.drop_index(op.f("ix_upload_sessions_id"), table_name="upload_sessions")
+        op.drop_table("upload_sessions")
@@ -0,0 +1,53 @@
+"""Add summaries table as a persistent summary cache
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision: str = "d0e1f2a3b4c5"
+down_revision: Union[str, None] = "c9d0e1f2a3b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if not inspector.has_table("summaries"):
+        op.create_table(
+            "summaries",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("file_hash", sa.String(length=64), nullable=False),
+            sa.Column("level", sa.String(length=20), nullable=False),
+            sa.Column("method", sa.String(length=20), nullable=False),
+            sa.Column("model", sa.String(length=100), nullable=False, server_default=""),
+            sa.Column("prompt_version", sa.String(length=20), nullable=False),
+            sa.Column("method_used", sa.String(length=20), nullable=False),
+            sa.Column("content", sa.Text(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint(
+                "file_hash", "level", "method", "model", "prompt_version",
+                name="uq_summaries_key",
+            ),
+        )
+        op.create_index(op.f("ix_summaries_id"), "summaries", ["id"], unique=False)
+        op.create_index(op.f("ix_summaries_file_hash"), "summaries", ["file_hash"], unique=False)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if inspector.has_table("summaries"):
+        op.drop_index(op.f("ix_summaries_file_hash"), table_name="summaries")
+        op.drop_index(op.f("ix_summaries_id"), table_name="summaries")
+        op.drop_table("summaries")
@@ -0,0 +1,49 @@
+"""Add ingestion_jobs table for background article ingestion
+
+Revision ID: d4e5f6a7b8c9
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision: str = "d4e5f6a7b8c9"
+down_revision: Union[str, None] = "a1b2c3d4e5f6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if not inspector.has_table("ingestion_jobs"):
+        op.create_table(
+            "ingestion_jobs",
+            sa.Column("id", sa.String(length=36), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("article_id", sa.Integer(), nullable=True),
+            sa.Column("status", sa.String(length=20), nullable=True),
+            sa.Column("stage", sa.String(length=30), nullable=True),
+            sa.Column("stages", sa.JSON(), nullable=True),
+            sa.Column("error", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+            sa.ForeignKeyConstraint(["article_id"], ["articles.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index(op.f("ix_ingestion_jobs_id"), "ingestion_jobs", ["id"], unique=False)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if inspector.has_table("ingestion_jobs"):
+        op.drop_index(op.f("ix_ingestion_jobs_id"), table_name="ingestion_jobs")
+        op.drop_table("ingestion_jobs")
@@ -0,0 +1,51 @@
+"""Add chunk_summaries table as a content-addressed cache of map summaries
+
+Revision ID: e1f2a3b4c5d6
+Revises: d0e1f2a3b4c5
+Create Date: 2026-10-16 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision: str = "e1f2a3b4c5d6"
+down_revision: Union[str, None] = "d0e1f2a3b4c5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if not inspector.has_table("chunk_summaries"):
+        op.create_table(
+            "chunk_summaries",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("chunk_hash", sa.String(length=64), nullable=False),
+            sa.Column("model", sa.String(length=100), nullable=False),
+            sa.Column("prompt_version", sa.String(length=20), nullable=False),
+            sa.Column("content", sa.Text(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint(
+                "chunk_hash", "model", "prompt_version", name="uq_chunk_summaries_key"
+            ),
+        )
+        op.create_index(op.f("ix_chunk_summaries_id"), "chunk_summaries", ["id"], unique=False)
+        op.create_index(
+            op.f("ix_chunk_summaries_chunk_hash"), "chunk_summaries", ["chunk_hash"], unique=False
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if inspector.has_table("chunk_summaries"):
+        op.drop_index(op.f("ix_chunk_summaries_chunk_hash"), table_name="chunk_summaries")
+        op.drop_index(op.f("ix_chunk_summaries_id"), table_name="chunk_summaries")
+        op.drop_table("chunk_summaries")
@@ -0,0 +1,43 @@
+"""Add stored_files table for content-addressed uploads
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision: str = "e5f6a7b8c9d0"
+down_revision: Union[str, None] = "d4e5f6a7b8c9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    # Existing flat uploads keep their paths; only new uploads are content-addressed
+    if not inspector.has_table("stored_files"):
+        op.create_table(
+            "stored_files",
+            sa.Column("file_hash", sa.String(length=64), nullable=False),
+            sa.Column("path", sa.String(length=500), nullable=False),
+            sa.Column("size", sa.BigInteger(), nullable=True),
+            sa.Column("ref_count", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint("file_hash"),
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if inspector.has_table("stored_files"):
+        op.drop_table("stored_files")
@@ -0,0 +1,43 @@
+"""Drop stored_files.ref_count: each stored file belongs to a single article
+
+Revision ID: f2a3b4c5d6e7
+Revises: e1f2a3b4c5d6
+Create Date: 2026-10-16 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision: str = "f2a3b4c5d6e7"
+down_revision: Union[str, None] = "e1f2a3b4c5d6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_ref_count(inspector) -> bool:
+    return inspector.has_table("stored_files") and any(
+        column["name"] == "ref_count" for column in inspector.get_columns("stored_files")
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    # articles.file_hash is unique, so the counter could never exceed one
+    if _has_ref_count(inspector):
+        op.drop_column("stored_files", "ref_count")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if inspector.has_table("stored_files") and not _has_ref_count(inspector):
+        op.add_column(
+            "stored_files",
+            sa.Column("ref_count", sa.Integer(), nullable=False, server_default="1"),
+        )
@@ -0,0 +1,42 @@
+"""Add article_texts table with compressed per-page text
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision: str = "f6a7b8c9d0e1"
+down_revision: Union[str, None] = "e5f6a7b8c9d0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    # Existing articles are backfilled lazily the first time their text is read
+    if not inspector.has_table("article_texts"):
+        op.create_table(
+            "article_texts",
+            sa.Column("article_id", sa.Integer(), nullable=False),
+            sa.Column("page_number", sa.Integer(), nullable=False),
+            sa.Column("char_count", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("content", sa.LargeBinary(), nullable=False),
+            sa.ForeignKeyConstraint(["article_id"], ["articles.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("article_id", "page_number"),
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if inspector.has_table("article_texts"):
+        op.drop_table("article_texts")
@@ -1,32 +1,58 @@
-from fastapi import APIRouter, Depends, HTTPException, File, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, File, Query, Request, UploadFile
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Dict, Iterator, List, Literal, Optional
 from pydantic import BaseModel, HttpUrl
+import asyncio
+import json
 import os
-import shutil
-import requests
+import httpx
 from datetime import datetime
 from pathlib import Path
-from bs4 import BeautifulSoup
-from app.core.database import get_db
+from slugify import slugify
+from app.core.database import SessionLocal, get_db
 from app.core.security import get_current_user
 from app.core.schemas import (
     ArticleResponse,
-    ArticleCreate,
     ArticleUpdate,
     BatchSummaryRequest,
     BatchSummaryResponse,
     SummaryResult,
     MultiDocumentSummaryRequest,
     MultiDocumentSummaryResponse,
+    IngestionJobResponse,
+    UploadSessionCreate,
+    UploadSessionResponse,
+    ArticlePageText,
+    ArticleTextResponse,
+    ArticleSectionInfo,
+    ArticleSectionResponse,
 )
-from app.services.metadata_extractor import MetadataExtractor
 from app.services.classifier import ArticleClassifier
 from app.services.bibliography_generator import BibliographyGenerator
 from app.services.summarizer import ArticleSummarizer
-from app.services.topic_classifier import TopicClassifier
 from app.services.multi_document_summarizer import MultiDocumentSummarizer
-from app.models import User, Article, Category, UserLibrary
+from app.services.parsed_document import get_parsed_document_store
+from app.services.article_text_store import get_article_text_store
+from app.services.section_index import get_section_index, section_content
+from app.services.summary_cache import get_chunk_summary_cache, get_summary_cache
+from app.services.ingestion import assign_topics, get_ingestion_pipeline
+from app.services.file_storage import (
+    ContentAddressedStore,
+    FileTooLargeError,
+    StagedUpload,
+    stage_upload,
+)
+from app.services.upload_sessions import (
+    ResumableUploads,
+    UploadIncomplete,
+    UploadOffsetMismatch,
+    UploadRangeMismatch,
+    parse_content_range,
+)
+from app.services.http_fetcher import get_http_fetcher
+from app.services.pdf_link_resolver import get_pdf_link_resolver
+from app.models import User, Article, Category, UserLibrary, IngestionJob, UploadSession
 from app.core.config import get_settings
 import logging
 
@@ -35,8 +61,13 @@ logger = logging.getLogger(__name__)
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent.parent
 UPLOAD_DIR = BASE_DIR / "data" / "uploads"
+upload_store = ContentAddressedStore(UPLOAD_DIR)
 settings = get_settings()
-topic_classifier = TopicClassifier()
+upload_sessions = ResumableUploads(UPLOAD_DIR, ttl_seconds=settings.upload_session_ttl)
+
+MAX_BULK_URLS = 200
+# Keep proxies (nginx) from buffering server-sent events
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
 
 
 class UrlUpload(BaseModel):
@@ -44,16 +75,9 @@ class UrlUpload(BaseModel):
     category_id: Optional[int] = None
 
 
-def _assign_topics(article: Article, extra_text: str = ""):
-    keywords = article.keywords or []
-    abstract = article.abstract or ""
-    detected = topic_classifier.detect_topics(
-        title=article.title or "",
-        abstract=abstract,
-        keywords=keywords,
-        extra_text=extra_text or "",
-    )
-    article.auto_topics = detected
+class BulkUrlUpload(BaseModel):
+    urls: List[HttpUrl]
+    category_id: Optional[int] = None
 
 
 def _ensure_user_library_entry(db: Session, user_id: int, article_id: int):
@@ -66,16 +90,19 @@ def _ensure_user_library_entry(db: Session, user_id: int, article_id: int):
         db.add(UserLibrary(user_id=user_id, article_id=article_id, status="unread"))
 
 
-@router.post("/upload", response_model=ArticleResponse)
+@router.post("/upload", response_model=IngestionJobResponse, status_code=202)
 async def upload_article(
     file: UploadFile = File(...),
     category_id: int = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    try:
-        UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    """
+    Persist the uploaded file and queue it for background ingestion.
 
+    Returns the ingestion job; poll `/api/articles/jobs/{job_id}` for progress.
+    """
+    try:
         if not file.filename:
             raise HTTPException(status_code=400, detail="No filename provided")
 
@@ -83,67 +110,16 @@ async def upload_article(
         if file_extension.lower() not in ["pdf", "txt"]:
             raise HTTPException(status_code=400, detail="Only PDF and TXT files allowed")
 
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        file_name = f"{current_user.id}_{timestamp}_{file.filename}"
-        file_path = UPLOAD_DIR / file_name
-
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-
-        logger.info(f"File saved to: {file_path}")
-
-        metadata = {}
-        text_excerpt = ""
-        if file_extension.lower() == "pdf":
-            try:
-                metadata = MetadataExtractor.extract_from_pdf(str(file_path))
-                text_excerpt = metadata.get("text_excerpt") or ""
-            except Exception as e:
-                logger.error(f"Error extracting PDF metadata: {e}")
-                metadata = {}
-
-        file_hash = MetadataExtractor.calculate_file_hash(str(file_path))
-        file_size = os.path.getsize(file_path)
+        # Hash while streaming so duplicates are rejected before any parsing
+        try:
+            staged = await stage_upload(file, upload_store.root, settings.max_file_size)
+        except FileTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
 
-        existing_article = db.query(Article).filter(
-            Article.file_hash == file_hash
-        ).first()
-        if existing_article:
-            os.remove(file_path)
-            raise HTTPException(status_code=400, detail="File already uploaded")
-
-        # Ensure title is never None
-        title = metadata.get("title") or file.filename or "Untitled Article"
-        if not title.strip():
-            title = "Untitled Article"
-
-        article = Article(
-            title=title,
-            authors=metadata.get("authors", []),
-            abstract=metadata.get("abstract"),
-            keywords=metadata.get("keywords", []),
-            publication_year=metadata.get("publication_year"),
-            journal=metadata.get("journal"),
-            doi=metadata.get("doi"),
-            file_path=str(file_path),
-            file_size=file_size,
-            file_hash=file_hash,
-            category_id=category_id,
-            uploaded_by=current_user.id,
-            status="active",
+        return _accept_staged_upload(
+            db, current_user, staged, file_extension, file.filename, category_id
         )
 
-        _assign_topics(article, extra_text=text_excerpt)
-
-        db.add(article)
-        db.flush()
-        _ensure_user_library_entry(db, current_user.id, article.id)
-        db.commit()
-        db.refresh(article)
-        
-        logger.info(f"Article created with ID: {article.id}")
-        return article
-
     except HTTPException:
         raise
     except Exception as e:
@@ -151,144 +127,255 @@ async def upload_article(
         raise HTTPException(status_code=500, detail=f"Error uploading file: {str(e)}")
 
 
-def extract_pdf_url_from_html(html_content: str, base_url: str) -> Optional[str]:
+def _accept_staged_upload(
+    db: Session,
+    current_user: User,
+    staged: StagedUpload,
+    file_extension: str,
+    title: Optional[str],
+    category_id: Optional[int],
+) -> IngestionJob:
+    """Reject byte-identical duplicates, store the staged file and queue it for ingestion."""
+    existing_article = db.query(Article).filter(
+        Article.file_hash == staged.file_hash
+    ).first()
+    if existing_article and existing_article.status != "failed":
+        staged.discard()
+        raise HTTPException(status_code=400, detail="File already uploaded")
+
+    stored = upload_store.acquire(db, staged, file_extension)
+    logger.info(f"File saved to: {stored.path}")
+
+    job = _queue_ingestion(
+        db,
+        current_user,
+        file_path=stored.path,
+        file_hash=staged.file_hash,
+        file_size=staged.size,
+        title=title,
+        category_id=category_id,
+        failed_article=existing_article,
+    )
+    logger.info(f"Article {job.article_id} queued for ingestion (job {job.id})")
+    return job
+
+
+def _get_upload_session(db: Session, session_id: str, current_user: User) -> UploadSession:
+    session = db.query(UploadSession).filter(
+        UploadSession.id == session_id,
+        UploadSession.user_id == current_user.id,
+    ).first()
+    if not session or session.status != "open":
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    if session.expires_at and session.expires_at < datetime.utcnow():
+        upload_sessions.abort(db, session)
+        raise HTTPException(status_code=410, detail="Upload session expired")
+    return session
+
+
+@router.post("/uploads", response_model=UploadSessionResponse, status_code=201)
+def create_upload_session(
+    data: UploadSessionCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
     """
-    Enhanced PDF extraction supporting Google Scholar, ResearchGate,
-    Academia.edu, and other academic platforms.
+    Start a resumable upload.
+
+    Send the file with `PUT /api/articles/uploads/{id}` and a
+    `Content-Range: bytes start-end/total` header (ranges may be retried or
+    resumed from the session `offset`), then `POST .../complete`.
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
-    from urllib.parse import urljoin, urlparse, parse_qs
-
-    # Google Scholar specific patterns
-    if 'scholar.google' in base_url:
-        # Look for PDF links in Google Scholar results
-        for link in soup.find_all('a', href=True):
-            href = link.get('href', '')
-            # Google Scholar often has [PDF] links
-            if link.text.strip().upper() == '[PDF]' or 'PDF' in link.text:
-                pdf_url = urljoin(base_url, href)
-                return pdf_url
-
-        # Check for gs_ggsW class (Google Scholar's PDF viewer)
-        gs_link = soup.find('div', class_='gs_ggsW')
-        if gs_link:
-            pdf_link = gs_link.find('a', href=True)
-            if pdf_link:
-                return urljoin(base_url, pdf_link['href'])
-
-    # ResearchGate specific patterns
-    if 'researchgate.net' in base_url:
-        # Look for download button
-        download_link = soup.find('a', {'data-test-id': 'work-download-button'})
-        if download_link and download_link.get('href'):
-            return urljoin(base_url, download_link['href'])
-
-    # Academia.edu specific patterns
-    if 'academia.edu' in base_url:
-        download_link = soup.find('a', class_=lambda x: x and 'download' in x.lower() if x else False)
-        if download_link and download_link.get('href'):
-            return urljoin(base_url, download_link['href'])
-
-    # ArXiv specific patterns
-    if 'arxiv.org' in base_url:
-        # Convert abstract URL to PDF URL
-        parsed = urlparse(base_url)
-        if '/abs/' in parsed.path:
-            pdf_path = parsed.path.replace('/abs/', '/pdf/') + '.pdf'
-            return f"{parsed.scheme}://{parsed.netloc}{pdf_path}"
-
-    # General PDF extraction patterns (ordered by reliability)
-    pdf_patterns = [
-        # Meta tags (most reliable)
-        ('meta', {'name': 'citation_pdf_url'}),
-        ('meta', {'property': 'og:url', 'content': lambda x: x and '.pdf' in x.lower()}),
-
-        # Link tags
-        ('link', {'rel': 'alternate', 'type': 'application/pdf'}),
-
-        # Buttons and download links (common in academic sites)
-        ('a', {'class': lambda x: x and any(c in ' '.join(x).lower() for c in ['download-pdf', 'pdf-download', 'download-button']) if x else False}),
-        ('a', {'id': lambda x: x and 'pdf' in x.lower() if x else False}),
-        ('button', {'class': lambda x: x and 'pdf' in ' '.join(x).lower() if x else False}),
-
-        # Direct PDF links
-        ('a', {'href': lambda x: x and x.lower().endswith('.pdf')}),
-        ('a', {'href': lambda x: x and '/pdf/' in x.lower()}),
-
-        # Text-based detection
-        ('a', {'title': lambda x: x and 'pdf' in x.lower() if x else False}),
-        ('a', {'class': lambda x: x and 'download' in ' '.join(x).lower() if x else False}),
-    ]
-
-    for tag, attrs in pdf_patterns:
-        element = soup.find(tag, attrs)
-        if element:
-            if tag == 'meta':
-                pdf_url = element.get('content')
-            elif tag == 'link':
-                pdf_url = element.get('href')
-            elif tag == 'button':
-                # For buttons, look for onclick or data attributes
-                pdf_url = element.get('data-url') or element.get('data-href')
-                if not pdf_url:
-                    continue
-            else:
-                pdf_url = element.get('href')
+    file_extension = data.filename.split(".")[-1].lower()
+    if file_extension not in ["pdf", "txt"]:
+        raise HTTPException(status_code=400, detail="Only PDF and TXT files allowed")
+    if data.size <= 0:
+        raise HTTPException(status_code=400, detail="size must be positive")
 
-            if pdf_url:
-                # Clean and normalize URL
-                if not pdf_url.startswith('http'):
-                    pdf_url = urljoin(base_url, pdf_url)
-                return pdf_url
+    try:
+        return upload_sessions.create(
+            db,
+            current_user.id,
+            filename=data.filename,
+            extension=file_extension,
+            total_size=data.size,
+            max_bytes=settings.max_file_size,
+            category_id=data.category_id,
+        )
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
 
-    # Last resort: look for any link containing "pdf" in visible text
-    for link in soup.find_all('a', href=True):
-        text = link.get_text().lower()
-        if 'download' in text and 'pdf' in text:
-            href = link['href']
-            if not href.startswith('http'):
-                href = urljoin(base_url, href)
-            return href
 
-    return None
+@router.get("/uploads/{session_id}", response_model=UploadSessionResponse)
+def get_upload_session(
+    session_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    return _get_upload_session(db, session_id, current_user)
 
 
-@router.post("/upload-url", response_model=ArticleResponse)
-async def upload_article_from_url(
-    data: UrlUpload,
+@router.put("/uploads/{session_id}", response_model=UploadSessionResponse)
+async def upload_session_range(
+    session_id: str,
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
+    session = _get_upload_session(db, session_id, current_user)
     try:
-        UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+        start, end, total = parse_content_range(request.headers.get("content-range"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if total != session.total_size:
+        raise HTTPException(status_code=400, detail="Content-Range total does not match the session size")
+
+    try:
+        return await upload_sessions.append(db, session, start, request.stream(), end=end)
+    except UploadRangeMismatch as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except UploadOffsetMismatch as e:
+        raise HTTPException(
+            status_code=409,
+            detail=str(e),
+            headers={"Upload-Offset": str(e.expected)},
+        )
+    except FileTooLargeError:
+        raise HTTPException(status_code=413, detail="Range exceeds the declared upload size")
+
+
+@router.post("/uploads/{session_id}/complete", response_model=IngestionJobResponse, status_code=202)
+def complete_upload_session(
+    session_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    session = _get_upload_session(db, session_id, current_user)
+    try:
+        staged = upload_sessions.finalize(db, session)
+    except UploadIncomplete as e:
+        raise HTTPException(status_code=409, detail=str(e), headers={"Upload-Offset": str(session.offset)})
+
+    return _accept_staged_upload(
+        db, current_user, staged, session.extension, session.filename, session.category_id
+    )
 
-        url_str = str(data.url)
+
+@router.delete("/uploads/{session_id}")
+def abort_upload_session(
+    session_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    session = _get_upload_session(db, session_id, current_user)
+    upload_sessions.abort(db, session)
+    return {"message": "Upload session aborted"}
+
+
+def _queue_ingestion(
+    db: Session,
+    current_user: User,
+    file_path: str,
+    file_hash: str,
+    file_size: int,
+    title: Optional[str],
+    category_id: Optional[int],
+    failed_article: Optional[Article] = None,
+) -> IngestionJob:
+    """
+    Create a placeholder article for a stored file and hand it to the ingestion pipeline.
+
+    A previous upload of the same file whose ingestion failed still owns the
+    (unique) hash, so that row is reset and ingested again instead.
+    """
+    # Ensure title is never None; the metadata stage replaces it when possible
+    title = (title or "").strip() or "Untitled Article"
+
+    article = failed_article or Article(file_hash=file_hash)
+    article.title = title
+    article.file_path = file_path
+    article.file_size = file_size
+    article.category_id = category_id
+    article.uploaded_by = current_user.id
+    article.status = "processing"
+    article.duplicate_of_id = None
+
+    db.add(article)
+    db.flush()
+    _ensure_user_library_entry(db, current_user.id, article.id)
+    db.commit()
+    db.refresh(article)
+
+    return get_ingestion_pipeline().enqueue(db, article, current_user.id)
+
+
+@router.get("/jobs/{job_id}", response_model=IngestionJobResponse)
+def get_ingestion_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    job = db.query(IngestionJob).filter(IngestionJob.id == job_id).first()
+    if not job or job.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+def extract_pdf_url_from_html(html_content: str, base_url: str) -> Optional[str]:
+    """
+    Enhanced PDF extraction supporting Google Scholar, ResearchGate,
+    Academia.edu, and other academic platforms.
+    """
+    return get_pdf_link_resolver().resolve(html_content, base_url)
+
+
+async def _ingest_url(
+    url_str: str,
+    category_id: Optional[int],
+    current_user: User,
+    db: Session,
+) -> IngestionJob:
+    """
+    Download a URL (resolving landing pages to their PDF) and queue it for ingestion.
+
+    Raises HTTPException with the status the single-URL endpoint reports.
+    """
+    try:
         logger.info(f"Downloading from URL: {url_str}")
 
-        response = requests.get(url_str, timeout=30, headers={
-            'User-Agent': 'Mozilla/5.0 (compatible; SIGRAA/1.0)'
-        })
-        response.raise_for_status()
+        fetcher = get_http_fetcher()
+        resolver = get_pdf_link_resolver()
+
+        # A landing page seen recently goes straight to its PDF
+        cached_pdf_url = resolver.lookup(url_str)
+        fetch_url = cached_pdf_url or url_str
+        result = await fetcher.fetch(fetch_url, upload_store.root, settings.max_file_size)
 
-        content_type = response.headers.get('Content-Type', '').lower()
-        
-        if 'text/html' in content_type:
+        if result.is_html and cached_pdf_url:
+            raise HTTPException(
+                status_code=400,
+                detail="The linked PDF URL returned an HTML page. Please provide a direct PDF URL."
+            )
+
+        if result.is_html:
             logger.info("HTML page detected, attempting to extract PDF URL")
-            pdf_url = extract_pdf_url_from_html(response.text, url_str)
-            
+            pdf_url = resolver.resolve(result.html, result.url, cache_key=url_str)
+
             if pdf_url:
                 logger.info(f"Found PDF URL: {pdf_url}")
-                response = requests.get(pdf_url, timeout=30, headers={
-                    'User-Agent': 'Mozilla/5.0 (compatible; SIGRAA/1.0)'
-                })
-                response.raise_for_status()
-                content_type = response.headers.get('Content-Type', '').lower()
+                result = await fetcher.fetch(pdf_url, upload_store.root, settings.max_file_size)
+                if result.is_html:
+                    raise HTTPException(
+                        status_code=400,
+                        detail="The linked PDF URL returned an HTML page. Please provide a direct PDF URL."
+                    )
             else:
                 raise HTTPException(
                     status_code=400, 
                     detail="Could not find a PDF download link on this page. Please provide a direct PDF URL."
                 )
-        
+
+        content_type = result.content_type
         if 'pdf' in content_type:
             file_extension = 'pdf'
         elif 'text/plain' in content_type:
@@ -296,77 +383,104 @@ async def upload_article_from_url(
         else:
             file_extension = 'pdf'
 
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
         url_filename = url_str.split('/')[-1].split('?')[0] or 'article'
-        file_name = f"{current_user.id}_{timestamp}_{url_filename}.{file_extension}"
-        file_path = UPLOAD_DIR / file_name
-
-        with open(file_path, 'wb') as f:
-            f.write(response.content)
-
-        logger.info(f"File downloaded to: {file_path}")
-
-        metadata = {}
-        text_excerpt = ""
-        if file_extension == 'pdf':
-            try:
-                metadata = MetadataExtractor.extract_from_pdf(str(file_path))
-                text_excerpt = metadata.get("text_excerpt") or ""
-            except Exception as e:
-                logger.error(f"Error extracting PDF metadata: {e}")
-
-        file_hash = MetadataExtractor.calculate_file_hash(str(file_path))
-        file_size = os.path.getsize(file_path)
+        staged = result.staged
 
         existing_article = db.query(Article).filter(
-            Article.file_hash == file_hash
+            Article.file_hash == staged.file_hash
         ).first()
-        if existing_article:
-            os.remove(file_path)
+        if existing_article and existing_article.status != "failed":
+            staged.discard()
             raise HTTPException(status_code=400, detail="Article already exists in database")
 
-        # Ensure title is never None
-        title = metadata.get("title") or url_filename or "Untitled Article"
-        if not title.strip():
-            title = "Untitled Article"
-
-        article = Article(
-            title=title,
-            authors=metadata.get("authors", []),
-            abstract=metadata.get("abstract"),
-            keywords=metadata.get("keywords", []),
-            publication_year=metadata.get("publication_year"),
-            journal=metadata.get("journal"),
-            doi=metadata.get("doi"),
-            file_path=str(file_path),
-            file_size=file_size,
-            file_hash=file_hash,
-            category_id=data.category_id,
-            uploaded_by=current_user.id,
-            status="active",
-        )
-
-        _assign_topics(article, extra_text=text_excerpt)
+        stored = upload_store.acquire(db, staged, file_extension)
+        logger.info(f"File downloaded to: {stored.path}")
 
-        db.add(article)
-        db.flush()
-        _ensure_user_library_entry(db, current_user.id, article.id)
-        db.commit()
-        db.refresh(article)
-        
-        logger.info(f"Article created from URL with ID: {article.id}")
-        return article
+        job = _queue_ingestion(
+            db,
+            current_user,
+            file_path=stored.path,
+            file_hash=staged.file_hash,
+            file_size=staged.size,
+            title=url_filename,
+            category_id=category_id,
+            failed_article=existing_article,
+        )
+        logger.info(f"Article {job.article_id} from URL queued for ingestion (job {job.id})")
+        return job
 
-    except requests.RequestException as e:
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except httpx.HTTPError as e:
         logger.error(f"Error downloading from URL: {e}")
         raise HTTPException(status_code=400, detail=f"Failed to download from URL: {str(e)}")
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error uploading from URL: {e}", exc_info=True)
+        db.rollback()
         raise HTTPException(status_code=500, detail=f"Error processing URL: {str(e)}")
 
 
+@router.post("/upload-url", response_model=IngestionJobResponse, status_code=202)
+async def upload_article_from_url(
+    data: UrlUpload,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    return await _ingest_url(str(data.url), data.category_id, current_user, db)
+
+
+@router.post("/upload-urls")
+async def upload_articles_from_urls(
+    data: BulkUrlUpload,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Ingest a reading list of URLs concurrently.
+
+    Downloads share the pooled fetcher, so per-host concurrency and request
+    spacing still apply. Each URL commits on its own database session, so a
+    failed URL rolls back only its own work. Results stream back as NDJSON,
+    one line per URL in completion order:
+    {"url", "success", "job_id", "article_id", "status_code", "error"}
+    """
+    urls = list(dict.fromkeys(str(url) for url in data.urls))
+    if not urls:
+        raise HTTPException(status_code=400, detail="urls cannot be empty.")
+    if len(urls) > MAX_BULK_URLS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Maximum {MAX_BULK_URLS} URLs allowed per request."
+        )
+
+    slots = asyncio.Semaphore(settings.bulk_url_concurrency)
+
+    async def ingest(url_str: str) -> dict:
+        async with slots:
+            url_db = SessionLocal()
+            try:
+                job = await _ingest_url(url_str, data.category_id, current_user, url_db)
+                return {
+                    "url": url_str,
+                    "success": True,
+                    "job_id": job.id,
+                    "article_id": job.article_id,
+                    "status_code": 202,
+                }
+            except HTTPException as e:
+                return {"url": url_str, "success": False, "status_code": e.status_code, "error": e.detail}
+            finally:
+                url_db.close()
+
+    async def results():
+        for finished in asyncio.as_completed([ingest(url) for url in urls]):
+            yield json.dumps(await finished) + "\n"
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
 @router.get("/", response_model=List[ArticleResponse])
 def list_articles(
     skip: int = 0,
@@ -459,11 +573,76 @@ def get_article_file(
 
     return FileResponse(
         path=article.file_path,
-        filename=os.path.basename(article.file_path),
+        filename=f"{slugify(article.title or 'article')}{Path(article.file_path).suffix}",
         media_type="application/pdf"
     )
 
 
+@router.get("/{article_id}/text", response_model=ArticleTextResponse)
+def get_article_text(
+    article_id: int,
+    start_page: int = Query(1, ge=1),
+    end_page: Optional[int] = Query(None, ge=1),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    article = db.query(Article).filter(Article.id == article_id).first()
+    if not article:
+        raise HTTPException(status_code=404, detail="Article not found")
+    if end_page is not None and end_page < start_page:
+        raise HTTPException(status_code=400, detail="end_page must be >= start_page")
+
+    store = get_article_text_store()
+    if not store.ensure(db, article):
+        raise HTTPException(status_code=404, detail="No text available for this article")
+
+    pages = store.get_pages(db, article.id, start_page, end_page)
+    return ArticleTextResponse(
+        article_id=article.id,
+        page_count=store.page_count(db, article.id),
+        pages=[ArticlePageText(page_number=n, text=text) for n, text in pages],
+    )
+
+
+@router.get("/{article_id}/sections", response_model=List[ArticleSectionInfo])
+def list_article_sections(
+    article_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    article = db.query(Article).filter(Article.id == article_id).first()
+    if not article:
+        raise HTTPException(status_code=404, detail="Article not found")
+
+    index = get_section_index()
+    index.ensure(db, article)
+    return index.list_sections(db, article.id)
+
+
+@router.get("/{article_id}/sections/{name}", response_model=ArticleSectionResponse)
+def get_article_section(
+    article_id: int,
+    name: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    article = db.query(Article).filter(Article.id == article_id).first()
+    if not article:
+        raise HTTPException(status_code=404, detail="Article not found")
+
+    index = get_section_index()
+    index.ensure(db, article)
+    section = index.get_section(db, article.id, name.lower())
+    if not section:
+        raise HTTPException(status_code=404, detail=f"Section '{name}' not found")
+
+    return ArticleSectionResponse(
+        **ArticleSectionInfo.model_validate(section).model_dump(),
+        article_id=article.id,
+        content=section_content(section),
+    )
+
+
 @router.put("/{article_id}", response_model=ArticleResponse)
 def update_article(
     article_id: int,
@@ -482,6 +661,10 @@ def update_article(
     for field, value in update_data.items():
         setattr(article, field, value)
 
+    # Abstract and keywords are part of the summarized text
+    if {"abstract", "keywords"} & update_data.keys():
+        get_summary_cache().invalidate(db, article.file_hash)
+
     db.add(article)
     db.commit()
     db.refresh(article)
@@ -501,11 +684,24 @@ def delete_article(
     if article.uploaded_by != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    if os.path.exists(article.file_path):
-        os.remove(article.file_path)
+    file_hash = article.file_hash
+    file_path = upload_store.release(db, file_hash) or article.file_path
+    if file_hash:
+        get_summary_cache().invalidate(db, file_hash)
+
+    # Near-duplicates linked to this article become standalone articles again
+    for duplicate in db.query(Article).filter(Article.duplicate_of_id == article.id):
+        duplicate.duplicate_of_id = None
+        duplicate.status = "active"
+        assign_topics(duplicate)
 
     db.delete(article)
     db.commit()
+
+    # Files go only once the deletion is committed; legacy uploads have a flat path
+    upload_store.unlink(file_path)
+    if file_hash:
+        get_parsed_document_store().delete(file_hash)
     return {"message": "Article deleted"}
 
 
@@ -522,7 +718,7 @@ def summarize_articles(
     if payload.combined_max_sentences is not None and payload.combined_max_sentences <= 0:
         raise HTTPException(status_code=400, detail="combined_max_sentences must be positive.")
 
-    summarizer = ArticleSummarizer(settings.groq_api_key)
+    summarizer = ArticleSummarizer(settings.groq_api_key, db=db)
     results: List[SummaryResult] = []
     combined_sources: List[str] = []
 
@@ -538,18 +734,11 @@ def summarize_articles(
             )
             continue
 
+        config = summarizer.level_config.get(payload.level, summarizer.level_config["detailed"])
         try:
-            # Get article text with appropriate max_pages for the level
-            config = summarizer.level_config.get(payload.level, summarizer.level_config["detailed"])
-            article_text = summarizer.get_article_text(article, max_pages=config["max_pages"])
-            if not article_text:
-                raise ValueError("Article has no extractable text to summarize.")
-
-            summary, method_used = summarizer.summarize_text(
-                article_text,
-                method=payload.method,
-                max_sentences=config["max_sentences"],
-                level=payload.level,
+            # Same pipeline (and cache entries) as the single-article endpoints
+            summary, method_used, cached = summarizer.summarize_article_cached(
+                article, method=payload.method, level=payload.level
             )
 
             results.append(
@@ -559,9 +748,13 @@ def summarize_articles(
                     success=True,
                     summary=summary,
                     method=method_used,
+                    cached=cached,
                 )
             )
-            combined_sources.append(article_text)
+            if payload.combined:
+                combined_sources.append(
+                    summarizer.get_article_text(article, max_pages=config["max_pages"])
+                )
         except Exception as exc:
             logger.error("Failed to summarize article %s: %s", article.id, exc)
             results.append(
@@ -594,6 +787,113 @@ def summarize_articles(
     )
 
 
+@router.get("/summaries/cache")
+def get_summary_cache_stats(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    stats = get_summary_cache().stats(db)
+    stats["chunks"] = get_chunk_summary_cache().stats(db)
+    return stats
+
+
+def _sse(event: str, data: Dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _stream_summary_events(
+    summarizer: ArticleSummarizer, article: Article, method: str, level: str
+) -> Iterator[str]:
+    yield _sse("start", {"article_id": article.id, "title": article.title})
+    try:
+        for event, data in summarizer.stream_article(article, method=method, level=level):
+            yield _sse(event, {"article_id": article.id, **data})
+    except Exception as exc:
+        logger.error("Failed to stream summary for article %s: %s", article.id, exc)
+        yield _sse("error", {"article_id": article.id, "error": str(exc)})
+
+
+@router.get("/{article_id}/summary/stream")
+def stream_article_summary(
+    article_id: int,
+    level: Literal["executive", "detailed", "exhaustive"] = "detailed",
+    method: Literal["auto", "local", "groq"] = "auto",
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Stream an article summary as server-sent events.
+
+    Events: ``start``, ``progress`` (chunked documents: per mapped chunk and
+    at the reduce step), ``token`` (``{"text"}`` as the model generates it),
+    then ``done`` (``{"method", "cached"}``) or ``error``.
+    """
+    article = db.query(Article).filter(Article.id == article_id, Article.status == "active").first()
+    if not article:
+        raise HTTPException(status_code=404, detail="Article not found")
+
+    summarizer = ArticleSummarizer(settings.groq_api_key, db=db)
+    return StreamingResponse(
+        _stream_summary_events(summarizer, article, method, level),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+@router.post("/summaries/batch/stream")
+def stream_article_summaries(
+    payload: BatchSummaryRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Streaming variant of ``/summaries/batch``.
+
+    Articles are summarized in order, each with the events of
+    ``/{article_id}/summary/stream`` tagged with ``article_id``. A requested
+    combined summary follows as a ``combined`` event, then ``end``.
+    """
+    if not payload.article_ids:
+        raise HTTPException(status_code=400, detail="article_ids cannot be empty.")
+    if payload.combined_max_sentences is not None and payload.combined_max_sentences <= 0:
+        raise HTTPException(status_code=400, detail="combined_max_sentences must be positive.")
+
+    summarizer = ArticleSummarizer(settings.groq_api_key, db=db)
+    config = summarizer.level_config.get(payload.level, summarizer.level_config["detailed"])
+
+    def events() -> Iterator[str]:
+        combined_sources: List[str] = []
+        for article_id in payload.article_ids:
+            article = db.query(Article).filter(Article.id == article_id, Article.status == "active").first()
+            if not article:
+                yield _sse("error", {"article_id": article_id, "error": "Article not found."})
+                continue
+            yield from _stream_summary_events(summarizer, article, payload.method, payload.level)
+            if payload.combined:
+                try:
+                    combined_sources.append(
+                        summarizer.get_article_text(article, max_pages=config["max_pages"])
+                    )
+                except Exception as exc:
+                    logger.warning("Failed to read text of article %s: %s", article.id, exc)
+
+        if payload.combined and combined_sources:
+            try:
+                combined_summary, combined_method = summarizer.summarize_text(
+                    " ".join(combined_sources),
+                    method=payload.method,
+                    max_sentences=payload.combined_max_sentences or config["max_sentences"],
+                    level=payload.level,
+                )
+                yield _sse("combined", {"summary": combined_summary, "method": combined_method})
+            except Exception as exc:
+                logger.warning("Failed to generate combined summary: %s", exc)
+                yield _sse("error", {"article_id": None, "error": str(exc)})
+        yield _sse("end", {})
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
 @router.get("/{article_id}/bibliography/{format}")
 def get_article_bibliography(
     article_id: int,
@@ -696,7 +996,7 @@ def summarize_multiple_documents(
         articles.append(article)
 
     # Generate individual summaries first
-    summarizer = ArticleSummarizer(settings.groq_api_key)
+    summarizer = ArticleSummarizer(settings.groq_api_key, db=db)
     individual_summaries = []
 
     logger.info(f"Generating individual summaries for {len(articles)} articles")
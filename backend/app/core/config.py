@@ -2,7 +2,7 @@ import json
 from functools import lru_cache
 from typing import List, Optional, Union
 
-from pydantic import field_validator
+from pydantic import field_validator, model_validator
 from pydantic_settings import BaseSettings
 
 
@@ -19,9 +19,36 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int = 30
 
     groq_api_key: Optional[str] = None
+    summary_map_concurrency: int = 4
+    summary_reduce_tokens: int = 6000
+    summary_chunk_tokens: int = 3000
+    summary_chunk_overlap_tokens: int = 200
+    llm_max_connections: int = 20
+    llm_timeout: float = 180.0
+    llm_requests_per_minute: float = 30
+    llm_tokens_per_minute: float = 12000
+    llm_output_reserve_tokens: int = 2000
+    llm_max_concurrency: int = 8
+    llm_max_retries: int = 3
+    llm_breaker_failures: int = 5
+    llm_breaker_reset: float = 30.0
 
     max_file_size: int = 52428800
     allowed_extensions: str = "pdf,txt"
+    ingestion_workers: int = 2
+    upload_session_ttl: float = 86400.0
+    pdf_parallel_min_pages: int = 60
+    pdf_extraction_processes: int = 0
+    pdf_text_backend: str = "auto"
+    pdf_metadata_pages: int = 1
+    near_duplicate_threshold: float = 0.8
+
+    http_max_connections: int = 20
+    http_per_host_limit: int = 4
+    http_timeout: float = 30.0
+    http_min_host_interval: float = 0.5
+    bulk_url_concurrency: int = 8
+    pdf_link_cache_ttl: float = 3600.0
 
     cors_origins: List[str] = [
         "http://localhost:3000",
@@ -46,6 +73,19 @@ class Settings(BaseSettings):
             return [origin.strip() for origin in v.split(",") if origin.strip()]
         return []
 
+    @model_validator(mode="after")
+    def check_llm_token_budget(self) -> "Settings":
+        # La llamada más grande de un resumen por chunks tiene que caber en la cuota
+        largest_call = max(self.summary_chunk_tokens, self.summary_reduce_tokens)
+        largest_call += self.llm_output_reserve_tokens
+        if 0 < self.llm_tokens_per_minute < largest_call:
+            raise ValueError(
+                f"LLM_TOKENS_PER_MINUTE ({self.llm_tokens_per_minute:g}) must be at least "
+                f"max(SUMMARY_CHUNK_TOKENS, SUMMARY_REDUCE_TOKENS) + LLM_OUTPUT_RESERVE_TOKENS "
+                f"({largest_call})"
+            )
+        return self
+
     class Config:
         env_file = ".env"
         case_sensitive = False
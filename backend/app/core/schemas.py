@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr
 from datetime import datetime
-from typing import List, Optional, Literal
+from typing import Dict, List, Optional, Literal
 
 
 class UserBase(BaseModel):
@@ -81,11 +81,74 @@ class ArticleResponse(ArticleBase):
     created_at: datetime
     updated_at: datetime
     auto_topics: Optional[List[str]] = []
+    duplicate_of_id: Optional[int] = None
 
     class Config:
         from_attributes = True
 
 
+class IngestionJobResponse(BaseModel):
+    id: str
+    article_id: Optional[int] = None
+    status: str
+    stage: Optional[str] = None
+    stages: Dict[str, dict] = {}
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class UploadSessionCreate(BaseModel):
+    filename: str
+    size: int
+    category_id: Optional[int] = None
+
+
+class UploadSessionResponse(BaseModel):
+    id: str
+    filename: str
+    total_size: int
+    offset: int
+    status: str
+    expires_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class ArticlePageText(BaseModel):
+    page_number: int
+    text: str
+
+
+class ArticleTextResponse(BaseModel):
+    article_id: int
+    page_count: int
+    pages: List[ArticlePageText]
+
+
+class ArticleSectionInfo(BaseModel):
+    name: str
+    position: int
+    start_page: int
+    start_line: int
+    end_page: int
+    end_line: int
+    char_start: int
+    char_end: int
+
+    class Config:
+        from_attributes = True
+
+
+class ArticleSectionResponse(ArticleSectionInfo):
+    article_id: int
+    content: str
+
+
 class UserLibraryBase(BaseModel):
     status: Optional[str] = "unread"
     notes: Optional[str] = None
@@ -188,6 +251,7 @@ class SummaryResult(BaseModel):
     success: bool
     summary: Optional[str] = None
     method: Optional[str] = None
+    cached: bool = False
     error: Optional[str] = None
 
 
@@ -10,6 +10,9 @@ from app.core.config import get_settings
 from app.core.database import Base, engine
 from app.api.routes import auth, users, articles, recommendations, annotations
 from app.models import User, Article, Category, UserLibrary, Recommendation, Annotation
+from app.services.ingestion import get_ingestion_pipeline
+from app.services.http_fetcher import get_http_fetcher
+from app.services.llm_client import get_llm_client
 
 settings = get_settings()
 
@@ -52,6 +55,14 @@ app.include_router(annotations.router)
 @app.on_event("startup")
 def startup_event():
     run_database_migrations()
+    get_ingestion_pipeline().recover()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    get_ingestion_pipeline().shutdown()
+    await get_http_fetcher().aclose()
+    await get_llm_client().aclose()
 
 
 @app.get("/")
@@ -5,6 +5,14 @@ from .user_library import UserLibrary
 from .recommendation import Recommendation
 from .annotation import Annotation
 from .user_index import UserIndex
+from .ingestion_job import IngestionJob
+from .stored_file import StoredFile
+from .article_text import ArticleText
+from .article_section import ArticleSection
+from .article_signature import ArticleSignature, ArticleLshBucket
+from .upload_session import UploadSession
+from .summary import Summary
+from .chunk_summary import ChunkSummary
 
 __all__ = [
     "User",
@@ -14,4 +22,13 @@ __all__ = [
     "Recommendation",
     "Annotation",
     "UserIndex",
+    "IngestionJob",
+    "StoredFile",
+    "ArticleText",
+    "ArticleSection",
+    "ArticleSignature",
+    "ArticleLshBucket",
+    "UploadSession",
+    "Summary",
+    "ChunkSummary",
 ]
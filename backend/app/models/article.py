@@ -24,6 +24,10 @@ class Article(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     auto_topics = Column(ARRAY(String), default=list)
+    # Set when ingestion finds a near-duplicate of an existing article (status "duplicate")
+    duplicate_of_id = Column(Integer, ForeignKey("articles.id", ondelete="SET NULL"), nullable=True, index=True)
+    # Set once the section index is built, even if no section was found
+    sections_indexed_at = Column(DateTime, nullable=True)
 
     category = relationship("Category", back_populates="articles")
     uploaded_by_user = relationship("User", back_populates="articles")
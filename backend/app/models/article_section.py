@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, LargeBinary, UniqueConstraint
+from app.core.database import Base
+
+
+class ArticleSection(Base):
+    """
+    Section of an article (abstract, introduction, ...) detected at ingest.
+    Boundaries are page/line positions and char offsets into the full text;
+    content is the zlib-compressed section body.
+    """
+    __tablename__ = "article_sections"
+    __table_args__ = (UniqueConstraint("article_id", "name", name="uq_article_sections_article_name"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), nullable=False, index=True)
+    name = Column(String(50), nullable=False)
+    position = Column(Integer, nullable=False)  # Order of appearance
+    start_page = Column(Integer, nullable=False)
+    start_line = Column(Integer, nullable=False)
+    end_page = Column(Integer, nullable=False)
+    end_line = Column(Integer, nullable=False)
+    char_start = Column(Integer, nullable=False)
+    char_end = Column(Integer, nullable=False)
+    content = Column(LargeBinary, nullable=False)
+
+    def __repr__(self):
+        return f"<ArticleSection(article_id={self.article_id}, name={self.name})>"
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, LargeBinary, Index
+from app.core.database import Base
+
+
+class ArticleSignature(Base):
+    """
+    MinHash signature of an article's extracted text (little-endian uint64 array).
+    """
+    __tablename__ = "article_signatures"
+
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True)
+    signature = Column(LargeBinary, nullable=False)
+
+    def __repr__(self):
+        return f"<ArticleSignature(article_id={self.article_id})>"
+
+
+class ArticleLshBucket(Base):
+    """
+    LSH band bucket of a signature; articles sharing a (band, bucket) are
+    near-duplicate candidates.
+    """
+    __tablename__ = "article_lsh_buckets"
+    __table_args__ = (Index("ix_article_lsh_buckets_band_bucket", "band", "bucket"),)
+
+    band = Column(Integer, primary_key=True)
+    bucket = Column(String(16), primary_key=True)
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True)
+
+    def __repr__(self):
+        return f"<ArticleLshBucket(band={self.band}, article_id={self.article_id})>"
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, ForeignKey, LargeBinary
+from app.core.database import Base
+
+
+class ArticleText(Base):
+    """
+    Extracted text of one page of an article, zlib-compressed.
+    Written once at ingest so summaries never re-read the original file.
+    """
+    __tablename__ = "article_texts"
+
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True)
+    page_number = Column(Integer, primary_key=True)  # 1-indexed
+    char_count = Column(Integer, nullable=False, default=0)
+    content = Column(LargeBinary, nullable=False)
+
+    def __repr__(self):
+        return f"<ArticleText(article_id={self.article_id}, page_number={self.page_number})>"
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, UniqueConstraint
+from datetime import datetime
+from app.core.database import Base
+
+
+class ChunkSummary(Base):
+    """
+    Map-phase summary of one chunk of text, keyed by the hash of the chunk
+    text, the model and the map-prompt version. Shared by every document
+    (and summary level) that produces the same chunk.
+    """
+    __tablename__ = "chunk_summaries"
+    __table_args__ = (
+        UniqueConstraint("chunk_hash", "model", "prompt_version", name="uq_chunk_summaries_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    chunk_hash = Column(String(64), nullable=False, index=True)
+    model = Column(String(100), nullable=False)
+    prompt_version = Column(String(20), nullable=False)
+    content = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ChunkSummary(chunk_hash={self.chunk_hash[:12]}, model={self.model})>"
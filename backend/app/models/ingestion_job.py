@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.core.database import Base
+
+
+class IngestionJob(Base):
+    """
+    Background ingestion of an uploaded article.
+    Tracks per-stage progress (parse, metadata, topics, structure).
+    """
+    __tablename__ = "ingestion_jobs"
+
+    id = Column(String(36), primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), nullable=True)
+    status = Column(String(20), default="queued")  # queued, running, completed, failed
+    stage = Column(String(30), nullable=True)  # Stage currently running
+    stages = Column(JSON, default=dict)  # {stage: {"status": ..., "detail": ...}}
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    article = relationship("Article")
+    user = relationship("User")
+
+    def __repr__(self):
+        return f"<IngestionJob(id={self.id}, status={self.status}, stage={self.stage})>"
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, String, DateTime, BigInteger
+from datetime import datetime
+from app.core.database import Base
+
+
+class StoredFile(Base):
+    """
+    Content-addressed upload stored once per SHA-256 hash.
+    Article.file_hash is unique, so each file belongs to a single article.
+    """
+    __tablename__ = "stored_files"
+
+    file_hash = Column(String(64), primary_key=True)
+    path = Column(String(500), nullable=False)
+    size = Column(BigInteger)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<StoredFile(file_hash={self.file_hash}, path={self.path})>"
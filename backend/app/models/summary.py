@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, UniqueConstraint
+from datetime import datetime
+from app.core.database import Base
+
+
+class Summary(Base):
+    """
+    Stored summary of a document, keyed by its content hash and by everything
+    that shapes the output: level, method, model and prompt-template version.
+    """
+    __tablename__ = "summaries"
+    __table_args__ = (
+        UniqueConstraint(
+            "file_hash", "level", "method", "model", "prompt_version",
+            name="uq_summaries_key",
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    file_hash = Column(String(64), nullable=False, index=True)
+    level = Column(String(20), nullable=False)  # executive, detailed, exhaustive
+    method = Column(String(20), nullable=False)  # groq, local
+    model = Column(String(100), nullable=False, default="")
+    prompt_version = Column(String(20), nullable=False)
+    method_used = Column(String(20), nullable=False)  # groq, groq_chunked, local
+    content = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<Summary(file_hash={self.file_hash[:12]}, level={self.level}, method={self.method})>"
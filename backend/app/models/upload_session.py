@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, DateTime, BigInteger, ForeignKey
+from datetime import datetime
+from app.core.database import Base
+
+
+class UploadSession(Base):
+    """
+    Resumable upload: the client PUTs byte ranges until offset == total_size,
+    then finalizes the session into the normal ingestion path.
+    """
+    __tablename__ = "upload_sessions"
+
+    id = Column(String(32), primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    filename = Column(String(500), nullable=False)
+    extension = Column(String(10), nullable=False)
+    category_id = Column(Integer, nullable=True)
+    total_size = Column(BigInteger, nullable=False)
+    offset = Column(BigInteger, nullable=False, default=0)  # Bytes received so far
+    temp_path = Column(String(500), nullable=False)
+    status = Column(String(20), default="open")  # open, completed, aborted
+    expires_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<UploadSession(id={self.id}, offset={self.offset}/{self.total_size})>"
@@ -0,0 +1,144 @@
+"""
+Almacén del texto completo de cada artículo.
+
+El texto extraído se guarda una sola vez en la ingesta, una fila por página
+de ``article_texts`` comprimida con zlib. Los resúmenes leen rangos de
+páginas desde aquí en lugar de volver a abrir el archivo original.
+"""
+
+import logging
+import os
+import zlib
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models import Article, ArticleText
+from app.services.parsed_document import ParsedDocument, get_parsed_document_store
+
+logger = logging.getLogger(__name__)
+
+
+def compress_text(text: str, level: int = 6) -> bytes:
+    return zlib.compress(text.encode("utf-8"), level)
+
+
+def decompress_text(data: bytes) -> str:
+    return zlib.decompress(data).decode("utf-8")
+
+
+class ArticleTextStore:
+    """
+    Lectura y escritura del texto por página de los artículos.
+
+    ``save_pages`` deja los cambios pendientes de commit en la sesión del
+    llamador; ``ensure`` confirma el backfill de artículos antiguos.
+    """
+
+    def __init__(self, compress_level: int = 6):
+        self.compress_level = compress_level
+
+    def save_pages(self, db: Session, article_id: int, pages: List[str]) -> int:
+        """Reemplaza el texto guardado del artículo; devuelve el número de páginas."""
+        db.query(ArticleText).filter(ArticleText.article_id == article_id).delete(
+            synchronize_session=False
+        )
+        db.add_all(
+            ArticleText(
+                article_id=article_id,
+                page_number=page_number,
+                char_count=len(text),
+                content=compress_text(text, self.compress_level),
+            )
+            for page_number, text in enumerate(pages, start=1)
+        )
+        return len(pages)
+
+    def save_document(self, db: Session, article_id: int, document: ParsedDocument) -> int:
+        return self.save_pages(
+            db, article_id, [document.page_text(n) for n in range(1, document.page_count + 1)]
+        )
+
+    def page_count(self, db: Session, article_id: int) -> int:
+        return (
+            db.query(func.count(ArticleText.page_number))
+            .filter(ArticleText.article_id == article_id)
+            .scalar()
+            or 0
+        )
+
+    def get_pages(
+        self,
+        db: Session,
+        article_id: int,
+        start_page: int = 1,
+        end_page: Optional[int] = None,
+    ) -> List[Tuple[int, str]]:
+        """
+        Devuelve [(page_number, text)] de las páginas ``start_page``..``end_page`` (inclusive).
+
+        Args:
+            db: Sesión de base de datos
+            article_id: ID del artículo
+            start_page: Primera página (1-indexed)
+            end_page: Última página; None hasta el final
+        """
+        query = db.query(ArticleText.page_number, ArticleText.content).filter(
+            ArticleText.article_id == article_id,
+            ArticleText.page_number >= start_page,
+        )
+        if end_page is not None:
+            query = query.filter(ArticleText.page_number <= end_page)
+
+        return [
+            (page_number, decompress_text(content))
+            for page_number, content in query.order_by(ArticleText.page_number)
+        ]
+
+    def get_text(self, db: Session, article: Article, max_pages: Optional[int] = None) -> str:
+        """Texto de las primeras ``max_pages`` páginas no vacías del artículo."""
+        if not self.ensure(db, article):
+            return ""
+        pages = self.get_pages(db, article.id, 1, max_pages)
+        return "\n".join(text for _, text in pages if text)
+
+    def ensure(self, db: Session, article: Article) -> bool:
+        """
+        Garantiza que el texto del artículo está guardado.
+
+        Los artículos ingeridos antes de existir este almacén se completan
+        la primera vez que se leen. Devuelve False si no hay texto disponible.
+        """
+        if self.page_count(db, article.id):
+            return True
+
+        pages = self._read_pages(article)
+        if pages is None:
+            return False
+
+        self.save_pages(db, article.id, pages)
+        db.commit()
+        logger.info(f"Backfilled {len(pages)} text pages for article {article.id}")
+        return True
+
+    def _read_pages(self, article: Article) -> Optional[List[str]]:
+        file_path = article.file_path or ""
+        if not os.path.exists(file_path):
+            return None
+
+        if file_path.lower().endswith(".txt"):
+            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+                return [f.read()]
+
+        if file_path.lower().endswith(".pdf"):
+            document = get_parsed_document_store().get(file_path, article.file_hash)
+            return [document.page_text(n) for n in range(1, document.page_count + 1)]
+
+        return None
+
+
+@lru_cache()
+def get_article_text_store() -> ArticleTextStore:
+    return ArticleTextStore()
@@ -2,31 +2,51 @@
 ChunkedSummarizer - Procesa documentos largos usando Map-Reduce.
 
 Este módulo divide documentos extensos en chunks manejables, resume cada uno,
-y luego combina los resúmenes en un resultado coherente.
+y luego combina los resúmenes en un resultado coherente. La combinación es un
+árbol: los resúmenes se agrupan en lotes que caben en un presupuesto de tokens,
+cada lote se reduce a un resumen intermedio y se repite hasta que todo cabe en
+un único prompt final, así que ningún documento es demasiado largo.
+
+Con una sesión de base de datos, los resúmenes de la fase map se guardan por
+hash del texto del chunk (``ChunkSummaryCache``): repetir el documento, o
+pedir otro nivel, sólo vuelve a resumir los chunks nuevos.
 """
 
 import logging
-import math
-from typing import List, Tuple, Dict, Optional
-import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Iterator, List, Tuple, Dict, Optional, TypeVar
+
+from sqlalchemy.orm import Session
+
+from app.services.llm_client import get_llm_client
+from app.services.summary_cache import PARTIAL_SUFFIX, get_chunk_summary_cache
+from app.services.summary_prompts import MAP_PROMPT, MAP_PROMPT_VERSION, get_level_prompt
+from app.services.text_chunker import TextChunker
+from app.services.token_estimator import estimate_tokens, truncate_to_tokens
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 class ChunkedSummarizer:
     """
     Resumidor que procesa documentos largos usando estrategia Map-Reduce.
 
     Map: Resume cada chunk individualmente
-    Reduce: Combina resúmenes parciales en uno coherente
+    Reduce: Combina resúmenes parciales en uno coherente, por niveles si no
+    caben en un solo prompt
     """
 
     def __init__(
         self,
         groq_api_key: str,
         groq_model: str = "llama-3.3-70b-versatile",
-        chunk_size_chars: int = 8000,
-        overlap_chars: int = 800,
+        chunk_size_tokens: int = 3000,
+        overlap_tokens: int = 200,
+        max_concurrency: int = 4,
+        reduce_budget_tokens: int = 6000,
+        db: Optional[Session] = None,
     ):
         """
         Inicializa el ChunkedSummarizer.
@@ -34,13 +54,18 @@ class ChunkedSummarizer:
         Args:
             groq_api_key: API key de Groq
             groq_model: Modelo a usar
-            chunk_size_chars: Tamaño de cada chunk en caracteres
-            overlap_chars: Overlap entre chunks para mantener contexto
+            chunk_size_tokens: Tokens estimados de cada chunk
+            overlap_tokens: Tokens de overlap entre chunks para mantener contexto
+            max_concurrency: Llamadas simultáneas en las fases map y reduce
+            reduce_budget_tokens: Tokens de resúmenes parciales por llamada reduce
+            db: Sesión para la caché de resúmenes de chunks (sin ella no se cachea)
         """
         self.groq_api_key = groq_api_key
         self.groq_model = groq_model
-        self.chunk_size = chunk_size_chars
-        self.overlap = overlap_chars
+        self.chunker = TextChunker(chunk_size_tokens, overlap_tokens)
+        self.max_concurrency = max(1, max_concurrency)
+        self.reduce_budget_tokens = reduce_budget_tokens
+        self.db = db
 
     def summarize_long_document(
         self,
@@ -57,36 +82,25 @@ class ChunkedSummarizer:
             sections: Secciones del documento si están disponibles
 
         Returns:
-            Tupla (resumen, método_usado)
+            Tupla (resumen, método_usado); el método acaba en ``PARTIAL_SUFFIX``
+            si algún chunk no se pudo resumir
         """
         if not text:
             raise ValueError("Text cannot be empty")
 
-        # Si el documento es corto, resumir directamente
-        if len(text) < self.chunk_size:
+        # Si el documento cabe en un chunk, resumir directamente
+        tokens = estimate_tokens(text)
+        if tokens <= self.chunker.max_tokens:
             logger.info("Document is short, summarizing directly")
             return self._summarize_with_groq(text, level, is_final=True), "groq_direct"
 
-        logger.info(f"Document is long ({len(text)} chars), using chunked approach")
+        logger.info(f"Document is long (~{tokens} tokens), using chunked approach")
 
         # FASE MAP: Dividir y resumir cada chunk
-        chunks = self._create_overlapping_chunks(text)
+        chunks = self._create_chunks(text, sections)
         logger.info(f"Created {len(chunks)} chunks")
 
-        chunk_summaries = []
-        for i, chunk in enumerate(chunks):
-            try:
-                summary = self._summarize_chunk(
-                    chunk,
-                    chunk_number=i + 1,
-                    total_chunks=len(chunks),
-                    level=level,
-                )
-                chunk_summaries.append(summary)
-                logger.info(f"Summarized chunk {i + 1}/{len(chunks)}")
-            except Exception as e:
-                logger.error(f"Error summarizing chunk {i + 1}: {e}")
-                # Continuar con los otros chunks
+        chunk_summaries = self._map_chunks(chunks, level)
 
         if not chunk_summaries:
             raise RuntimeError("Failed to summarize any chunks")
@@ -99,41 +113,156 @@ class ChunkedSummarizer:
             sections=sections,
         )
 
-        return final_summary, "groq_map_reduce"
+        method = "groq_map_reduce"
+        if len(chunk_summaries) < len(chunks):
+            method += PARTIAL_SUFFIX
+        return final_summary, method
+
+    def stream_long_document(
+        self,
+        text: str,
+        level: str = "detailed",
+        sections: Optional[Dict[str, str]] = None,
+    ) -> Iterator[Tuple[str, Dict]]:
+        """
+        Versión en streaming de ``summarize_long_document``.
 
-    def _create_overlapping_chunks(self, text: str) -> List[str]:
+        Genera eventos ``(tipo, datos)``: ``("progress", {...})`` al terminar
+        cada chunk de la fase map y al empezar la reduce, y ``("token",
+        {"text": ...})`` con cada fragmento del resumen final. Si algún chunk
+        falla, su evento de progreso lleva ``"success": False``.
         """
-        Divide texto en chunks con overlap.
+        if not text:
+            raise ValueError("Text cannot be empty")
 
-        Args:
-            text: Texto completo
+        if estimate_tokens(text) <= self.chunker.max_tokens:
+            for piece in self._stream_with_groq(text, level, is_final=True):
+                yield "token", {"text": piece}
+            return
+
+        chunks = self._create_chunks(text, sections)
+        total = len(chunks)
+        results: Dict[int, Optional[str]] = {}
+        for index, summary, cached in self._iter_map(chunks, level):
+            results[index] = summary
+            yield "progress", {
+                "stage": "map",
+                "chunk": index + 1,
+                "completed": len(results),
+                "total": total,
+                "success": summary is not None,
+                "cached": cached,
+            }
+
+        chunk_summaries = [results[i] for i in range(total) if results[i]]
+        if not chunk_summaries:
+            raise RuntimeError("Failed to summarize any chunks")
 
-        Returns:
-            Lista de chunks
+        batches = self._plan_batches(chunk_summaries)
+        depth = 1
+        while len(batches) > 1:
+            yield "progress", {"stage": "reduce", "depth": depth, "batches": len(batches)}
+            batches = self._plan_batches(self._reduce_level(batches, level))
+            depth += 1
+
+        yield "progress", {"stage": "reduce", "depth": depth, "batches": 1}
+        prompt = self._merge_prompt(batches[0], level)
+        for piece in self._stream_with_groq("", level, is_final=True, custom_prompt=prompt):
+            yield "token", {"text": piece}
+
+    def _map_chunks(self, chunks: List[str], level: str) -> List[str]:
         """
-        chunks = []
-        start = 0
-        text_length = len(text)
+        Resume los chunks en paralelo, con a lo sumo ``max_concurrency`` a la vez.
 
-        while start < text_length:
-            # Fin del chunk
-            end = start + self.chunk_size
+        Los resúmenes se devuelven en el orden de los chunks; los chunks que
+        fallan se omiten para que el resto del documento siga resumiéndose.
+        """
+        results = {index: summary for index, summary, _ in self._iter_map(chunks, level)}
+        return [results[i] for i in range(len(chunks)) if results[i]]
+
+    def _iter_map(
+        self, chunks: List[str], level: str
+    ) -> Iterator[Tuple[int, Optional[str], bool]]:
+        """
+        Genera ``(índice, resumen o None, desde_caché)`` en orden de finalización.
 
-            # Si no es el último chunk, ajustar para no cortar en medio de palabra
-            if end < text_length:
-                # Buscar el último espacio antes del límite
-                last_space = text.rfind(' ', start, end)
-                if last_space > start:
-                    end = last_space
+        Los chunks ya resumidos salen primero, desde la caché; los demás se
+        resumen una vez por texto distinto y se guardan al terminar.
+        """
+        total = len(chunks)
+        cache = get_chunk_summary_cache()
+        by_hash: Dict[str, List[int]] = {}
+        for index, chunk in enumerate(chunks):
+            by_hash.setdefault(cache.chunk_hash(chunk), []).append(index)
+
+        cached: Dict[str, str] = {}
+        if self.db is not None:
+            cached = cache.get_many(self.db, by_hash, self.groq_model, MAP_PROMPT_VERSION)
+        for chunk_hash, summary in cached.items():
+            for index in by_hash[chunk_hash]:
+                yield index, summary, True
+
+        pending = [chunk_hash for chunk_hash in by_hash if chunk_hash not in cached]
+        if cached:
+            logger.info(f"Chunk summaries: {len(cached)} cached, {len(pending)} to summarize")
+
+        def summarize(position: int) -> Optional[str]:
+            index = by_hash[pending[position]][0]
+            try:
+                summary = self._summarize_chunk(
+                    chunks[index],
+                    chunk_number=index + 1,
+                    total_chunks=total,
+                    level=level,
+                )
+                logger.info(f"Summarized chunk {index + 1}/{total}")
+                return summary
+            except Exception as e:
+                logger.error(f"Error summarizing chunk {index + 1}: {e}")
+                return None
 
-            chunk = text[start:end].strip()
-            if chunk:
-                chunks.append(chunk)
+        computed: Dict[str, str] = {}
+        try:
+            for position, summary in self._iter_parallel(summarize, len(pending)):
+                chunk_hash = pending[position]
+                if summary:
+                    computed[chunk_hash] = summary
+                for index in by_hash[chunk_hash]:
+                    yield index, summary, False
+        finally:
+            # También si el consumidor abandona el stream: lo ya pagado se guarda
+            if computed and self.db is not None:
+                cache.put_many(self.db, computed, self.groq_model, MAP_PROMPT_VERSION)
+
+    def _iter_parallel(self, fn: Callable[[int], T], count: int) -> Iterator[Tuple[int, T]]:
+        """Ejecuta ``fn(0..count-1)`` con ``max_concurrency`` hilos; genera en orden de finalización."""
+        workers = min(self.max_concurrency, count)
+        if workers <= 1:
+            for index in range(count):
+                yield index, fn(index)
+            return
+
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="summary")
+        try:
+            futures = {pool.submit(fn, index): index for index in range(count)}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            # Si el consumidor abandona el stream no se envían las llamadas pendientes
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _create_chunks(self, text: str, sections: Optional[Dict[str, str]] = None) -> List[str]:
+        """
+        Divide texto en chunks de párrafos completos hasta el presupuesto de tokens.
 
-            # Siguiente chunk comienza con overlap
-            start = end - self.overlap
+        Args:
+            text: Texto completo
+            sections: Secciones del documento; sus inicios se usan como cortes
 
-        return chunks
+        Returns:
+            Lista de chunks
+        """
+        return self.chunker.chunk(text, sections)
 
     def _summarize_chunk(
         self,
@@ -147,60 +276,24 @@ class ChunkedSummarizer:
 
         Args:
             chunk: Texto del chunk
-            chunk_number: Número del chunk (1-indexed)
-            total_chunks: Total de chunks
+            chunk_number: Número del chunk (1-indexed, para los logs)
+            total_chunks: Total de chunks (para los logs)
             level: Nivel de resumen
 
         Returns:
             Resumen del chunk
         """
-        # Prompt específico para chunks
-        system_prompt = (
-            "Eres un asistente experto en investigación académica. "
-            "Estás resumiendo UNA PARTE de un documento más largo. "
-            "Resume este fragmento capturando toda la información importante."
-        )
-
-        user_prompt = f"""Resume el siguiente fragmento de un documento académico.
-
-CONTEXTO: Este es el fragmento {chunk_number} de {total_chunks} fragmentos totales.
-
-INSTRUCCIONES:
-- Resume este fragmento capturando TODOS los puntos importantes
-- Mantén la estructura y organización del contenido
-- No agregues conclusiones si este fragmento no las contiene
-- Enfócate en los hechos y datos presentes en este fragmento
-
-FRAGMENTO {chunk_number}:
-{chunk}
-
-Resume este fragmento de forma completa y estructurada."""
-
-        headers = {
-            "Authorization": f"Bearer {self.groq_api_key}",
-            "Content-Type": "application/json",
-        }
-
-        payload = {
-            "model": self.groq_model,
-            "temperature": 0.3,
-            "max_tokens": 2000,  # Resumen moderado por chunk
-            "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-        }
-
+        # El prompt no incluye la posición del chunk para que su resumen sea cacheable
         try:
-            resp = requests.post(
-                "https://api.groq.com/openai/v1/chat/completions",
-                json=payload,
-                headers=headers,
-                timeout=60,
+            return get_llm_client().chat(
+                self.groq_api_key,
+                self.groq_model,
+                [
+                    {"role": "system", "content": MAP_PROMPT["system"]},
+                    {"role": "user", "content": MAP_PROMPT["user"].format(text=chunk)},
+                ],
+                max_tokens=2000,  # Resumen moderado por chunk
             )
-            resp.raise_for_status()
-            data = resp.json()
-            return data["choices"][0]["message"]["content"].strip()
         except Exception as e:
             logger.error(f"Error calling Groq for chunk {chunk_number}: {e}")
             raise
@@ -222,8 +315,74 @@ Resume este fragmento de forma completa y estructurada."""
         Returns:
             Resumen final combinado
         """
+        batches = self._plan_batches(summaries)
+        depth = 1
+        while len(batches) > 1:
+            logger.info(f"Reduce level {depth}: {len(batches)} batches")
+            batches = self._plan_batches(self._reduce_level(batches, level))
+            depth += 1
+
+        user_prompt = self._merge_prompt(batches[0], level)
+        return self._summarize_with_groq("", level, is_final=True, custom_prompt=user_prompt)
+
+    def _plan_batches(self, summaries: List[str]) -> List[List[str]]:
+        """
+        Agrupa resúmenes consecutivos en lotes de como mucho ``reduce_budget_tokens``.
+
+        Cada resumen se recorta a la mitad del presupuesto, así dos siempre
+        caben juntos: todos los lotes salvo el último tienen al menos dos y
+        cada nivel reduce el número de resúmenes a la mitad o menos.
+        """
+        item_limit = max(1, self.reduce_budget_tokens // 2)
+        batches: List[List[str]] = []
+        current: List[str] = []
+        used = 0
+        for summary in summaries:
+            summary = truncate_to_tokens(summary, item_limit)
+            tokens = estimate_tokens(summary)
+            if current and used + tokens > self.reduce_budget_tokens:
+                batches.append(current)
+                current, used = [], 0
+            current.append(summary)
+            used += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    def _reduce_level(self, batches: List[List[str]], level: str) -> List[str]:
+        """Reduce cada lote a un resumen intermedio, en paralelo y en orden."""
+
+        def reduce(index: int) -> str:
+            batch = batches[index]
+            if len(batch) == 1:
+                return batch[0]
+            prompt = self._merge_prompt(batch, level, final=False)
+            return self._summarize_with_groq("", level, is_final=False, custom_prompt=prompt)
+
+        results = dict(self._iter_parallel(reduce, len(batches)))
+        return [results[i] for i in range(len(batches))]
+
+    def _merge_prompt(self, summaries: List[str], level: str, final: bool = True) -> str:
+        """Prompt de la fase REDUCE para combinar ``summaries``."""
         combined_text = "\n\n---\n\n".join(summaries)
 
+        if not final:
+            return f"""Tienes {len(summaries)} resúmenes parciales CONSECUTIVOS de una parte de un documento académico.
+
+TU TAREA: Combinarlos en UN ÚNICO resumen parcial de esa parte.
+
+INSTRUCCIONES:
+- Conserva el orden del contenido
+- Preserva TODOS los datos, cifras y hallazgos importantes
+- Elimina redundancias entre resúmenes
+- No agregues introducciones ni conclusiones globales: el resultado se combinará con otras partes
+
+RESÚMENES PARCIALES:
+
+{combined_text}
+
+Combina estos resúmenes en un único resumen parcial."""
+
         # Prompt para la fase REDUCE
         level_descriptions = {
             "executive": "un resumen ejecutivo de 1 página (~500 palabras)",
@@ -231,12 +390,7 @@ Resume este fragmento de forma completa y estructurada."""
             "exhaustive": "un resumen exhaustivo de 8-10 páginas (~4,000 palabras)",
         }
 
-        system_prompt = (
-            "Eres un asistente experto en investigación académica. "
-            "Tu tarea es SINTETIZAR múltiples resúmenes parciales en un resumen final coherente."
-        )
-
-        user_prompt = f"""Tienes {len(summaries)} resúmenes parciales de un documento académico.
+        return f"""Tienes {len(summaries)} resúmenes parciales de un documento académico.
 
 TU TAREA: Sintetizar estos resúmenes en {level_descriptions.get(level, 'un resumen completo')}.
 
@@ -254,8 +408,6 @@ RESÚMENES PARCIALES A SINTETIZAR:
 
 Sintetiza estos resúmenes en un documento académico coherente y completo."""
 
-        return self._summarize_with_groq(combined_text, level, is_final=True, custom_prompt=user_prompt)
-
     def _summarize_with_groq(
         self,
         text: str,
@@ -275,11 +427,36 @@ Sintetiza estos resúmenes en un documento académico coherente y completo."""
         Returns:
             Resumen generado
         """
-        # Importar prompts del summarizer original
-        from app.services.summarizer import ArticleSummarizer
+        messages, max_tokens = self._groq_request(text, level, is_final, custom_prompt)
+        try:
+            return get_llm_client().chat(
+                self.groq_api_key, self.groq_model, messages, max_tokens=max_tokens
+            )
+        except Exception as e:
+            logger.error(f"Error calling Groq: {e}")
+            raise RuntimeError(f"Groq API call failed: {e}")
+
+    def _stream_with_groq(
+        self,
+        text: str,
+        level: str,
+        is_final: bool = False,
+        custom_prompt: Optional[str] = None,
+    ) -> Iterator[str]:
+        """Como ``_summarize_with_groq``, generando el resumen a medida que llega."""
+        messages, max_tokens = self._groq_request(text, level, is_final, custom_prompt)
+        return get_llm_client().stream_chat(
+            self.groq_api_key, self.groq_model, messages, max_tokens=max_tokens
+        )
 
-        temp_summarizer = ArticleSummarizer(self.groq_api_key, self.groq_model)
-        prompt_config = temp_summarizer._get_prompt_for_level(level)
+    def _groq_request(
+        self,
+        text: str,
+        level: str,
+        is_final: bool,
+        custom_prompt: Optional[str],
+    ) -> Tuple[List[Dict[str, str]], int]:
+        prompt_config = get_level_prompt(level)
 
         system_prompt = prompt_config["system"]
         user_prompt = custom_prompt or prompt_config["user"].format(text=text)
@@ -291,48 +468,20 @@ Sintetiza estos resúmenes en un documento académico coherente y completo."""
             "exhaustive": 16000 if is_final else 4000,
         }
 
-        headers = {
-            "Authorization": f"Bearer {self.groq_api_key}",
-            "Content-Type": "application/json",
-        }
-
-        payload = {
-            "model": self.groq_model,
-            "temperature": 0.3,
-            "max_tokens": max_tokens.get(level, 6000),
-            "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-        }
-
-        try:
-            resp = requests.post(
-                "https://api.groq.com/openai/v1/chat/completions",
-                json=payload,
-                headers=headers,
-                timeout=120,
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            return data["choices"][0]["message"]["content"].strip()
-        except Exception as e:
-            logger.error(f"Error calling Groq: {e}")
-            raise RuntimeError(f"Groq API call failed: {e}")
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ]
+        return messages, max_tokens.get(level, 6000)
 
-    def estimate_chunks_needed(self, text_length: int) -> int:
+    def estimate_chunks_needed(self, text: str) -> int:
         """
         Estima cuántos chunks se necesitarán.
 
         Args:
-            text_length: Longitud del texto en caracteres
+            text: Texto completo del documento
 
         Returns:
             Número estimado de chunks
         """
-        if text_length <= self.chunk_size:
-            return 1
-
-        # Calcular considerando overlap
-        effective_chunk_size = self.chunk_size - self.overlap
-        return math.ceil((text_length - self.overlap) / effective_chunk_size)
+        return self.chunker.estimate_chunks(text)
@@ -7,13 +7,41 @@ identificando secciones como Abstract, Introduction, Methodology, Results, etc.
 
 import re
 import unicodedata
-from typing import Dict, List, Tuple, Optional
-import pdfplumber
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Tuple, Optional
 import logging
 
+from app.services.parsed_document import ParsedDocument, get_parsed_document_store
+
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class SectionSpan:
+    """
+    Posición de una sección dentro del documento.
+
+    ``start_page``/``start_line`` señalan la línea del título y
+    ``end_page``/``end_line`` la primera línea que ya no pertenece a la
+    sección (páginas 1-indexed, líneas 0-indexed dentro de su página).
+    ``char_start``/``char_end`` delimitan el cuerpo de la sección en el texto
+    completo (líneas de todas las páginas unidas con saltos de línea).
+    """
+
+    name: str
+    start_page: int
+    start_line: int
+    end_page: int = 0
+    end_line: int = 0
+    char_start: int = 0
+    char_end: int = 0
+    lines: List[str] = field(default_factory=list, repr=False)
+
+    @property
+    def content(self) -> str:
+        return '\n'.join(self.lines)
+
+
 class DocumentStructureExtractor:
     """
     Extrae la estructura de documentos académicos identificando secciones.
@@ -80,137 +108,138 @@ class DocumentStructureExtractor:
     }
 
     def __init__(self):
-        # Compilar patrones para mejor performance
-        self.compiled_patterns = {}
-        for section, patterns in self.SECTION_PATTERNS.items():
-            self.compiled_patterns[section] = [
-                re.compile(p, re.IGNORECASE | re.UNICODE) for p in patterns
-            ]
-
-    def extract_from_pdf(self, pdf_path: str) -> Dict[str, str]:
+        # Un único patrón con un grupo con nombre por sección: cada línea se
+        # normaliza y compara una sola vez en lugar de una vez por sección y patrón
+        self.heading_pattern = re.compile(
+            '|'.join(
+                f"(?P<{section}>{'|'.join(f'(?:{p})' for p in patterns)})"
+                for section, patterns in self.SECTION_PATTERNS.items()
+            ),
+            re.IGNORECASE | re.UNICODE,
+        )
+
+    def extract_from_pdf(self, pdf_path: str, file_hash: Optional[str] = None) -> Dict[str, str]:
         """
         Extrae secciones de un PDF académico.
 
         Args:
             pdf_path: Ruta al archivo PDF
+            file_hash: Hash del archivo para reutilizar el artefacto parseado
 
         Returns:
             Diccionario con secciones identificadas: {section_name: content}
         """
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                # Extraer todo el texto con números de página
-                pages_text = []
-                for i, page in enumerate(pdf.pages, start=1):
-                    text = page.extract_text()
-                    if text:
-                        pages_text.append((i, text))
-
-                # Identificar límites de secciones
-                boundaries = self._identify_section_boundaries(pages_text)
-
-                # Extraer contenido de cada sección
-                sections = self._extract_sections_content(pages_text, boundaries)
-
-                return sections
+            document = get_parsed_document_store().get(pdf_path, file_hash)
+            return self.extract_from_document(document)
 
         except Exception as e:
             logger.error(f"Error extracting structure from PDF {pdf_path}: {e}")
             return {}
 
-    def _identify_section_boundaries(
-        self, pages_text: List[Tuple[int, str]]
-    ) -> Dict[str, Tuple[int, int]]:
+    def extract_from_document(self, document: ParsedDocument) -> Dict[str, str]:
         """
-        Identifica los límites (inicio, fin) de cada sección.
+        Extrae secciones de un documento ya parseado.
 
         Args:
-            pages_text: Lista de tuplas (page_number, text)
+            document: Artefacto ParsedDocument
 
         Returns:
-            Dict con {section_name: (start_line, end_line)}
+            Diccionario con secciones identificadas: {section_name: content}
         """
-        # Combinar todo el texto con marcadores de línea
-        all_lines = []
-        line_to_page = {}
-        line_num = 0
-
-        for page_num, text in pages_text:
-            lines = text.split('\n')
-            for line in lines:
-                all_lines.append(line)
-                line_to_page[line_num] = page_num
-                line_num += 1
-
-        # Encontrar posiciones de cada sección
-        section_positions = {}
-
-        for section_name, patterns in self.compiled_patterns.items():
-            for i, line in enumerate(all_lines):
-                normalized = self._normalize_text(line.strip())
-
-                # Verificar si la línea coincide con algún patrón
-                for pattern in patterns:
-                    if pattern.match(normalized):
-                        # Verificar que sea un título (línea corta, potencialmente seguida de espacio)
-                        if len(line.strip()) < 50:
-                            section_positions[section_name] = i
-                            logger.info(f"Found section '{section_name}' at line {i}: '{line.strip()}'")
-                            break
-
-                if section_name in section_positions:
-                    break
-
-        # Ordenar secciones por posición
-        sorted_sections = sorted(section_positions.items(), key=lambda x: x[1])
-
-        # Calcular límites (inicio, fin) de cada sección
-        boundaries = {}
-        for i, (section_name, start_line) in enumerate(sorted_sections):
-            # El fin de esta sección es el inicio de la siguiente (o el final del documento)
-            if i + 1 < len(sorted_sections):
-                end_line = sorted_sections[i + 1][1]
-            else:
-                end_line = len(all_lines)
-
-            boundaries[section_name] = (start_line, end_line)
-
-        return boundaries
-
-    def _extract_sections_content(
-        self,
-        pages_text: List[Tuple[int, str]],
-        boundaries: Dict[str, Tuple[int, int]]
-    ) -> Dict[str, str]:
+        return self.extract_from_lines(document.iter_lines())
+
+    def extract_from_lines(self, lines: Iterable[Tuple[int, str]]) -> Dict[str, str]:
         """
-        Extrae el contenido de cada sección según los límites identificados.
+        Extrae secciones en una sola pasada sobre las líneas del documento.
 
         Args:
-            pages_text: Lista de tuplas (page_number, text)
-            boundaries: Límites de cada sección
+            lines: Iterable de tuplas (page_number, line), p. ej. un generador
 
         Returns:
             Dict con {section_name: content}
         """
-        # Reconstruir todas las líneas
-        all_lines = []
-        for page_num, text in pages_text:
-            all_lines.extend(text.split('\n'))
+        return {span.name: span.content for span in self.extract_spans(lines)}
 
-        sections = {}
+    def extract_spans(self, lines: Iterable[Tuple[int, str]]) -> List[SectionSpan]:
+        """
+        Localiza las secciones y sus límites en una sola pasada.
+
+        Cada sección empieza en la primera línea que coincide con su título y
+        termina donde empieza la siguiente sección detectada. Sólo se conservan
+        las líneas que pertenecen a alguna sección, por lo que la memoria no
+        depende del tamaño del documento fuera de ellas.
+
+        Args:
+            lines: Iterable de tuplas (page_number, line), p. ej. un generador
+
+        Returns:
+            Secciones con contenido sustancial, en orden de aparición
+        """
+        spans: Dict[str, SectionSpan] = {}
+        current: Optional[SectionSpan] = None
+        offset = 0
+        page_num, page_line = 0, 0
+
+        for line_num, (line_page, line) in enumerate(lines):
+            if line_page != page_num:
+                page_num, page_line = line_page, 0
+
+            stripped = line.strip()
+            section_name = self._match_section_heading(stripped, spans)
+
+            if section_name:
+                logger.info(
+                    f"Found section '{section_name}' at line {line_num} (page {page_num}): '{stripped}'"
+                )
+                if current is not None:
+                    self._close_span(current, page_num, page_line, max(offset - 1, current.char_start))
+                current = spans[section_name] = SectionSpan(
+                    name=section_name,
+                    start_page=page_num,
+                    start_line=page_line,
+                    char_start=offset + len(line) + 1,
+                )
+            elif current is not None and stripped:
+                current.lines.append(stripped)
+
+            offset += len(line) + 1
+            page_line += 1
+
+        if current is not None:
+            self._close_span(current, page_num, page_line, max(offset - 1, current.char_start))
+
+        # Solo agregar si tiene contenido sustancial (al menos 100 caracteres)
+        return [span for span in spans.values() if len(span.content) > 100]
+
+    @staticmethod
+    def _close_span(span: SectionSpan, page_num: int, page_line: int, char_end: int) -> None:
+        span.end_page = page_num
+        span.end_line = page_line
+        span.char_end = char_end
+
+    def _match_section_heading(self, line: str, found: Dict[str, SectionSpan]) -> Optional[str]:
+        """
+        Devuelve la sección cuyo título coincide con la línea, si aún no se encontró.
 
-        for section_name, (start, end) in boundaries.items():
-            # Extraer líneas de esta sección (saltando el título)
-            section_lines = all_lines[start + 1:end]
+        Los patrones de las distintas secciones no se solapan, así que basta
+        con el grupo que coincida en el patrón combinado.
 
-            # Limpiar y unir
-            content = '\n'.join(line.strip() for line in section_lines if line.strip())
+        Args:
+            line: Línea ya sin espacios en los extremos
+            found: Secciones ya detectadas (se ignoran)
 
-            # Solo agregar si tiene contenido sustancial
-            if len(content) > 100:  # Al menos 100 caracteres
-                sections[section_name] = content
+        Returns:
+            Nombre de la sección o None
+        """
+        # Un título es una línea corta
+        if not line or len(line) >= 50:
+            return None
 
-        return sections
+        match = self.heading_pattern.match(self._normalize_text(line))
+        if not match or match.lastgroup in found:
+            return None
+        return match.lastgroup
 
     def _normalize_text(self, text: str) -> str:
         """
@@ -224,12 +253,12 @@ class DocumentStructureExtractor:
         """
         # Convertir a minúsculas
         text = text.lower()
+        if text.isascii():
+            return text
 
         # Remover acentos
         text = unicodedata.normalize('NFD', text)
-        text = ''.join(ch for ch in text if unicodedata.category(ch) != 'Mn')
-
-        return text
+        return ''.join(ch for ch in text if unicodedata.category(ch) != 'Mn')
 
     def get_section_summary(self, sections: Dict[str, str]) -> str:
         """
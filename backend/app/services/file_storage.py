@@ -0,0 +1,188 @@
+"""
+Almacenamiento de archivos subidos.
+
+Las subidas se escriben por bloques en un archivo temporal mientras se
+calcula su SHA-256, de modo que el hash y el límite de tamaño se resuelven
+con una sola lectura del cuerpo y sin parsear el PDF.
+
+Los archivos definitivos se guardan direccionados por contenido en un
+árbol particionado (``ab/cd/<hash>.pdf``) registrados en la tabla
+``stored_files``. ``Article.file_hash`` es único, así que cada hash
+pertenece a un solo artículo: no hay contador de referencias.
+"""
+
+import hashlib
+import logging
+import os
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Optional, Union
+
+from fastapi import UploadFile
+from sqlalchemy.orm import Session
+
+from app.models import StoredFile
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class FileTooLargeError(Exception):
+    """La subida supera ``settings.max_file_size``."""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"File exceeds the maximum allowed size of {max_bytes} bytes")
+        self.max_bytes = max_bytes
+
+
+@dataclass
+class StagedUpload:
+    """Archivo temporal ya escrito junto con su hash y tamaño."""
+
+    path: Path
+    file_hash: str
+    size: int
+
+    def discard(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+def temp_upload_path(directory: Path) -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / f".upload-{uuid.uuid4().hex}.part"
+
+
+async def stage_stream(
+    chunks: AsyncIterator[bytes],
+    directory: Path,
+    max_bytes: int,
+) -> StagedUpload:
+    """
+    Escribe un flujo de bloques en un archivo temporal calculando su SHA-256 al vuelo.
+
+    Args:
+        chunks: Bloques de bytes del cuerpo (subida o descarga)
+        directory: Directorio donde crear el temporal
+        max_bytes: Tamaño máximo permitido; se aborta al superarlo
+
+    Returns:
+        StagedUpload con la ruta temporal, el hash y el tamaño
+
+    Raises:
+        FileTooLargeError: Si el cuerpo supera ``max_bytes``
+    """
+    path = temp_upload_path(directory)
+    sha256 = hashlib.sha256()
+    size = 0
+
+    try:
+        with open(path, "wb") as buffer:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise FileTooLargeError(max_bytes)
+                sha256.update(chunk)
+                buffer.write(chunk)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+
+    return StagedUpload(path=path, file_hash=sha256.hexdigest(), size=size)
+
+
+async def stage_upload(
+    upload: UploadFile,
+    directory: Path,
+    max_bytes: int,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+) -> StagedUpload:
+    """Copia una subida de FastAPI a un archivo temporal (ver ``stage_stream``)."""
+
+    async def read_chunks() -> AsyncIterator[bytes]:
+        while True:
+            chunk = await upload.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+    return await stage_stream(read_chunks(), directory, max_bytes)
+
+
+class ContentAddressedStore:
+    """
+    Almacén de archivos indexado por SHA-256.
+
+    Un mismo contenido se guarda una sola vez. Borrar es en dos pasos:
+    ``release`` quita el registro dentro de la transacción del llamador y
+    ``unlink`` elimina el archivo sólo después de su commit, para que un
+    rollback no deje un artículo apuntando a un archivo borrado.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def path_for(self, file_hash: str, extension: str) -> Path:
+        extension = extension.lower().lstrip(".")
+        return self.root / file_hash[:2] / file_hash[2:4] / f"{file_hash}.{extension}"
+
+    def acquire(self, db: Session, staged: StagedUpload, extension: str) -> StoredFile:
+        """
+        Mueve el temporal a su ruta definitiva (si no existe ya) y lo registra.
+
+        Es idempotente para un mismo hash. El cambio en ``stored_files``
+        queda pendiente de commit en la sesión.
+        """
+        stored = (
+            db.query(StoredFile)
+            .filter(StoredFile.file_hash == staged.file_hash)
+            .with_for_update()
+            .first()
+        )
+        target = Path(stored.path) if stored else self.path_for(staged.file_hash, extension)
+
+        if target.exists():
+            staged.discard()
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            # Rename atómico: el archivo aparece completo o no aparece
+            os.replace(staged.path, target)
+
+        if stored is None:
+            stored = StoredFile(file_hash=staged.file_hash, path=str(target), size=staged.size)
+            db.add(stored)
+            db.flush()
+        return stored
+
+    def release(self, db: Session, file_hash: Optional[str]) -> Optional[Path]:
+        """
+        Quita el registro del hash (pendiente de commit) sin tocar el archivo.
+
+        Returns:
+            Ruta del archivo a pasar a ``unlink`` tras el commit, o None si
+            el hash no está en el almacén (subidas antiguas con ruta plana).
+        """
+        if not file_hash:
+            return None
+
+        stored = (
+            db.query(StoredFile)
+            .filter(StoredFile.file_hash == file_hash)
+            .with_for_update()
+            .first()
+        )
+        if stored is None:
+            return None
+
+        db.delete(stored)
+        db.flush()
+        return Path(stored.path)
+
+    @staticmethod
+    def unlink(path: Optional[Union[str, Path]]) -> None:
+        """Elimina un archivo ya desvinculado; llamar sólo tras el commit."""
+        if not path:
+            return
+        Path(path).unlink(missing_ok=True)
+        logger.info(f"Removed stored file {path}")
@@ -0,0 +1,148 @@
+"""
+HttpFetcher - Cliente HTTP asíncrono compartido para la ingesta por URL.
+
+Usa un único ``httpx.AsyncClient`` con pool de conexiones keep-alive y un
+semáforo por host, de modo que un sitio editorial lento sólo ocupa sus
+propios slots y nunca bloquea el event loop. Además espacia el inicio de
+las peticiones a un mismo dominio (cortesía con los editores). Los PDFs se transmiten a
+disco por bloques y se abortan al superar ``max_file_size``.
+"""
+
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from app.core.config import get_settings
+from app.services.file_storage import (
+    UPLOAD_CHUNK_SIZE,
+    FileTooLargeError,
+    StagedUpload,
+    stage_stream,
+)
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "Mozilla/5.0 (compatible; SIGRAA/1.0)"
+
+# Las páginas HTML sólo se usan para encontrar el enlace al PDF
+MAX_HTML_BYTES = 5 * 1024 * 1024
+
+
+@dataclass
+class FetchResult:
+    """Resultado de una descarga: HTML para resolver, o un archivo ya en disco."""
+
+    url: str
+    content_type: str
+    html: Optional[str] = None
+    staged: Optional[StagedUpload] = None
+
+    @property
+    def is_html(self) -> bool:
+        return self.html is not None
+
+
+class HttpFetcher:
+    """
+    Descargador asíncrono con pool de conexiones y límite de concurrencia por host.
+
+    ``min_host_interval`` es el tiempo mínimo (segundos) entre el inicio de
+    dos peticiones al mismo host.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 20,
+        per_host_limit: int = 4,
+        timeout: float = 30.0,
+        min_host_interval: float = 0.0,
+    ):
+        self.per_host_limit = per_host_limit
+        self.min_host_interval = min_host_interval
+        self._host_next_start: Dict[str, float] = {}
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=httpx.Timeout(timeout, connect=10.0),
+            follow_redirects=True,
+            headers={"User-Agent": USER_AGENT},
+        )
+        self._host_slots: Dict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(self.per_host_limit)
+        )
+
+    async def fetch(self, url: str, directory: Path, max_bytes: int) -> FetchResult:
+        """
+        Descarga ``url``. El HTML se devuelve como texto; cualquier otro
+        contenido se escribe en un temporal de ``directory`` con su SHA-256.
+
+        Raises:
+            httpx.HTTPError: Error de red o respuesta no exitosa
+            FileTooLargeError: Si el cuerpo supera ``max_bytes``
+        """
+        host = urlparse(url).netloc.lower()
+        async with self._host_slots[host]:
+            await self._wait_for_host_turn(host)
+            async with self._client.stream("GET", url) as response:
+                response.raise_for_status()
+                content_type = response.headers.get("Content-Type", "").lower()
+                final_url = str(response.url)
+
+                if "text/html" in content_type:
+                    body = await self._read_capped(response, MAX_HTML_BYTES)
+                    html = body.decode(response.encoding or "utf-8", errors="replace")
+                    return FetchResult(url=final_url, content_type=content_type, html=html)
+
+                declared = response.headers.get("Content-Length")
+                if declared and declared.isdigit() and int(declared) > max_bytes:
+                    raise FileTooLargeError(max_bytes)
+
+                staged = await stage_stream(
+                    response.aiter_bytes(UPLOAD_CHUNK_SIZE), directory, max_bytes
+                )
+                logger.info(f"Downloaded {staged.size} bytes from {final_url}")
+                return FetchResult(url=final_url, content_type=content_type, staged=staged)
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def _wait_for_host_turn(self, host: str) -> None:
+        """Reserva el siguiente turno libre del host y espera hasta él."""
+        if self.min_host_interval <= 0:
+            return
+        now = time.monotonic()
+        start = max(now, self._host_next_start.get(host, 0.0))
+        self._host_next_start[host] = start + self.min_host_interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    async def _read_capped(self, response: httpx.Response, limit: int) -> bytes:
+        chunks = []
+        size = 0
+        async for chunk in response.aiter_bytes(UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > limit:
+                raise FileTooLargeError(limit)
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+
+@lru_cache()
+def get_http_fetcher() -> HttpFetcher:
+    settings = get_settings()
+    return HttpFetcher(
+        max_connections=settings.http_max_connections,
+        per_host_limit=settings.http_per_host_limit,
+        timeout=settings.http_timeout,
+        min_host_interval=settings.http_min_host_interval,
+    )
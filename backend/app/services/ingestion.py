@@ -0,0 +1,315 @@
+"""
+IngestionPipeline - Procesa artículos subidos en segundo plano.
+
+La subida sólo persiste el archivo y crea un ``IngestionJob``; las etapas
+costosas (parseo, metadatos, tópicos y estructura) se ejecutan en un pool
+de workers y registran su progreso etapa por etapa en el job.
+"""
+
+import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.models import Article, IngestionJob, UserLibrary
+from app.services.article_text_store import get_article_text_store
+from app.services.document_structure_extractor import DocumentStructureExtractor
+from app.services.metadata_extractor import MetadataExtractor
+from app.services.near_duplicates import get_near_duplicate_index
+from app.services.parsed_document import ParsedDocument, get_parsed_document_store
+from app.services.section_index import get_section_index
+from app.services.summary_cache import get_summary_cache
+from app.services.topic_classifier import TopicClassifier
+
+logger = logging.getLogger(__name__)
+
+INGESTION_STAGES = ["parse", "text", "dedupe", "metadata", "topics", "structure"]
+
+topic_classifier = TopicClassifier()
+
+
+def assign_topics(article: Article, extra_text: str = ""):
+    keywords = article.keywords or []
+    abstract = article.abstract or ""
+    detected = topic_classifier.detect_topics(
+        title=article.title or "",
+        abstract=abstract,
+        keywords=keywords,
+        extra_text=extra_text or "",
+    )
+    article.auto_topics = detected
+
+
+class _IngestionContext:
+    """Estado compartido entre las etapas de un job."""
+
+    def __init__(self, article: Article):
+        self.article = article
+        self.document: Optional[ParsedDocument] = None
+        self.text_excerpt = ""
+        self.duplicate_of: Optional[int] = None
+
+    @property
+    def is_pdf(self) -> bool:
+        return (self.article.file_path or "").lower().endswith(".pdf")
+
+
+class IngestionPipeline:
+    """
+    Pool de workers que ejecuta las etapas de ingesta de cada artículo.
+
+    Cada etapa abre su propia sesión de base de datos a través del job, de
+    modo que el endpoint de estado ve el progreso mientras el job avanza.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ):
+        self.session_factory = session_factory
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="ingestion"
+        )
+        self._stages: Dict[str, Callable[[Session, _IngestionContext], Dict]] = {
+            "parse": self._stage_parse,
+            "text": self._stage_text,
+            "dedupe": self._stage_dedupe,
+            "metadata": self._stage_metadata,
+            "topics": self._stage_topics,
+            "structure": self._stage_structure,
+        }
+
+    def enqueue(self, db: Session, article: Article, user_id: int) -> IngestionJob:
+        """
+        Crea el job para un artículo recién persistido y lo envía al pool.
+
+        El artículo debe estar ya confirmado en la base de datos.
+        """
+        job = IngestionJob(
+            id=uuid.uuid4().hex,
+            user_id=user_id,
+            article_id=article.id,
+            status="queued",
+            stages={name: {"status": "pending"} for name in INGESTION_STAGES},
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+
+        self._executor.submit(self.run, job.id)
+        return job
+
+    def run(self, job_id: str) -> None:
+        db = self.session_factory()
+        try:
+            job = db.query(IngestionJob).filter(IngestionJob.id == job_id).first()
+            if not job:
+                logger.warning(f"Ingestion job {job_id} no longer exists")
+                return
+            article = db.query(Article).filter(Article.id == job.article_id).first()
+            if not article:
+                self._fail(db, job, "Article no longer exists")
+                return
+
+            job.status = "running"
+            db.commit()
+
+            context = _IngestionContext(article)
+            for name in INGESTION_STAGES:
+                self._set_stage(db, job, name, "running")
+                try:
+                    detail = self._stages[name](db, context)
+                except Exception as e:
+                    logger.error(f"Ingestion stage '{name}' failed for job {job_id}: {e}", exc_info=True)
+                    db.rollback()
+                    self._set_stage(db, job, name, "failed", {"error": str(e)})
+                    article.status = "failed"
+                    self._fail(db, job, f"Stage '{name}' failed: {e}")
+                    return
+                self._set_stage(db, job, name, "completed", detail)
+
+            article.status = "duplicate" if context.duplicate_of else "active"
+            job.status = "completed"
+            job.stage = None
+            db.commit()
+            logger.info(f"Ingestion job {job_id} completed for article {article.id}")
+        except Exception:
+            logger.exception(f"Unexpected error running ingestion job {job_id}")
+            db.rollback()
+        finally:
+            db.close()
+
+    def recover(self) -> int:
+        """
+        Reencola los jobs que quedaron a medias al reiniciar el proceso.
+
+        El pool vive en memoria, así que un job ``queued`` o ``running`` al
+        arrancar no lo va a terminar nadie. Todas las etapas reemplazan lo
+        que guardaron, por lo que el job se repite desde el principio. Los
+        artículos ``processing`` sin job pendiente (caída entre crear el
+        artículo y el job) se marcan ``failed``.
+        """
+        db = self.session_factory()
+        try:
+            jobs = (
+                db.query(IngestionJob)
+                .filter(IngestionJob.status.in_(["queued", "running"]))
+                .all()
+            )
+            for job in jobs:
+                job.status = "queued"
+                job.stage = None
+                job.stages = {name: {"status": "pending"} for name in INGESTION_STAGES}
+            job_ids = [job.id for job in jobs]
+
+            pending = db.query(IngestionJob.article_id).filter(
+                IngestionJob.id.in_(job_ids), IngestionJob.article_id.isnot(None)
+            )
+            orphaned = (
+                db.query(Article)
+                .filter(Article.status == "processing", ~Article.id.in_(pending))
+                .update({"status": "failed"}, synchronize_session=False)
+            )
+            db.commit()
+            if orphaned:
+                logger.warning(f"Marked {orphaned} articles without an ingestion job as failed")
+        finally:
+            db.close()
+
+        for job_id in job_ids:
+            self._executor.submit(self.run, job_id)
+        if job_ids:
+            logger.info(f"Requeued {len(job_ids)} interrupted ingestion jobs")
+        return len(job_ids)
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait)
+
+    def _stage_parse(self, db: Session, context: _IngestionContext) -> Dict:
+        article = context.article
+        if context.is_pdf:
+            context.document = get_parsed_document_store().get(
+                article.file_path, article.file_hash
+            )
+            return {"pages": context.document.page_count}
+
+        with open(article.file_path, "r", encoding="utf-8", errors="ignore") as f:
+            context.text_excerpt = f.read(5000)
+        return {"pages": None}
+
+    def _stage_text(self, db: Session, context: _IngestionContext) -> Dict:
+        article = context.article
+        store = get_article_text_store()
+        if context.document:
+            pages = store.save_document(db, article.id, context.document)
+        else:
+            with open(article.file_path, "r", encoding="utf-8", errors="ignore") as f:
+                pages = store.save_pages(db, article.id, [f.read()])
+        # Summaries of a previous ingest of this file are built on stale text
+        get_summary_cache().invalidate(db, article.file_hash)
+        db.commit()
+        return {"pages": pages}
+
+    def _stage_dedupe(self, db: Session, context: _IngestionContext) -> Dict:
+        article = context.article
+        index = get_near_duplicate_index()
+        signature = index.signature(get_article_text_store().get_text(db, article))
+        if signature is None:
+            return {"skipped": True}
+
+        matches = index.find_similar(db, signature, exclude_id=article.id)
+        index.add(db, article.id, signature)
+        if matches:
+            original_id, similarity = matches[0]
+            logger.info(
+                f"Article {article.id} is a near-duplicate of {original_id} (similarity {similarity:.2f})"
+            )
+            # Link the uploader to the existing article instead of re-processing a copy
+            article.duplicate_of_id = original_id
+            context.duplicate_of = original_id
+            if not db.query(UserLibrary).filter(
+                UserLibrary.user_id == article.uploaded_by, UserLibrary.article_id == original_id
+            ).first():
+                db.add(UserLibrary(user_id=article.uploaded_by, article_id=original_id, status="unread"))
+            db.commit()
+            return {"duplicate_of": original_id, "similarity": round(similarity, 3)}
+
+        db.commit()
+        return {"duplicate_of": None}
+
+    def _stage_metadata(self, db: Session, context: _IngestionContext) -> Dict:
+        if not context.document:
+            return {"skipped": True}
+
+        article = context.article
+        metadata = MetadataExtractor.extract_from_pdf(
+            article.file_path, document=context.document
+        )
+        context.text_excerpt = metadata.get("text_excerpt") or ""
+
+        if metadata.get("title") and metadata["title"].strip():
+            article.title = metadata["title"]
+        article.authors = metadata.get("authors", [])
+        article.abstract = metadata.get("abstract")
+        article.keywords = metadata.get("keywords", [])
+        article.publication_year = metadata.get("publication_year")
+        article.journal = metadata.get("journal")
+
+        doi = metadata.get("doi")
+        if doi:
+            taken = db.query(Article.id).filter(Article.doi == doi, Article.id != article.id).first()
+            if taken:
+                logger.warning(f"DOI {doi} already belongs to article {taken[0]}, not assigning it")
+            else:
+                article.doi = doi
+
+        db.commit()
+        return {"title": article.title, "doi": article.doi}
+
+    def _stage_topics(self, db: Session, context: _IngestionContext) -> Dict:
+        if context.duplicate_of:
+            return {"skipped": True, "duplicate_of": context.duplicate_of}
+        assign_topics(context.article, extra_text=context.text_excerpt)
+        db.commit()
+        return {"topics": list(context.article.auto_topics or [])}
+
+    def _stage_structure(self, db: Session, context: _IngestionContext) -> Dict:
+        if not context.document or context.duplicate_of:
+            return {"skipped": True}
+        spans = DocumentStructureExtractor().extract_spans(context.document.iter_lines())
+        get_section_index().save_spans(db, context.article.id, spans)
+        db.commit()
+        return {"sections": [span.name for span in spans]}
+
+    def _set_stage(
+        self,
+        db: Session,
+        job: IngestionJob,
+        name: str,
+        status: str,
+        detail: Optional[Dict] = None,
+    ) -> None:
+        stages = dict(job.stages or {})
+        entry = {"status": status}
+        if detail:
+            entry["detail"] = detail
+        stages[name] = entry
+        job.stages = stages
+        job.stage = name
+        db.commit()
+
+    def _fail(self, db: Session, job: IngestionJob, error: str) -> None:
+        job.status = "failed"
+        job.error = error
+        db.commit()
+
+
+@lru_cache()
+def get_ingestion_pipeline() -> IngestionPipeline:
+    return IngestionPipeline(max_workers=get_settings().ingestion_workers)
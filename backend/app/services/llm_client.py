@@ -0,0 +1,273 @@
+"""
+Cliente LLM compartido para los resumidores.
+
+Todas las llamadas a la API de chat (Groq, compatible con OpenAI) pasan por
+un único ``LLMClient`` por proceso: mantiene conexiones keep-alive en un pool
+(sin un handshake TCP+TLS por llamada), aplica los mismos timeouts y
+cabeceras en todas partes y ofrece la misma operación en versión síncrona
+(rutas y hilos) y asíncrona (event loop). Cada llamada pasa por el
+``LLMScheduler`` del cliente (cuotas, reintentos, circuit breaker).
+"""
+
+import json
+import logging
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import httpx
+
+from app.core.config import get_settings
+from app.services.llm_scheduler import CircuitOpenError, LLMError, LLMScheduler
+from app.services.token_estimator import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+GROQ_BASE_URL = "https://api.groq.com/openai/v1"
+USER_AGENT = "SIGRAA/1.0"
+
+__all__ = ["CircuitOpenError", "LLMClient", "LLMError", "get_llm_client"]
+
+
+class LLMClient:
+    """
+    Cliente de chat completions con pool de conexiones.
+
+    La clave de API se pasa en cada llamada porque cada resumidor recibe la
+    suya; el pool y los timeouts son comunes.
+
+    Args:
+        base_url: URL base de la API compatible con OpenAI
+        max_connections: Conexiones simultáneas (y keep-alive) del pool
+        timeout: Timeout de lectura por llamada, en segundos
+        output_reserve_tokens: Tokens de salida que se reservan como mucho por
+            llamada; la reserva se ajusta a lo consumido al terminar
+        scheduler: Planificador de las llamadas (por defecto, sin cuota de tokens)
+        transport: Transporte httpx alternativo (tests)
+    """
+
+    def __init__(
+        self,
+        base_url: str = GROQ_BASE_URL,
+        max_connections: int = 20,
+        timeout: float = 180.0,
+        output_reserve_tokens: int = 2000,
+        scheduler: Optional[LLMScheduler] = None,
+        transport: Optional[httpx.BaseTransport] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.max_connections = max_connections
+        self.timeout = httpx.Timeout(timeout, connect=10.0)
+        self.output_reserve_tokens = output_reserve_tokens
+        self.scheduler = scheduler or LLMScheduler()
+        self._transport = transport
+        self._client = httpx.Client(**self._client_options(), transport=transport)
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._async_lock = threading.Lock()
+
+    def chat(
+        self,
+        api_key: str,
+        model: str,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float = 0.3,
+    ) -> str:
+        """
+        Devuelve el contenido de la primera respuesta del modelo.
+
+        Raises:
+            LLMError: Si la petición falla o no hay contenido
+        """
+        payload = self._payload(model, messages, max_tokens, temperature)
+
+        def send() -> Tuple[str, Optional[int]]:
+            try:
+                response = self._client.post(
+                    "/chat/completions", json=payload, headers=self._auth(api_key)
+                )
+            except httpx.TransportError as exc:
+                raise LLMError(f"LLM request failed: {exc}", retryable=True) from exc
+            return self._parse(response)
+
+        return self.scheduler.call(send, self._reserve_tokens(messages, max_tokens))
+
+    async def achat(
+        self,
+        api_key: str,
+        model: str,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float = 0.3,
+    ) -> str:
+        """Versión asíncrona de ``chat``."""
+        payload = self._payload(model, messages, max_tokens, temperature)
+
+        async def send() -> Tuple[str, Optional[int]]:
+            try:
+                response = await self._get_async_client().post(
+                    "/chat/completions", json=payload, headers=self._auth(api_key)
+                )
+            except httpx.TransportError as exc:
+                raise LLMError(f"LLM request failed: {exc}", retryable=True) from exc
+            return self._parse(response)
+
+        return await self.scheduler.acall(send, self._reserve_tokens(messages, max_tokens))
+
+    def stream_chat(
+        self,
+        api_key: str,
+        model: str,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float = 0.3,
+    ) -> Iterator[str]:
+        """
+        Genera los fragmentos de texto de la respuesta a medida que llegan.
+
+        Raises:
+            LLMError: Si la petición falla antes o durante el stream
+        """
+        payload = {**self._payload(model, messages, max_tokens, temperature), "stream": True}
+
+        def send() -> Iterator[str]:
+            try:
+                with self._client.stream(
+                    "POST", "/chat/completions", json=payload, headers=self._auth(api_key)
+                ) as response:
+                    if response.is_error:
+                        response.read()
+                        self._parse(response)
+                    yield from self._iter_deltas(response.iter_lines())
+            except httpx.TransportError as exc:
+                raise LLMError(f"LLM request failed: {exc}", retryable=True) from exc
+
+        prompt_tokens = self._prompt_tokens(messages)
+        return self.scheduler.stream(
+            send, self._reserve_tokens(messages, max_tokens, prompt_tokens), prompt_tokens
+        )
+
+    def close(self) -> None:
+        self._client.close()
+
+    async def aclose(self) -> None:
+        self.close()
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        # Se crea en el primer uso, ya dentro del event loop
+        with self._async_lock:
+            if self._async_client is None:
+                transport = self._transport
+                if not isinstance(transport, httpx.AsyncBaseTransport):
+                    transport = None
+                self._async_client = httpx.AsyncClient(**self._client_options(), transport=transport)
+            return self._async_client
+
+    def _client_options(self) -> Dict:
+        return {
+            "base_url": self.base_url,
+            "limits": httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+            "timeout": self.timeout,
+            "headers": {"User-Agent": USER_AGENT, "Content-Type": "application/json"},
+        }
+
+    @staticmethod
+    def _auth(api_key: str) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {api_key}"}
+
+    @staticmethod
+    def _payload(
+        model: str, messages: List[Dict[str, str]], max_tokens: int, temperature: float
+    ) -> Dict:
+        return {
+            "model": model,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "messages": messages,
+        }
+
+    @staticmethod
+    def _prompt_tokens(messages: List[Dict[str, str]]) -> int:
+        return sum(estimate_tokens(message.get("content", "")) for message in messages)
+
+    def _reserve_tokens(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        prompt_tokens: Optional[int] = None,
+    ) -> int:
+        """Prompt más la salida esperada; reservar ``max_tokens`` entero agotaría la cuota."""
+        if prompt_tokens is None:
+            prompt_tokens = self._prompt_tokens(messages)
+        return prompt_tokens + min(max_tokens, self.output_reserve_tokens)
+
+    @staticmethod
+    def _parse(response: httpx.Response) -> Tuple[str, Optional[int]]:
+        """Devuelve (contenido, tokens usados) o lanza ``LLMError``."""
+        if response.status_code == 429 or response.status_code >= 500:
+            raise LLMError(
+                f"LLM request failed with status {response.status_code}",
+                retryable=True,
+                retry_after=_retry_after(response),
+                rate_limited=response.status_code == 429,
+            )
+        if response.is_error:
+            raise LLMError(f"LLM request failed with status {response.status_code}: {response.text[:200]}")
+        try:
+            data = response.json()
+            choices = data.get("choices", [])
+            if not choices:
+                raise LLMError("LLM returned no completion choices.")
+            usage = data.get("usage") or {}
+            return choices[0]["message"]["content"].strip(), usage.get("total_tokens")
+        except (ValueError, KeyError, TypeError) as exc:
+            raise LLMError(f"Malformed LLM response: {exc}") from exc
+
+    @staticmethod
+    def _iter_deltas(lines: Iterable[str]) -> Iterator[str]:
+        """Contenido de cada evento ``data:`` de una respuesta en streaming."""
+        for line in lines:
+            if not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                return
+            try:
+                choices = json.loads(data).get("choices") or []
+                content = choices[0].get("delta", {}).get("content") if choices else None
+            except (ValueError, AttributeError, IndexError) as exc:
+                raise LLMError(f"Malformed LLM stream event: {exc}") from exc
+            if content:
+                yield content
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+@lru_cache()
+def get_llm_client() -> LLMClient:
+    settings = get_settings()
+    return LLMClient(
+        max_connections=settings.llm_max_connections,
+        timeout=settings.llm_timeout,
+        output_reserve_tokens=settings.llm_output_reserve_tokens,
+        scheduler=LLMScheduler(
+            requests_per_minute=settings.llm_requests_per_minute,
+            tokens_per_minute=settings.llm_tokens_per_minute,
+            max_concurrency=settings.llm_max_concurrency,
+            max_retries=settings.llm_max_retries,
+            failure_threshold=settings.llm_breaker_failures,
+            reset_timeout=settings.llm_breaker_reset,
+        ),
+    )
@@ -0,0 +1,391 @@
+"""
+Planificador de llamadas al LLM.
+
+Todas las llamadas del ``LLMClient`` pasan por un ``LLMScheduler`` común que:
+
+- Reparte la cuota del proveedor con dos token buckets, peticiones/minuto y
+  tokens/minuto (se reserva la estimación y al terminar se ajusta a lo
+  consumido, en más o en menos).
+- Ajusta la concurrencia con AIMD: +1/limit por respuesta correcta y mitad
+  del límite ante cada 429.
+- Reintenta 429, 5xx y errores de red con backoff exponencial con jitter,
+  respetando ``Retry-After`` cuando el proveedor lo envía.
+- Abre un circuit breaker tras varios fallos seguidos: mientras está abierto
+  las llamadas fallan al instante con ``CircuitOpenError`` y los resumidores
+  pasan al método extractivo local.
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Dict, Iterator, Optional, Tuple, TypeVar
+
+from app.services.token_estimator import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class LLMError(RuntimeError):
+    """
+    Fallo de una llamada al LLM.
+
+    Args:
+        retryable: Si reintentar puede tener éxito (429, 5xx, red)
+        retry_after: Segundos indicados por el proveedor en ``Retry-After``
+        rate_limited: Si el proveedor respondió 429
+    """
+
+    def __init__(
+        self,
+        message: str,
+        retryable: bool = False,
+        retry_after: Optional[float] = None,
+        rate_limited: bool = False,
+    ):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+        self.rate_limited = rate_limited
+
+
+class CircuitOpenError(LLMError):
+    """El proveedor está degradado y las llamadas se rechazan sin intentarlas."""
+
+
+class TokenBucket:
+    """
+    Token bucket con reserva a crédito.
+
+    ``reserve`` descuenta siempre y devuelve cuánto hay que esperar hasta que
+    el saldo vuelva a ser positivo, así las esperas respetan el orden de
+    llegada sin bucles de sondeo. Con ``per_minute <= 0`` no limita.
+    """
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """Reserva ``amount`` (como mucho la capacidad) y devuelve la espera en segundos."""
+        if self.capacity <= 0:
+            return 0.0
+        with self._lock:
+            self._refill()
+            self._tokens -= min(amount, self.capacity)
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def refund(self, amount: float) -> None:
+        if self.capacity <= 0 or amount <= 0:
+            return
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+    def settle(self, reserved: float, used: float) -> None:
+        """Ajusta una reserva de ``reserved`` a lo consumido; el exceso se debe."""
+        if self.capacity <= 0:
+            return
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + min(reserved, self.capacity) - used)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class AdaptiveConcurrency:
+    """Límite de llamadas en vuelo con aumento aditivo y reducción multiplicativa."""
+
+    def __init__(self, initial: int, minimum: int = 1, maximum: Optional[int] = None):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum or initial)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.in_flight = 0
+        self._condition = threading.Condition()
+
+    def try_acquire(self) -> bool:
+        with self._condition:
+            if self.in_flight < int(self.limit):
+                self.in_flight += 1
+                return True
+            return False
+
+    def acquire(self) -> None:
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+
+    async def aacquire(self, poll_interval: float = 0.05) -> None:
+        while not self.try_acquire():
+            await asyncio.sleep(poll_interval)
+
+    def release(self) -> None:
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify()
+
+    def increase(self) -> None:
+        with self._condition:
+            previous = int(self.limit)
+            self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            if int(self.limit) > previous:
+                self._condition.notify()
+
+    def decrease(self) -> None:
+        with self._condition:
+            self.limit = max(self.minimum, self.limit / 2)
+        logger.warning(f"LLM rate limited, concurrency limit lowered to {int(self.limit)}")
+
+
+class CircuitBreaker:
+    """
+    Cerrado → abierto tras ``failure_threshold`` fallos seguidos; pasado
+    ``reset_timeout`` deja pasar una llamada de prueba (semiabierto) que lo
+    cierra si tiene éxito o lo vuelve a abrir si falla.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._clock = clock
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        """Raises ``CircuitOpenError`` si la llamada no debe intentarse."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            if self.state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            raise CircuitOpenError("LLM provider is degraded; circuit breaker is open")
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info("LLM circuit breaker closed")
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """La llamada de prueba terminó sin resultado (cancelada): se permite otra."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"LLM circuit breaker opened after {self.failures} failures")
+                self.state = self.OPEN
+                self._opened_at = self._clock()
+                self._probe_in_flight = False
+
+
+class LLMScheduler:
+    """
+    Admisión, reintentos y protección frente al proveedor para cada llamada.
+
+    ``call``/``acall`` reciben una función que hace una petición y devuelve
+    ``(resultado, tokens_usados)``; ``tokens`` es la estimación que se reserva
+    antes de llamar (prompt + una estimación acotada de la salida) y se ajusta
+    a los tokens usados al terminar.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = 30,
+        tokens_per_minute: float = 0,
+        max_concurrency: int = 8,
+        min_concurrency: int = 1,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+    ):
+        self.requests = TokenBucket(requests_per_minute, clock)
+        self.tokens = TokenBucket(tokens_per_minute, clock)
+        self.concurrency = AdaptiveConcurrency(max_concurrency, min_concurrency, max_concurrency)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout, clock)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retries = 0
+        self._rng = rng or random.Random()
+
+    def call(self, fn: Callable[[], Tuple[T, Optional[int]]], tokens: int) -> T:
+        attempt = 0
+        while True:
+            self.breaker.before_call()
+            try:
+                time.sleep(max(self.requests.reserve(1), self.tokens.reserve(tokens)))
+                with self._slot():
+                    result, used = fn()
+            except LLMError as exc:
+                delay = self._after_failure(exc, attempt, tokens)
+            except BaseException:
+                self._after_abandon(tokens, started=False)
+                raise
+            else:
+                self._after_success(tokens, used)
+                return result
+            time.sleep(delay)
+            attempt += 1
+
+    async def acall(self, fn: Callable[[], Awaitable[Tuple[T, Optional[int]]]], tokens: int) -> T:
+        attempt = 0
+        while True:
+            self.breaker.before_call()
+            try:
+                await asyncio.sleep(max(self.requests.reserve(1), self.tokens.reserve(tokens)))
+                await self.concurrency.aacquire()
+                try:
+                    result, used = await fn()
+                finally:
+                    self.concurrency.release()
+            except LLMError as exc:
+                delay = self._after_failure(exc, attempt, tokens)
+            except BaseException:
+                # Incluye la cancelación de la tarea
+                self._after_abandon(tokens, started=False)
+                raise
+            else:
+                self._after_success(tokens, used)
+                return result
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def stream(
+        self,
+        fn: Callable[[], Iterator[str]],
+        tokens: int,
+        prompt_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        """
+        Como ``call`` para una respuesta en streaming.
+
+        Sin recuento del proveedor, con ``prompt_tokens`` la reserva se ajusta
+        al terminar a ese prompt más la estimación del texto recibido.
+
+        Sólo se reintenta mientras no se ha entregado ningún fragmento: una
+        vez reenviado texto al cliente, un fallo se propaga sin reintentar.
+        El hueco de concurrencia se mantiene hasta agotar (o cerrar) el stream;
+        si el consumidor lo cierra antes (cliente SSE desconectado) se liberan
+        el hueco, la llamada de prueba del circuit breaker y la reserva.
+        """
+        attempt = 0
+        while True:
+            self.breaker.before_call()
+            started = False
+            output = 0
+            try:
+                time.sleep(max(self.requests.reserve(1), self.tokens.reserve(tokens)))
+                with self._slot():
+                    pieces = fn()
+                    try:
+                        for piece in pieces:
+                            started = True
+                            output += estimate_tokens(piece)
+                            yield piece
+                    finally:
+                        close = getattr(pieces, "close", None)
+                        if close is not None:
+                            close()
+            except LLMError as exc:
+                delay = self._after_failure(exc, self.max_retries if started else attempt, tokens)
+            except BaseException:
+                # GeneratorExit al cerrar el stream, u otro error
+                self._after_abandon(tokens, started)
+                raise
+            else:
+                self._after_success(tokens, None if prompt_tokens is None else prompt_tokens + output)
+                return
+            time.sleep(delay)
+            attempt += 1
+
+    def stats(self) -> Dict:
+        return {
+            "concurrency_limit": int(self.concurrency.limit),
+            "in_flight": self.concurrency.in_flight,
+            "circuit": self.breaker.state,
+            "retries": self.retries,
+        }
+
+    @contextmanager
+    def _slot(self):
+        self.concurrency.acquire()
+        try:
+            yield
+        finally:
+            self.concurrency.release()
+
+    def _after_success(self, reserved: int, used: Optional[int]) -> None:
+        if used is not None:
+            self.tokens.settle(reserved, used)
+        self.concurrency.increase()
+        self.breaker.record_success()
+
+    def _after_abandon(self, reserved: int, started: bool) -> None:
+        """Llamada interrumpida sin éxito ni fallo del proveedor."""
+        if started:
+            # El proveedor ya estaba respondiendo
+            self.breaker.record_success()
+        else:
+            self.tokens.refund(reserved)
+            self.breaker.release_probe()
+
+    def _after_failure(self, exc: LLMError, attempt: int, reserved: int) -> float:
+        """Devuelve la espera antes de reintentar o vuelve a lanzar ``exc``."""
+        # Una llamada fallida no consume tokens de la cuota por minuto
+        self.tokens.refund(reserved)
+        if exc.rate_limited:
+            self.concurrency.decrease()
+        if not exc.retryable:
+            # El proveedor respondió: el error es de la petición, no de su estado
+            self.breaker.record_success()
+            raise exc
+        # La llamada de prueba que falla, aunque sea con 429, vuelve a abrirlo
+        probe = self.breaker.state == CircuitBreaker.HALF_OPEN
+        if probe or not exc.rate_limited or attempt >= self.max_retries:
+            self.breaker.record_failure()
+        if attempt >= self.max_retries or self.breaker.state == CircuitBreaker.OPEN:
+            raise exc
+
+        self.retries += 1
+        # Full jitter; Retry-After es un mínimo
+        delay = self._rng.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if exc.retry_after is not None:
+            delay += min(exc.retry_after, self.backoff_max)
+        logger.info(f"Retrying LLM call in {delay:.1f}s after: {exc}")
+        return delay
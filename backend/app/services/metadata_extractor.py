@@ -1,13 +1,17 @@
-import PyPDF2
-import pdfplumber
 from typing import Dict, List, Optional
 import hashlib
-import re
+
+from app.services.metadata_scanner import scan_metadata
+from app.services.parsed_document import ParsedDocument, get_parsed_document_store
 
 
 class MetadataExtractor:
     @staticmethod
-    def extract_from_pdf(file_path: str) -> Dict:
+    def extract_from_pdf(
+        file_path: str,
+        file_hash: Optional[str] = None,
+        document: Optional[ParsedDocument] = None,
+    ) -> Dict:
         metadata = {
             "title": None,
             "authors": [],
@@ -20,7 +24,8 @@ class MetadataExtractor:
         }
 
         try:
-            with pdfplumber.open(file_path) as pdf:
+            pdf = document or get_parsed_document_store().get(file_path, file_hash)
+            if pdf:
                 # Try to get metadata from PDF properties
                 if pdf.metadata:
                     if pdf.metadata.get("Title"):
@@ -30,77 +35,15 @@ class MetadataExtractor:
                     if authors_str:
                         metadata["authors"] = [a.strip() for a in authors_str.split(",") if a.strip()]
 
-                # Extract text from first 3 pages for better metadata extraction
-                if len(pdf.pages) > 0:
-                    first_page_text = pdf.pages[0].extract_text() or ""
-                    
-                    # Try to extract title from first page if not in metadata
-                    if not metadata["title"] and first_page_text:
-                        lines = [line.strip() for line in first_page_text.split("\n") if line.strip()]
-                        
-                        # Look for title patterns (usually largest text on first page)
-                        for i, line in enumerate(lines[:15]):
-                            # Skip very short lines or common headers
-                            if len(line) > 10 and not line.lower().startswith(('www.', 'http', 'doi:', 'issn')):
-                                # Check if line looks like a title (not all caps, reasonable length)
-                                if len(line) < 200 and not line.isupper():
-                                    metadata["title"] = line
-                                    break
-                    
-                    # Try to extract DOI
-                    doi_match = re.search(r'(?:doi:|DOI:)\s*([^\s]+)', first_page_text)
-                    if doi_match:
-                        metadata["doi"] = doi_match.group(1).strip()
-                    else:
-                        # Alternative DOI pattern
-                        doi_match = re.search(r'10\.\d{4,}/[^\s]+', first_page_text)
-                        if doi_match:
-                            metadata["doi"] = doi_match.group(0).strip()
-                    
-                    # Try to extract year
-                    year_match = re.search(r'\b(19|20)\d{2}\b', first_page_text)
-                    if year_match:
-                        metadata["publication_year"] = int(year_match.group(0))
-
-                # Extract abstract and a longer text excerpt from first few pages
-                pages_text = [page.extract_text() or "" for page in pdf.pages[:5]]
-                full_text = "\n".join(pages_text)
-                
-                if full_text:
-                    # Look for abstract section
-                    abstract_patterns = [
-                        r'(?:Abstract|ABSTRACT|Resumen|RESUMEN)[:\s]*(.*?)(?=\n\n|\nKeywords|\nPalabras clave|\nIntroduction|\nINTRODUCTION|\n1\.|\nMethods)',
-                        r'(?:Abstract|ABSTRACT)[:\s]*(.*?)(?=\n[A-Z][a-z]+:|\n\d+\.)',
-                    ]
-                    
-                    for pattern in abstract_patterns:
-                        abstract_match = re.search(pattern, full_text, re.DOTALL | re.IGNORECASE)
-                        if abstract_match:
-                            abstract_text = abstract_match.group(1).strip()
-                            # Clean up the abstract
-                            abstract_text = re.sub(r'\s+', ' ', abstract_text)
-                            metadata["abstract"] = abstract_text[:1000]  # Limit length
-                            break
-                    
-                    # Look for keywords
-                    keywords_patterns = [
-                        r'(?:Keywords|KEYWORDS|Palabras clave)[:\s]*(.*?)(?=\n\n|\nIntroduction)',
-                        r'(?:Key words)[:\s]*(.*?)(?=\n)',
-                    ]
-                    
-                    for pattern in keywords_patterns:
-                        keywords_match = re.search(pattern, full_text, re.DOTALL | re.IGNORECASE)
-                        if keywords_match:
-                            keywords_text = keywords_match.group(1).strip()
-                            # Split by common delimiters
-                            keywords_list = re.split(r'[;,]', keywords_text)
-                            metadata["keywords"] = [k.strip() for k in keywords_list if k.strip()][:10]
-                            break
-
-                    # Save a compact excerpt of the text to improve topic detection
-                    compact = re.sub(r"\s+", " ", full_text).strip()
-                    if compact:
-                        metadata["text_excerpt"] = compact[:5000]
+                # Title, DOI and year from the first page; abstract, keywords
+                # and a text excerpt from the first five, in one linear pass
+                scanned = scan_metadata(pdf.iter_lines(), max_pages=5)
+                for field in ("doi", "publication_year", "abstract", "text_excerpt"):
+                    metadata[field] = scanned[field]
+                if not metadata["title"]:
+                    metadata["title"] = scanned["title"]
+                if scanned["keywords"]:
+                    metadata["keywords"] = scanned["keywords"]
 
         except Exception as e:
             print(f"Error extracting PDF metadata: {e}")
@@ -0,0 +1,247 @@
+"""
+Escáner lineal de campos de metadatos.
+
+Recorre las líneas de las primeras páginas una sola vez y extrae título,
+DOI, año, resumen, palabras clave y un extracto de texto. Cada campo es una
+pequeña máquina de estados (buscando → capturando → terminado) con un límite
+de caracteres fijo, de modo que el coste es lineal en el tamaño del texto
+aunque falten los separadores esperados (líneas en blanco, títulos de
+sección). Las expresiones regulares se aplican línea a línea y sin
+cuantificadores perezosos sobre el documento completo.
+
+Las páginas se leen seguidas, así que un resumen o una lista de palabras
+clave puede continuar en la página siguiente. Frente a las antiguas
+expresiones sobre el texto completo cambian dos casos: las líneas de un
+campo se unen con espacios (una palabra clave partida en dos líneas queda
+"early childhood", no "early\nchildhood"), y un marcador de resumen sin
+texto antes de "Keywords:" da ``None`` en lugar de tomar como resumen la
+línea de palabras clave.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+
+ABSTRACT_MAX_CHARS = 1000
+KEYWORDS_MAX_CHARS = 500
+MAX_KEYWORDS = 10
+EXCERPT_MAX_CHARS = 5000
+TITLE_MAX_LINES = 15
+# Caracteres de una línea que se consideran al capturar un campo
+FIELD_LINE_MAX_CHARS = 4096
+
+ABSTRACT_MARKER = re.compile(r"abstract|resumen", re.IGNORECASE)
+ABSTRACT_END = re.compile(r"keywords|palabras clave|introduction|1\.|methods", re.IGNORECASE)
+# Fin alternativo si nunca aparece ABSTRACT_END: "Etiqueta:" o "2." al inicio de línea
+ABSTRACT_FALLBACK_END = re.compile(r"[a-z]+:|\d+\.", re.IGNORECASE)
+KEYWORDS_MARKER = re.compile(r"keywords|palabras clave", re.IGNORECASE)
+KEYWORDS_END = re.compile(r"introduction", re.IGNORECASE)
+KEY_WORDS_MARKER = re.compile(r"key words", re.IGNORECASE)
+KEYWORDS_SPLIT = re.compile(r"[;,]")
+
+DOI_LABELLED = re.compile(r"(?:doi:|DOI:)\s*(\S{1,256})?")
+DOI_BARE = re.compile(r"10\.\d{4,9}/\S{1,256}")
+YEAR = re.compile(r"\b(?:19|20)\d{2}\b")
+TITLE_SKIP_PREFIXES = ("www.", "http", "doi:", "issn")
+
+
+def _collapse(text: str) -> str:
+    return " ".join(text.split())
+
+
+class FieldCapture:
+    """
+    Captura el texto que sigue a un marcador hasta una línea de cierre.
+
+    Args:
+        marker: Patrón que abre el campo (se busca dentro de la línea)
+        end: Patrón que, al inicio de una línea, cierra el campo
+        fallback_end: Cierre alternativo usado sólo si ``end`` no aparece
+        max_chars: Longitud máxima del valor capturado
+        end_on_blank: Si una línea en blanco cierra el campo
+        single_line: Captura sólo la primera línea con contenido
+    """
+
+    SEEKING, CAPTURING, DONE = range(3)
+
+    def __init__(
+        self,
+        marker: Pattern,
+        end: Optional[Pattern] = None,
+        fallback_end: Optional[Pattern] = None,
+        max_chars: int = ABSTRACT_MAX_CHARS,
+        end_on_blank: bool = True,
+        single_line: bool = False,
+    ):
+        self.marker = marker
+        self.end = end
+        self.fallback_end = fallback_end
+        self.max_chars = max_chars
+        self.end_on_blank = end_on_blank
+        self.single_line = single_line
+        self.state = self.SEEKING
+        self.closed = False
+        self._parts: List[str] = []
+        self._length = 0
+        self._fallback_at: Optional[int] = None
+        self._blank_seen = False
+
+    def feed(self, line: str) -> None:
+        if self.state == self.DONE:
+            return
+
+        if self.state == self.SEEKING:
+            match = self.marker.search(line)
+            if not match:
+                return
+            self.state = self.CAPTURING
+            rest = line[match.end():match.end() + FIELD_LINE_MAX_CHARS].lstrip(": \t")
+            if rest.strip():
+                self._append(rest)
+                if self.single_line:
+                    self._close()
+            return
+
+        if self._blank_seen:
+            # Una línea vacía seguida de otra línea separa párrafos
+            self._close()
+            return
+        if not line.strip():
+            self._blank_seen = not line and bool(self._parts) and self.end_on_blank
+            return
+        if self.single_line:
+            self._append(line)
+            self._close()
+            return
+        if self.end is not None and self.end.match(line):
+            self._close()
+            return
+        if (
+            self.fallback_end is not None
+            and self._fallback_at is None
+            and self.fallback_end.match(line)
+        ):
+            self._fallback_at = len(self._parts)
+        self._append(line)
+
+    def value(self) -> Optional[str]:
+        """Texto capturado, o None si el campo no se cerró."""
+        if self.closed:
+            parts = self._parts
+        elif self._fallback_at is not None:
+            parts = self._parts[:self._fallback_at]
+        else:
+            return None
+        return " ".join(parts)[:self.max_chars] or None
+
+    def _append(self, text: str) -> None:
+        # Una vez lleno sólo se siguen buscando cierres
+        if self._length >= self.max_chars:
+            return
+        collapsed = _collapse(text[:FIELD_LINE_MAX_CHARS])
+        if collapsed:
+            self._parts.append(collapsed)
+            self._length += len(collapsed) + 1
+        if len(text) > FIELD_LINE_MAX_CHARS:
+            self._length = self.max_chars
+
+    def _close(self) -> None:
+        self.state = self.DONE
+        self.closed = True
+
+
+class MetadataScanner:
+    """
+    Extracción de metadatos en una pasada sobre ``(page_number, line)``.
+
+    Título, DOI y año se buscan en la primera página; resumen, palabras clave
+    y extracto en las primeras ``max_pages``.
+    """
+
+    def __init__(self, max_pages: int = 5):
+        self.max_pages = max_pages
+        self.title: Optional[str] = None
+        self.publication_year: Optional[int] = None
+        self._title_lines = 0
+        self._doi: Optional[str] = None
+        self._doi_pending = False
+        self._bare_doi: Optional[str] = None
+        self._abstract = FieldCapture(
+            ABSTRACT_MARKER, ABSTRACT_END, ABSTRACT_FALLBACK_END, ABSTRACT_MAX_CHARS
+        )
+        self._keywords = FieldCapture(KEYWORDS_MARKER, KEYWORDS_END, max_chars=KEYWORDS_MAX_CHARS)
+        self._key_words = FieldCapture(
+            KEY_WORDS_MARKER, max_chars=KEYWORDS_MAX_CHARS, end_on_blank=False, single_line=True
+        )
+        self._excerpt: List[str] = []
+        self._excerpt_length = 0
+
+    def scan(self, lines: Iterable[Tuple[int, str]]) -> Dict:
+        for page_number, line in lines:
+            if page_number > self.max_pages:
+                break
+            self.feed(page_number, line)
+        return self.result()
+
+    def feed(self, page_number: int, line: str) -> None:
+        if page_number == 1:
+            self._scan_first_page(line)
+        self._abstract.feed(line)
+        self._keywords.feed(line)
+        self._key_words.feed(line)
+        if self._excerpt_length < EXCERPT_MAX_CHARS:
+            collapsed = _collapse(line[:EXCERPT_MAX_CHARS])
+            if collapsed:
+                self._excerpt.append(collapsed)
+                self._excerpt_length += len(collapsed) + 1
+            if len(line) > EXCERPT_MAX_CHARS:
+                self._excerpt_length = EXCERPT_MAX_CHARS
+
+    def result(self) -> Dict:
+        keywords_text = self._keywords.value() or self._key_words.value() or ""
+        keywords = [k.strip() for k in KEYWORDS_SPLIT.split(keywords_text) if k.strip()]
+        return {
+            "title": self.title,
+            "doi": self._doi or self._bare_doi,
+            "publication_year": self.publication_year,
+            "abstract": self._abstract.value(),
+            "keywords": keywords[:MAX_KEYWORDS],
+            "text_excerpt": " ".join(self._excerpt)[:EXCERPT_MAX_CHARS] or None,
+        }
+
+    def _scan_first_page(self, line: str) -> None:
+        stripped = line.strip()
+        if not stripped:
+            return
+
+        if self.title is None and self._title_lines < TITLE_MAX_LINES:
+            self._title_lines += 1
+            if (
+                10 < len(stripped) < 200
+                and not stripped.lower().startswith(TITLE_SKIP_PREFIXES)
+                and not stripped.isupper()
+            ):
+                self.title = stripped
+
+        if self._doi is None:
+            if self._doi_pending:
+                # "DOI:" al final de la línea anterior
+                self._doi = stripped.split(None, 1)[0][:256]
+            else:
+                match = DOI_LABELLED.search(line)
+                if match:
+                    self._doi = match.group(1)
+                    self._doi_pending = self._doi is None
+            if self._bare_doi is None:
+                match = DOI_BARE.search(line)
+                if match:
+                    self._bare_doi = match.group(0)
+
+        if self.publication_year is None:
+            match = YEAR.search(line)
+            if match:
+                self.publication_year = int(match.group(0))
+
+
+def scan_metadata(lines: Iterable[Tuple[int, str]], max_pages: int = 5) -> Dict:
+    """Atajo de ``MetadataScanner(max_pages).scan(lines)``."""
+    return MetadataScanner(max_pages).scan(lines)
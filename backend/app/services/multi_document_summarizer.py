@@ -6,9 +6,9 @@ en la literatura, y sintetizar hallazgos de múltiples artículos.
 """
 
 import logging
-from typing import List, Dict, Optional
-import requests
+from typing import List
 from app.models.article import Article
+from app.services.llm_client import get_llm_client
 
 logger = logging.getLogger(__name__)
 
@@ -483,31 +483,16 @@ INSTRUCCIONES CRÍTICAS:
             "exhaustive": 16000,
         }
 
-        headers = {
-            "Authorization": f"Bearer {self.groq_api_key}",
-            "Content-Type": "application/json",
-        }
-
-        payload = {
-            "model": self.groq_model,
-            "temperature": 0.3,
-            "max_tokens": max_tokens.get(level, 8000),
-            "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-        }
-
         try:
-            resp = requests.post(
-                "https://api.groq.com/openai/v1/chat/completions",
-                json=payload,
-                headers=headers,
-                timeout=180,  # 3 minutos para análisis complejos
+            return get_llm_client().chat(
+                self.groq_api_key,
+                self.groq_model,
+                [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                max_tokens=max_tokens.get(level, 8000),
             )
-            resp.raise_for_status()
-            data = resp.json()
-            return data["choices"][0]["message"]["content"].strip()
         except Exception as e:
             logger.error(f"Error calling Groq for multi-document summary: {e}")
             raise RuntimeError(f"Groq API call failed: {e}")
@@ -0,0 +1,182 @@
+"""
+Detección de documentos casi duplicados.
+
+El ``file_hash`` sólo detecta archivos idénticos byte a byte; una misma obra
+re-codificada (otro PDF, otra exportación) produce otro hash. Aquí cada
+artículo recibe una firma MinHash de sus shingles de palabras y se indexa con
+LSH por bandas (``article_lsh_buckets``): los candidatos se obtienen con una
+consulta por banda, sin comparar contra todos los artículos.
+"""
+
+import hashlib
+import logging
+import re
+import unicodedata
+from functools import lru_cache
+from typing import List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.models import Article, ArticleLshBucket, ArticleSignature
+
+logger = logging.getLogger(__name__)
+
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+# Primo de Mersenne 2^61 - 1: a * x + b cabe en uint64 con a, b, x < 2^32
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def _normalize(text: str) -> str:
+    text = unicodedata.normalize("NFD", text.lower())
+    return "".join(ch for ch in text if unicodedata.category(ch) != "Mn")
+
+
+def shingles(text: str, size: int = 5) -> Set[int]:
+    """Hashes de 32 bits de los k-gramas de palabras del texto normalizado."""
+    words = WORD_RE.findall(_normalize(text))
+    if len(words) < size:
+        return set()
+    return {
+        int.from_bytes(
+            hashlib.blake2b(" ".join(words[i:i + size]).encode("utf-8"), digest_size=4).digest(),
+            "little",
+        )
+        for i in range(len(words) - size + 1)
+    }
+
+
+class NearDuplicateIndex:
+    """
+    Firmas MinHash con índice LSH por bandas.
+
+    Con ``bands`` × ``rows`` = ``num_perm``, dos documentos con similitud de
+    Jaccard s comparten al menos un bucket con probabilidad 1 - (1 - s^rows)^bands;
+    con 16 × 8 es ~0.99 para s = 0.85 y ~0.06 para s = 0.5.
+
+    Args:
+        num_perm: Número de permutaciones de la firma
+        bands: Bandas del índice LSH (debe dividir a ``num_perm``)
+        threshold: Similitud estimada mínima para considerar casi duplicado
+        shingle_size: Palabras por shingle
+        min_shingles: Por debajo de este número de shingles no se calcula firma
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 128,
+        bands: int = 16,
+        threshold: float = 0.8,
+        shingle_size: int = 5,
+        min_shingles: int = 20,
+        seed: int = 1,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.min_shingles = min_shingles
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """Firma MinHash del texto, o None si es demasiado corto para ser fiable."""
+        hashes = shingles(text, self.shingle_size)
+        if len(hashes) < self.min_shingles:
+            return None
+
+        values = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+        signature = np.full(self.num_perm, MAX_HASH, dtype=np.uint64)
+        # Por bloques para acotar la matriz permutaciones × shingles
+        for start in range(0, len(values), 4096):
+            block = values[start:start + 4096]
+            permuted = (np.outer(self._a, block) + self._b[:, None]) % MERSENNE_PRIME
+            np.minimum(signature, (permuted & MAX_HASH).min(axis=1), out=signature)
+        return signature
+
+    @staticmethod
+    def similarity(first: np.ndarray, second: np.ndarray) -> float:
+        """Similitud de Jaccard estimada entre dos firmas."""
+        return float(np.mean(first == second))
+
+    def band_keys(self, signature: np.ndarray) -> List[str]:
+        return [
+            hashlib.blake2b(
+                signature[band * self.rows:(band + 1) * self.rows].tobytes(), digest_size=8
+            ).hexdigest()
+            for band in range(self.bands)
+        ]
+
+    def add(self, db: Session, article_id: int, signature: np.ndarray) -> None:
+        """Indexa la firma del artículo (pendiente de commit)."""
+        self.remove(db, article_id)
+        db.add(ArticleSignature(article_id=article_id, signature=signature.astype("<u8").tobytes()))
+        db.add_all(
+            ArticleLshBucket(band=band, bucket=key, article_id=article_id)
+            for band, key in enumerate(self.band_keys(signature))
+        )
+
+    def remove(self, db: Session, article_id: int) -> None:
+        db.query(ArticleLshBucket).filter(ArticleLshBucket.article_id == article_id).delete(
+            synchronize_session=False
+        )
+        db.query(ArticleSignature).filter(ArticleSignature.article_id == article_id).delete(
+            synchronize_session=False
+        )
+
+    def find_similar(
+        self,
+        db: Session,
+        signature: np.ndarray,
+        exclude_id: Optional[int] = None,
+    ) -> List[Tuple[int, float]]:
+        """
+        Artículos canónicos (no marcados como duplicados) con similitud >= ``threshold``.
+
+        Returns:
+            Lista de (article_id, similitud) ordenada de mayor a menor similitud
+        """
+        bucket_filter = or_(
+            *(
+                and_(ArticleLshBucket.band == band, ArticleLshBucket.bucket == key)
+                for band, key in enumerate(self.band_keys(signature))
+            )
+        )
+        candidates: Set[int] = {
+            article_id
+            for (article_id,) in db.query(ArticleLshBucket.article_id).filter(bucket_filter).distinct()
+        }
+        candidates.discard(exclude_id)
+        if not candidates:
+            return []
+
+        rows = (
+            db.query(ArticleSignature.article_id, ArticleSignature.signature)
+            .join(Article, Article.id == ArticleSignature.article_id)
+            .filter(
+                ArticleSignature.article_id.in_(candidates),
+                Article.duplicate_of_id.is_(None),
+                Article.status.in_(("active", "processing")),
+            )
+        )
+        matches = []
+        for article_id, data in rows:
+            score = self.similarity(signature, np.frombuffer(data, dtype="<u8"))
+            if score >= self.threshold:
+                matches.append((article_id, score))
+        return sorted(matches, key=lambda match: match[1], reverse=True)
+
+
+@lru_cache()
+def get_near_duplicate_index() -> NearDuplicateIndex:
+    from app.core.config import get_settings
+
+    return NearDuplicateIndex(threshold=get_settings().near_duplicate_threshold)
@@ -0,0 +1,345 @@
+"""
+ParsedDocument - Artefacto persistente de un PDF parseado una sola vez.
+
+Un PDF se parsea una única vez por contenido (``file_hash``);
+el texto por página y su estructura de líneas se guardan en
+``data/processed/<hash>.json.gz`` y todos los servicios (metadatos,
+estructura, resúmenes) leen de este artefacto en lugar de re-parsear.
+"""
+
+import gzip
+import json
+import logging
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pdfplumber
+
+from app.services.text_extraction import (
+    ExtractionPolicy,
+    TextExtractionBackend,
+    get_backend,
+    iter_pdf_pages,
+)
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+PROCESSED_DIR = BASE_DIR / "data" / "processed"
+
+# Subir cuando cambie el formato del artefacto para forzar re-parseo
+ARTIFACT_VERSION = 1
+
+
+@dataclass
+class ParsedDocument:
+    """Texto de un PDF organizado por páginas y líneas."""
+
+    file_hash: str
+    pages: List[List[str]]
+    metadata: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def page_count(self) -> int:
+        return len(self.pages)
+
+    def page_text(self, page_number: int) -> str:
+        """Texto de una página (1-indexed)."""
+        return "\n".join(self.pages[page_number - 1])
+
+    def text(self, max_pages: Optional[int] = None) -> str:
+        """Texto de las primeras ``max_pages`` páginas no vacías, separado por saltos de línea."""
+        pages = self.pages if max_pages is None else self.pages[:max_pages]
+        return "\n".join("\n".join(lines) for lines in pages if lines)
+
+    def iter_pages(self) -> Iterator[Tuple[int, str]]:
+        """Itera (page_number, text) omitiendo páginas sin texto."""
+        for page_number, lines in enumerate(self.pages, start=1):
+            if lines:
+                yield page_number, "\n".join(lines)
+
+    def iter_lines(self) -> Iterator[Tuple[int, str]]:
+        """Itera (page_number, line) sobre todo el documento."""
+        for page_number, lines in enumerate(self.pages, start=1):
+            for line in lines:
+                yield page_number, line
+
+    def to_dict(self) -> Dict:
+        return {
+            "version": ARTIFACT_VERSION,
+            "file_hash": self.file_hash,
+            "metadata": self.metadata,
+            "pages": self.pages,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ParsedDocument":
+        return cls(
+            file_hash=data["file_hash"],
+            pages=data.get("pages", []),
+            metadata=data.get("metadata", {}),
+        )
+
+
+def page_ranges(page_count: int, parts: int) -> List[Tuple[int, int]]:
+    """Divide ``page_count`` páginas en a lo sumo ``parts`` rangos contiguos [start, stop)."""
+    parts = max(1, min(parts, page_count))
+    size, extra = divmod(page_count, parts)
+    ranges = []
+    start = 0
+    for i in range(parts):
+        stop = start + size + (1 if i < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def _extract_page_range(
+    file_path: str, start: int, stop: int, backend_name: str = "pdfplumber"
+) -> List[List[str]]:
+    """Extrae las líneas de un rango de páginas (se ejecuta en un proceso worker)."""
+    return get_backend(backend_name).extract_pages(file_path, start, stop)
+
+
+_extraction_pool: Optional[ProcessPoolExecutor] = None
+_extraction_pool_lock = threading.Lock()
+
+
+def _get_extraction_pool(processes: int) -> ProcessPoolExecutor:
+    global _extraction_pool
+    with _extraction_pool_lock:
+        if _extraction_pool is None:
+            # spawn: el proceso padre tiene hilos (uvicorn, workers de ingesta)
+            _extraction_pool = ProcessPoolExecutor(
+                max_workers=processes,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _extraction_pool
+
+
+def _discard_extraction_pool(pool: ProcessPoolExecutor) -> None:
+    global _extraction_pool
+    with _extraction_pool_lock:
+        if _extraction_pool is pool:
+            _extraction_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _extract_pages(
+    file_path: str,
+    backend: TextExtractionBackend,
+    start: int,
+    stop: int,
+    parallel_min_pages: int = 0,
+    processes: int = 1,
+) -> List[List[str]]:
+    """
+    Extrae las páginas [start, stop) con ``backend``.
+
+    Si el rango tiene al menos ``parallel_min_pages`` páginas (y ``processes`` > 1)
+    se reparte en rangos contiguos entre un pool de procesos y se reensambla en
+    orden; la extracción es Python puro y limitada por CPU.
+    """
+    page_count = stop - start
+    if page_count <= 0:
+        return []
+
+    if not (processes > 1 and 0 < parallel_min_pages <= page_count):
+        return backend.extract_pages(file_path, start, stop)
+
+    logger.info(
+        f"Extracting {page_count} pages of {file_path} with {backend.name} in {processes} processes"
+    )
+    pool = _get_extraction_pool(processes)
+    pages: List[List[str]] = []
+    try:
+        # Más rangos que procesos para repartir mejor páginas de coste desigual
+        futures = [
+            pool.submit(_extract_page_range, file_path, start + lo, start + hi, backend.name)
+            for lo, hi in page_ranges(page_count, processes * 4)
+        ]
+        for future in futures:
+            pages.extend(future.result())
+    except BrokenProcessPool as e:
+        logger.warning(f"Extraction pool failed ({e}); extracting {file_path} sequentially")
+        _discard_extraction_pool(pool)
+        pages = backend.extract_pages(file_path, start, stop)
+    return pages
+
+
+def parse_pdf(
+    file_path: str,
+    file_hash: str,
+    parallel_min_pages: int = 0,
+    processes: int = 1,
+    policy: Optional[ExtractionPolicy] = None,
+) -> ParsedDocument:
+    """
+    Abre el PDF y extrae texto y metadatos de todas las páginas.
+
+    Las primeras páginas se extraen con pdfplumber y el cuerpo con el backend
+    que elija ``policy``; si su salida no es aceptable, el cuerpo se vuelve a
+    extraer con pdfplumber.
+
+    Args:
+        file_path: Ruta al PDF
+        file_hash: SHA-256 del archivo
+        parallel_min_pages: Número de páginas a partir del cual se paraleliza (0 = nunca)
+        processes: Procesos del pool de extracción
+        policy: Política de selección de backend (por defecto "auto")
+    """
+    policy = policy or ExtractionPolicy()
+    metadata: Dict[str, str] = {}
+
+    with pdfplumber.open(file_path) as pdf:
+        for key, value in (pdf.metadata or {}).items():
+            if isinstance(value, str):
+                metadata[key] = value
+
+        page_count = len(pdf.pages)
+        head_count = policy.head_page_count(page_count)
+        pages = [lines for _, lines in iter_pdf_pages(pdf, 0, head_count)]
+
+    backend = policy.body_backend()
+    body = _extract_pages(
+        file_path, backend, head_count, page_count, parallel_min_pages, processes
+    )
+    if not policy.accept_body(body):
+        logger.info(f"{backend.name} text of {file_path} looks garbled; using pdfplumber")
+        body = _extract_pages(
+            file_path,
+            get_backend("pdfplumber"),
+            head_count,
+            page_count,
+            parallel_min_pages,
+            processes,
+        )
+    pages.extend(body)
+
+    return ParsedDocument(file_hash=file_hash, pages=pages, metadata=metadata)
+
+
+class ParsedDocumentStore:
+    """
+    Almacén de artefactos ``ParsedDocument`` indexados por hash de contenido.
+
+    Mantiene una pequeña caché LRU en memoria sobre los artefactos en disco.
+    """
+
+    def __init__(
+        self,
+        root: Path = PROCESSED_DIR,
+        max_cached: int = 16,
+        parallel_min_pages: int = 0,
+        processes: int = 1,
+        policy: Optional[ExtractionPolicy] = None,
+    ):
+        self.root = Path(root)
+        self.max_cached = max_cached
+        self.parallel_min_pages = parallel_min_pages
+        self.processes = processes
+        self.policy = policy or ExtractionPolicy()
+        self._cache: "OrderedDict[str, ParsedDocument]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, file_path: str, file_hash: Optional[str] = None) -> ParsedDocument:
+        """
+        Devuelve el documento parseado, parseando el PDF sólo si no existe artefacto.
+
+        Args:
+            file_path: Ruta al PDF
+            file_hash: SHA-256 del archivo (se calcula si no se proporciona)
+        """
+        if not file_hash:
+            from app.services.metadata_extractor import MetadataExtractor
+
+            file_hash = MetadataExtractor.calculate_file_hash(file_path)
+
+        document = self.load(file_hash)
+        if document is not None:
+            return document
+
+        logger.info(f"Parsing PDF {file_path} into artifact {file_hash[:12]}")
+        document = parse_pdf(
+            file_path,
+            file_hash,
+            parallel_min_pages=self.parallel_min_pages,
+            processes=self.processes,
+            policy=self.policy,
+        )
+        self.save(document)
+        return document
+
+    def load(self, file_hash: str) -> Optional[ParsedDocument]:
+        with self._lock:
+            document = self._cache.get(file_hash)
+            if document is not None:
+                self._cache.move_to_end(file_hash)
+                return document
+
+        path = self._artifact_path(file_hash)
+        if not path.exists():
+            return None
+
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable parsed artifact {path}: {e}")
+            return None
+
+        if data.get("version") != ARTIFACT_VERSION:
+            return None
+
+        document = ParsedDocument.from_dict(data)
+        self._remember(document)
+        return document
+
+    def save(self, document: ParsedDocument) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self._artifact_path(document.file_hash)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(document.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self._remember(document)
+
+    def delete(self, file_hash: str) -> None:
+        with self._lock:
+            self._cache.pop(file_hash, None)
+        path = self._artifact_path(file_hash)
+        if path.exists():
+            path.unlink()
+
+    def _remember(self, document: ParsedDocument) -> None:
+        with self._lock:
+            self._cache[document.file_hash] = document
+            self._cache.move_to_end(document.file_hash)
+            while len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+
+    def _artifact_path(self, file_hash: str) -> Path:
+        return self.root / f"{file_hash}.json.gz"
+
+
+@lru_cache()
+def get_parsed_document_store() -> ParsedDocumentStore:
+    from app.core.config import get_settings
+
+    settings = get_settings()
+    return ParsedDocumentStore(
+        parallel_min_pages=settings.pdf_parallel_min_pages,
+        processes=settings.pdf_extraction_processes or os.cpu_count() or 1,
+        policy=ExtractionPolicy(
+            backend=settings.pdf_text_backend,
+            metadata_pages=settings.pdf_metadata_pages,
+        ),
+    )
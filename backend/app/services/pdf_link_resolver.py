@@ -0,0 +1,204 @@
+"""
+PdfLinkResolver - Encuentra el enlace al PDF en una página de aterrizaje.
+
+Recorre el DOM una sola vez puntuando cada candidato (meta, link, a,
+button) según la fiabilidad del patrón que cumple, en lugar de lanzar una
+búsqueda completa por patrón. Usa lxml cuando está disponible y guarda
+el resultado por URL de aterrizaje en una caché con TTL.
+"""
+
+import importlib.util
+import logging
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# BeautifulSoup importa el parser por su nombre; aquí sólo se comprueba que exista
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+# Niveles de fiabilidad: menor es mejor. Los patrones específicos de cada
+# plataforma van antes que los genéricos.
+TIER_SCHOLAR_PDF_TEXT = 0
+TIER_SCHOLAR_VIEWER = 1
+TIER_RESEARCHGATE_BUTTON = 2
+TIER_ACADEMIA_DOWNLOAD = 3
+TIER_CITATION_META = 10
+TIER_OG_URL_META = 11
+TIER_ALTERNATE_LINK = 12
+TIER_DOWNLOAD_PDF_CLASS = 13
+TIER_PDF_ID = 14
+TIER_PDF_BUTTON = 15
+TIER_HREF_PDF_SUFFIX = 16
+TIER_HREF_PDF_PATH = 17
+TIER_PDF_TITLE = 18
+TIER_DOWNLOAD_CLASS = 19
+TIER_DOWNLOAD_PDF_TEXT = 20
+
+DOWNLOAD_PDF_CLASSES = ("download-pdf", "pdf-download", "download-button")
+
+
+def _classes(element) -> str:
+    return " ".join(element.get("class") or []).lower()
+
+
+class PdfLinkResolver:
+    """
+    Resuelve la URL del PDF de una página académica en una sola pasada.
+    """
+
+    def __init__(self, ttl_seconds: float = 3600.0, max_entries: int = 1024):
+        self.cache = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    def lookup(self, landing_url: str) -> Optional[str]:
+        """URL del PDF ya resuelta para ``landing_url``, si está en caché."""
+        return self.cache.get(landing_url)
+
+    def resolve(
+        self,
+        html_content: str,
+        base_url: str,
+        cache_key: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Devuelve la URL absoluta del PDF enlazado desde la página, o None.
+
+        Args:
+            html_content: HTML de la página de aterrizaje
+            base_url: URL final de la página (para resolver rutas relativas)
+            cache_key: Clave de caché; por defecto ``base_url``
+        """
+        key = cache_key or base_url
+        hit, cached = self.cache.lookup(key)
+        if hit:
+            return cached
+
+        pdf_url = self._resolve_uncached(html_content, base_url)
+        self.cache.set(key, pdf_url)
+        return pdf_url
+
+    def _resolve_uncached(self, html_content: str, base_url: str) -> Optional[str]:
+        # ArXiv: la URL del PDF se deriva de la del resumen sin mirar el HTML
+        parsed = urlparse(base_url)
+        if "arxiv.org" in base_url and "/abs/" in parsed.path:
+            pdf_path = parsed.path.replace("/abs/", "/pdf/") + ".pdf"
+            return f"{parsed.scheme}://{parsed.netloc}{pdf_path}"
+
+        is_scholar = "scholar.google" in base_url
+        is_researchgate = "researchgate.net" in base_url
+        is_academia = "academia.edu" in base_url
+
+        if is_scholar:
+            floor = TIER_SCHOLAR_PDF_TEXT
+        elif is_researchgate:
+            floor = TIER_RESEARCHGATE_BUTTON
+        elif is_academia:
+            floor = TIER_ACADEMIA_DOWNLOAD
+        else:
+            floor = TIER_CITATION_META
+
+        tags = ["meta", "link", "a", "button"]
+        # El visor de Scholar se reconoce por su div contenedor
+        parse_tags = tags + ["div"] if is_scholar else tags
+        soup = BeautifulSoup(html_content, HTML_PARSER, parse_only=SoupStrainer(parse_tags))
+
+        best: Optional[Tuple[int, str]] = None
+        for element in soup.find_all(tags):
+            for tier, url in self._candidates(element, is_scholar, is_researchgate, is_academia):
+                if best is not None and tier >= best[0]:
+                    break
+                if url:
+                    best = (tier, url)
+                    break
+            # Ningún elemento posterior puede mejorar el nivel mínimo posible
+            if best is not None and best[0] <= floor:
+                break
+
+        if best is None:
+            return None
+
+        pdf_url = best[1].strip()
+        if not pdf_url.startswith("http"):
+            pdf_url = urljoin(base_url, pdf_url)
+        return pdf_url
+
+    def _candidates(
+        self,
+        element,
+        is_scholar: bool,
+        is_researchgate: bool,
+        is_academia: bool,
+    ) -> List[Tuple[int, Optional[str]]]:
+        """Niveles que cumple un elemento, en orden creciente, con la URL que aporta."""
+        name = element.name
+
+        if name == "meta":
+            content = element.get("content")
+            if element.get("name") == "citation_pdf_url":
+                return [(TIER_CITATION_META, content)]
+            if element.get("property") == "og:url" and content and ".pdf" in content.lower():
+                return [(TIER_OG_URL_META, content)]
+            return []
+
+        if name == "link":
+            rel = element.get("rel") or []
+            if "alternate" in rel and element.get("type") == "application/pdf":
+                return [(TIER_ALTERNATE_LINK, element.get("href"))]
+            return []
+
+        if name == "button":
+            if "pdf" in _classes(element):
+                return [(TIER_PDF_BUTTON, element.get("data-url") or element.get("data-href"))]
+            return []
+
+        href = element.get("href")
+        if not href:
+            return []
+
+        candidates: List[Tuple[int, Optional[str]]] = []
+        classes = _classes(element)
+        lowered_href = href.lower()
+
+        if is_scholar:
+            text = element.get_text()
+            if text.strip().upper() == "[PDF]" or "PDF" in text:
+                candidates.append((TIER_SCHOLAR_PDF_TEXT, href))
+            if element.find_parent("div", class_="gs_ggsW") is not None:
+                candidates.append((TIER_SCHOLAR_VIEWER, href))
+        if is_researchgate and element.get("data-test-id") == "work-download-button":
+            candidates.append((TIER_RESEARCHGATE_BUTTON, href))
+        if is_academia and "download" in classes:
+            candidates.append((TIER_ACADEMIA_DOWNLOAD, href))
+
+        if any(c in classes for c in DOWNLOAD_PDF_CLASSES):
+            candidates.append((TIER_DOWNLOAD_PDF_CLASS, href))
+        if "pdf" in (element.get("id") or "").lower():
+            candidates.append((TIER_PDF_ID, href))
+        if lowered_href.endswith(".pdf"):
+            candidates.append((TIER_HREF_PDF_SUFFIX, href))
+        if "/pdf/" in lowered_href:
+            candidates.append((TIER_HREF_PDF_PATH, href))
+        if "pdf" in (element.get("title") or "").lower():
+            candidates.append((TIER_PDF_TITLE, href))
+        if "download" in classes:
+            candidates.append((TIER_DOWNLOAD_CLASS, href))
+
+        # El texto visible es lo más caro: sólo si no hay ya un candidato mejor
+        if not candidates:
+            text = element.get_text().lower()
+            if "download" in text and "pdf" in text:
+                candidates.append((TIER_DOWNLOAD_PDF_TEXT, href))
+
+        return candidates
+
+
+@lru_cache()
+def get_pdf_link_resolver() -> PdfLinkResolver:
+    from app.core.config import get_settings
+
+    return PdfLinkResolver(ttl_seconds=get_settings().pdf_link_cache_ttl)
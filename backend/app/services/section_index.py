@@ -0,0 +1,126 @@
+"""
+Índice de secciones de cada artículo.
+
+Las secciones (abstract, introduction, ...) se detectan una vez en la ingesta
+y se guardan en ``article_sections`` con sus límites y su contenido
+comprimido, de modo que los resúmenes y la lectura por secciones sólo
+necesitan una consulta a la base de datos.
+"""
+
+import logging
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models import Article, ArticleSection
+from app.services.article_text_store import (
+    compress_text,
+    decompress_text,
+    get_article_text_store,
+)
+from app.services.document_structure_extractor import DocumentStructureExtractor, SectionSpan
+
+logger = logging.getLogger(__name__)
+
+
+class SectionIndex:
+    """
+    Lectura y escritura del índice de secciones.
+
+    ``save_spans`` deja los cambios pendientes de commit en la sesión del
+    llamador; ``ensure`` confirma el índice de artículos antiguos.
+    """
+
+    def __init__(self, extractor: Optional[DocumentStructureExtractor] = None):
+        self.extractor = extractor or DocumentStructureExtractor()
+
+    def save_spans(self, db: Session, article_id: int, spans: List[SectionSpan]) -> int:
+        """
+        Reemplaza el índice del artículo y lo marca como indexado (aunque no
+        tenga secciones); devuelve el número de secciones.
+        """
+        db.query(ArticleSection).filter(ArticleSection.article_id == article_id).delete(
+            synchronize_session=False
+        )
+        db.query(Article).filter(Article.id == article_id).update(
+            {Article.sections_indexed_at: datetime.utcnow()}
+        )
+        db.add_all(
+            ArticleSection(
+                article_id=article_id,
+                name=span.name,
+                position=position,
+                start_page=span.start_page,
+                start_line=span.start_line,
+                end_page=span.end_page,
+                end_line=span.end_line,
+                char_start=span.char_start,
+                char_end=span.char_end,
+                content=compress_text(span.content),
+            )
+            for position, span in enumerate(spans)
+        )
+        return len(spans)
+
+    def list_sections(self, db: Session, article_id: int) -> List[ArticleSection]:
+        return (
+            db.query(ArticleSection)
+            .filter(ArticleSection.article_id == article_id)
+            .order_by(ArticleSection.position)
+            .all()
+        )
+
+    def get_section(self, db: Session, article_id: int, name: str) -> Optional[ArticleSection]:
+        return (
+            db.query(ArticleSection)
+            .filter(ArticleSection.article_id == article_id, ArticleSection.name == name)
+            .first()
+        )
+
+    def get_sections(self, db: Session, article: Article) -> Dict[str, str]:
+        """Devuelve {section_name: content} en orden de aparición."""
+        self.ensure(db, article)
+        return {
+            section.name: decompress_text(section.content)
+            for section in self.list_sections(db, article.id)
+        }
+
+    def ensure(self, db: Session, article: Article) -> int:
+        """
+        Garantiza que el artículo está indexado.
+
+        Los artículos ingeridos antes de existir el índice se indexan a partir
+        de su texto guardado, sin volver a parsear el archivo. Un artículo sin
+        secciones se distingue de uno sin indexar por ``sections_indexed_at``.
+        """
+        indexed = article.sections_indexed_at is not None
+        if indexed or not (article.file_path or "").lower().endswith(".pdf"):
+            return db.query(ArticleSection.id).filter(ArticleSection.article_id == article.id).count()
+
+        text_store = get_article_text_store()
+        if not text_store.ensure(db, article):
+            return 0
+
+        spans = self.extractor.extract_spans(self._iter_stored_lines(db, article.id))
+        count = self.save_spans(db, article.id, spans)
+        db.commit()
+        if count:
+            logger.info(f"Indexed {count} sections for article {article.id}")
+        return count
+
+    def _iter_stored_lines(self, db: Session, article_id: int) -> Iterator[Tuple[int, str]]:
+        for page_number, text in get_article_text_store().get_pages(db, article_id):
+            if text:
+                for line in text.split("\n"):
+                    yield page_number, line
+
+
+def section_content(section: ArticleSection) -> str:
+    return decompress_text(section.content)
+
+
+@lru_cache()
+def get_section_index() -> SectionIndex:
+    return SectionIndex()
@@ -1,19 +1,28 @@
 import logging
 import os
 import re
-from typing import Optional, Tuple, List, Dict
+from typing import Callable, Iterator, Optional, Tuple, List, Dict
 
 import numpy as np
-import pdfplumber
-import requests
 from sklearn.feature_extraction.text import TfidfVectorizer
+from sqlalchemy.orm import Session
 
 from app.models.article import Article
+from app.services.article_text_store import get_article_text_store
 from app.services.document_structure_extractor import DocumentStructureExtractor
 from app.services.chunked_summarizer import ChunkedSummarizer
+from app.services.llm_client import LLMError, get_llm_client
+from app.services.parsed_document import get_parsed_document_store
+from app.services.section_index import get_section_index
+from app.services.summary_cache import PARTIAL_SUFFIX, SummaryKey, get_summary_cache
+from app.services.summary_prompts import PROMPT_VERSION, get_level_prompt
 
 logger = logging.getLogger(__name__)
 
+EXTRACTIVE_VERSION = "tfidf-1"
+# Documents longer than this (with Groq) go through ChunkedSummarizer
+CHUNKED_MIN_CHARS = 30000
+
 
 class ArticleSummarizer:
     """
@@ -21,9 +30,16 @@ class ArticleSummarizer:
     with both local extractive and Groq-powered abstractive summaries.
     """
 
-    def __init__(self, groq_api_key: Optional[str] = None, groq_model: str = "llama-3.3-70b-versatile"):
+    def __init__(
+        self,
+        groq_api_key: Optional[str] = None,
+        groq_model: str = "llama-3.3-70b-versatile",
+        db: Optional[Session] = None,
+    ):
         self.groq_api_key = groq_api_key
         self.groq_model = groq_model
+        # With a session, article text and sections are read from the stored index
+        self.db = db
         self.max_input_chars = 50000  # Increased from 12000 to support full documents
 
         # Configuration per level
@@ -72,43 +88,124 @@ class ArticleSummarizer:
         Returns:
             Tuple of (summary, method_used)
         """
-        config = self.level_config.get(level, self.level_config["detailed"])
+        summary, method_used, _ = self.summarize_article_cached(
+            article, method, level, use_structure_extraction
+        )
+        return summary, method_used
 
-        # Try to extract document structure if PDF
-        sections = {}
-        if use_structure_extraction and article.file_path and article.file_path.lower().endswith('.pdf'):
-            try:
-                sections = self.structure_extractor.extract_from_pdf(article.file_path)
-                if sections:
-                    logger.info(f"Extracted {len(sections)} sections from document")
-                    logger.info(f"Sections: {list(sections.keys())}")
-            except Exception as e:
-                logger.warning(f"Could not extract document structure: {e}")
+    def summarize_article_cached(
+        self,
+        article: Article,
+        method: str = "auto",
+        level: str = "detailed",
+        use_structure_extraction: bool = True,
+    ) -> Tuple[str, str, bool]:
+        """
+        ``summarize_article`` that also reports whether the summary was cached.
 
-        # Get article text
-        text = self.get_article_text(article, max_pages=config["max_pages"])
-        if not text:
-            raise ValueError("No text content available for summarization.")
+        Every path that stores summaries under ``summary_key`` must produce
+        them this way, so that a cached entry is the same summary whichever
+        endpoint computed it.
 
-        # Decide if we need chunked processing
-        text_length = len(text)
-        logger.info(f"Document length: {text_length} characters")
+        Returns:
+            Tuple of (summary, method_used, cached)
+        """
+        return self.cached_summary(
+            article,
+            level,
+            method,
+            lambda: self._summarize_article(article, method, level, use_structure_extraction),
+        )
 
-        # Use chunked summarizer for very long documents (> 30k chars with Groq)
-        if method in ["auto", "groq"] and text_length > 30000 and self.groq_api_key:
-            logger.info("Document is long, using ChunkedSummarizer")
-            if not self.chunked_summarizer:
-                self.chunked_summarizer = ChunkedSummarizer(
-                    self.groq_api_key,
-                    self.groq_model
-                )
+    def cached_summary(
+        self,
+        article: Article,
+        level: str,
+        method: str,
+        compute: Callable[[], Tuple[str, str]],
+    ) -> Tuple[str, str, bool]:
+        """
+        Read-through lookup of the stored summary for this article and settings.
+
+        Without a db session or a file hash the summary is always computed.
+
+        Returns:
+            Tuple of (summary, method_used, cached)
+        """
+        key = self.summary_key(article, level, method)
+        if self.db is None or key is None:
+            summary, method_used = compute()
+            return summary, method_used, False
+        return get_summary_cache().get_or_compute(self.db, key, compute)
+
+    def summary_key(self, article: Article, level: str, method: str) -> Optional[SummaryKey]:
+        if not article.file_hash:
+            return None
+        level = level if level in self.level_config else "detailed"
+        if method == "auto":
+            method = "groq" if self.groq_api_key else "local"
+        if method == "groq":
+            return SummaryKey(article.file_hash, level, "groq", self.groq_model, PROMPT_VERSION)
+        return SummaryKey(article.file_hash, level, "local", "", EXTRACTIVE_VERSION)
+
+    def stream_article(
+        self,
+        article: Article,
+        method: str = "auto",
+        level: str = "detailed",
+        use_structure_extraction: bool = True,
+    ) -> Iterator[Tuple[str, Dict]]:
+        """
+        Stream an article summary as ``(event, data)`` pairs.
 
+        Events are ``progress`` (chunked documents: one per mapped chunk, then
+        the reduce step), ``token`` (summary text as it is generated) and a
+        final ``done`` with ``method`` and ``cached``. Cached and extractive
+        summaries arrive as a single ``token``. The finished summary is stored
+        in the summary cache, as ``summarize_article`` does.
+        """
+        key = self.summary_key(article, level, method)
+        use_cache = self.db is not None and key is not None
+        if use_cache:
+            entry = get_summary_cache().lookup(self.db, key)
+            if entry is not None:
+                yield "token", {"text": entry.content}
+                yield "done", {"method": entry.method_used, "cached": True}
+                return
+
+        text, sections = self._article_input(article, level, use_structure_extraction)
+        pieces: List[str] = []
+        for event, data in self._stream_summary(text, sections, method, level):
+            if event == "token":
+                pieces.append(data["text"])
+            elif event == "done":
+                if use_cache:
+                    get_summary_cache().store(self.db, key, "".join(pieces).strip(), data["method"])
+                data = {**data, "cached": False}
+            yield event, data
+
+    def _summarize_article(
+        self,
+        article: Article,
+        method: str,
+        level: str,
+        use_structure_extraction: bool,
+    ) -> Tuple[str, str]:
+        config = self.level_config.get(level, self.level_config["detailed"])
+        text, sections = self._article_input(article, level, use_structure_extraction)
+
+        # Use chunked summarizer for very long documents with Groq
+        if method in ["auto", "groq"] and len(text) > CHUNKED_MIN_CHARS and self.groq_api_key:
+            logger.info("Document is long, using ChunkedSummarizer")
             try:
-                summary, _ = self.chunked_summarizer.summarize_long_document(
+                summary, chunked_method = self._get_chunked_summarizer().summarize_long_document(
                     text,
                     level=level,
                     sections=sections if sections else None
                 )
+                # Partial results keep the suffix so the cache does not store them
+                if chunked_method.endswith(PARTIAL_SUFFIX):
+                    return summary, "groq_chunked" + PARTIAL_SUFFIX
                 return summary, "groq_chunked"
             except Exception as e:
                 logger.error(f"ChunkedSummarizer failed: {e}, falling back to regular")
@@ -122,6 +219,106 @@ class ArticleSummarizer:
             level=level
         )
 
+    def _stream_summary(
+        self,
+        text: str,
+        sections: Dict[str, str],
+        method: str,
+        level: str,
+    ) -> Iterator[Tuple[str, Dict]]:
+        """Streaming counterpart of the ``_summarize_article`` decision chain."""
+        config = self.level_config.get(level, self.level_config["detailed"])
+        cleaned = self._prepare_text(text)
+        if not cleaned:
+            raise ValueError("Provided text is empty after cleaning.")
+
+        if method == "groq" or (method == "auto" and self.groq_api_key):
+            if not self.groq_api_key:
+                raise ValueError("Groq API key is not configured.")
+
+            # Fallbacks are only possible before any summary text was sent
+            if len(text) > CHUNKED_MIN_CHARS:
+                started = partial = False
+                try:
+                    for event, data in self._get_chunked_summarizer().stream_long_document(
+                        text, level=level, sections=sections or None
+                    ):
+                        started = started or event == "token"
+                        partial = partial or data.get("success") is False
+                        yield event, data
+                    method_used = "groq_chunked" + (PARTIAL_SUFFIX if partial else "")
+                    yield "done", {"method": method_used}
+                    return
+                except Exception as e:
+                    if started:
+                        raise
+                    logger.error(f"ChunkedSummarizer failed: {e}, falling back to regular")
+
+            started = False
+            try:
+                for piece in self._stream_with_groq(cleaned, level=level):
+                    started = True
+                    yield "token", {"text": piece}
+                yield "done", {"method": "groq"}
+                return
+            except LLMError as e:
+                if started or method != "auto":
+                    raise
+                logger.warning(f"Groq summarization unavailable ({e}), using local method")
+
+        summary = self._summarize_extractive(cleaned, max_sentences=config["max_sentences"])
+        yield "token", {"text": summary}
+        yield "done", {"method": "local"}
+
+    def _article_input(
+        self,
+        article: Article,
+        level: str,
+        use_structure_extraction: bool,
+    ) -> Tuple[str, Dict[str, str]]:
+        """Article text and (optionally) its sections for the given level."""
+        config = self.level_config.get(level, self.level_config["detailed"])
+
+        # Try to extract document structure if PDF
+        sections = {}
+        if use_structure_extraction and article.file_path and article.file_path.lower().endswith('.pdf'):
+            try:
+                if self.db is not None and article.id is not None:
+                    sections = get_section_index().get_sections(self.db, article)
+                else:
+                    sections = self.structure_extractor.extract_from_pdf(
+                        article.file_path, file_hash=article.file_hash
+                    )
+                if sections:
+                    logger.info(f"Extracted {len(sections)} sections from document")
+                    logger.info(f"Sections: {list(sections.keys())}")
+            except Exception as e:
+                logger.warning(f"Could not extract document structure: {e}")
+
+        # Full text of the level's pages: the chunked path has no length limit,
+        # the single-call path truncates to max_input_chars in _prepare_text
+        text = self.get_article_text(article, max_pages=config["max_pages"], truncate=False)
+        if not text:
+            raise ValueError("No text content available for summarization.")
+        logger.info(f"Document length: {len(text)} characters")
+        return text, sections
+
+    def _get_chunked_summarizer(self) -> ChunkedSummarizer:
+        if not self.chunked_summarizer:
+            from app.core.config import get_settings
+
+            settings = get_settings()
+            self.chunked_summarizer = ChunkedSummarizer(
+                self.groq_api_key,
+                self.groq_model,
+                chunk_size_tokens=settings.summary_chunk_tokens,
+                overlap_tokens=settings.summary_chunk_overlap_tokens,
+                max_concurrency=settings.summary_map_concurrency,
+                reduce_budget_tokens=settings.summary_reduce_tokens,
+                db=self.db,
+            )
+        return self.chunked_summarizer
+
     def summarize_text(
         self,
         text: str,
@@ -149,13 +346,19 @@ class ArticleSummarizer:
         if chosen_method == "groq":
             if not self.groq_api_key:
                 raise ValueError("Groq API key is not configured.")
-            summary = self._summarize_with_groq(cleaned, level=level)
-            return summary, "groq"
+            try:
+                summary = self._summarize_with_groq(cleaned, level=level)
+                return summary, "groq"
+            except LLMError as e:
+                # Provider throttled or degraded: "auto" degrades to the local method
+                if method != "auto":
+                    raise
+                logger.warning(f"Groq summarization unavailable ({e}), using local method")
 
         summary = self._summarize_extractive(cleaned, max_sentences=max_sentences)
         return summary, "local"
 
-    def get_article_text(self, article: Article, max_pages: int = 5) -> str:
+    def get_article_text(self, article: Article, max_pages: int = 5, truncate: bool = True) -> str:
         parts: List[str] = []
 
         if article.abstract:
@@ -164,32 +367,38 @@ class ArticleSummarizer:
         if article.keywords:
             parts.append("Keywords: " + ", ".join(article.keywords[:10]))
 
-        if article.file_path and os.path.exists(article.file_path):
+        if self.db is not None and article.id is not None:
             try:
-                file_text = self._read_file_excerpt(article.file_path, max_pages=max_pages)
+                file_text = get_article_text_store().get_text(self.db, article, max_pages=max_pages)
+                if file_text:
+                    parts.append(file_text)
+            except Exception as exc:
+                logger.warning("Failed to read stored article text for summarization: %s", exc)
+        elif article.file_path and os.path.exists(article.file_path):
+            try:
+                file_text = self._read_file_excerpt(
+                    article.file_path, max_pages=max_pages, file_hash=article.file_hash
+                )
                 if file_text:
                     parts.append(file_text)
             except Exception as exc:
                 logger.warning("Failed to read article file for summarization: %s", exc)
 
         combined = "\n".join(part for part in parts if part).strip()
-        if len(combined) > self.max_input_chars:
+        if truncate and len(combined) > self.max_input_chars:
             combined = combined[: self.max_input_chars]
         return combined
 
-    def _read_file_excerpt(self, file_path: str, max_pages: int = 5) -> str:
+    def _read_file_excerpt(
+        self, file_path: str, max_pages: int = 5, file_hash: Optional[str] = None
+    ) -> str:
         if file_path.lower().endswith(".txt"):
             with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
                 return f.read(self.max_input_chars)
 
         if file_path.lower().endswith(".pdf"):
-            texts: List[str] = []
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages[:max_pages]:
-                    page_text = page.extract_text()
-                    if page_text:
-                        texts.append(page_text)
-            return "\n".join(texts)
+            document = get_parsed_document_store().get(file_path, file_hash)
+            return document.text(max_pages=max_pages)
 
         return ""
 
@@ -221,179 +430,24 @@ class ArticleSummarizer:
 
     def _get_prompt_for_level(self, level: str) -> dict:
         """Get system and user prompt templates for the specified level."""
-
-        prompts = {
-            "executive": {
-                "system": (
-                    "Eres un asistente experto en investigación académica. "
-                    "Crea resúmenes ejecutivos concisos pero informativos de artículos científicos."
-                ),
-                "user": (
-                    "Crea un RESUMEN EJECUTIVO del siguiente artículo científico.\n\n"
-                    "FORMATO REQUERIDO:\n"
-                    "# Resumen Ejecutivo\n\n"
-                    "## Problema de Investigación\n"
-                    "[2 párrafos: ¿Qué problema aborda esta investigación? ¿Por qué es importante?]\n\n"
-                    "## Metodología\n"
-                    "[1 párrafo: ¿Qué enfoque se utilizó para investigar el problema?]\n\n"
-                    "## Hallazgos Clave\n"
-                    "- [Hallazgo 1 con datos de soporte]\n"
-                    "- [Hallazgo 2 con datos de soporte]\n"
-                    "- [Hallazgo 3 con datos de soporte]\n"
-                    "- [Hallazgo 4 si aplica]\n\n"
-                    "## Conclusión Principal\n"
-                    "[1 párrafo: ¿Cuál es la conclusión principal?]\n\n"
-                    "Usa lenguaje académico claro. Sé específico con números y resultados.\n"
-                    "Longitud objetivo: 500 palabras.\n\n"
-                    "ARTÍCULO:\n{text}"
-                )
-            },
-            "detailed": {
-                "system": (
-                    "Eres un asistente experto en investigación académica. "
-                    "Crea resúmenes detallados y estructurados que capturen todos los aspectos importantes de artículos científicos."
-                ),
-                "user": (
-                    "Crea un RESUMEN DETALLADO (3-4 páginas) del siguiente artículo científico.\n\n"
-                    "FORMATO REQUERIDO:\n"
-                    "# Resumen Detallado\n\n"
-                    "## Introducción y Contexto\n"
-                    "[2-3 párrafos explicando el contexto, la motivación y el vacío en la literatura]\n\n"
-                    "## Objetivos y Preguntas de Investigación\n"
-                    "- [Objetivo 1]\n"
-                    "- [Objetivo 2]\n"
-                    "- [Hipótesis si aplica]\n\n"
-                    "## Metodología\n"
-                    "### Diseño del Estudio\n"
-                    "[1-2 párrafos sobre el diseño de investigación]\n\n"
-                    "### Muestra y Participantes\n"
-                    "[1 párrafo sobre quién/qué fue estudiado, tamaño de muestra, criterios]\n\n"
-                    "### Recolección de Datos\n"
-                    "- [Instrumento 1: descripción]\n"
-                    "- [Instrumento 2: descripción]\n\n"
-                    "### Métodos de Análisis\n"
-                    "[1 párrafo sobre cómo se analizaron los datos]\n\n"
-                    "## Resultados Principales\n"
-                    "### Hallazgos Primarios\n"
-                    "[2-3 párrafos sobre los resultados principales con números/datos específicos]\n\n"
-                    "### Hallazgos Secundarios\n"
-                    "- [Hallazgo 1]\n"
-                    "- [Hallazgo 2]\n\n"
-                    "## Discusión\n"
-                    "[2-3 párrafos interpretando los resultados y comparando con literatura existente]\n\n"
-                    "## Implicaciones\n"
-                    "### Implicaciones Prácticas\n"
-                    "- [Implicación 1]\n"
-                    "- [Implicación 2]\n\n"
-                    "### Implicaciones Teóricas\n"
-                    "- [Implicación 1]\n"
-                    "- [Implicación 2]\n\n"
-                    "## Limitaciones\n"
-                    "- [Limitación 1]\n"
-                    "- [Limitación 2]\n\n"
-                    "## Futuras Investigaciones\n"
-                    "- [Sugerencia 1]\n"
-                    "- [Sugerencia 2]\n\n"
-                    "Sé exhaustivo y académico. Incluye todos los detalles importantes.\n"
-                    "Longitud objetivo: 1,800 palabras.\n\n"
-                    "ARTÍCULO:\n{text}"
-                )
-            },
-            "exhaustive": {
-                "system": (
-                    "Eres un asistente experto en investigación académica. "
-                    "Crea resúmenes exhaustivos y comprehensivos que extraigan TODA la información importante de artículos científicos."
-                ),
-                "user": (
-                    "Crea un RESUMEN EXHAUSTIVO (8-10 páginas) del siguiente artículo científico.\n\n"
-                    "TU TAREA: Extraer CADA pieza importante de información. Este resumen debe permitir "
-                    "que alguien entienda la investigación profundamente sin leer el original.\n\n"
-                    "FORMATO REQUERIDO:\n"
-                    "# Resumen Exhaustivo\n\n"
-                    "## Marco Teórico\n"
-                    "[Explicación detallada de teorías, modelos y frameworks utilizados]\n\n"
-                    "### Conceptos Clave\n"
-                    "- **Concepto 1**: [Definición y relevancia]\n"
-                    "- **Concepto 2**: [Definición y relevancia]\n\n"
-                    "## Revisión de Literatura\n"
-                    "[Descripción comprehensiva de la investigación relacionada citada]\n\n"
-                    "### Estudios Previos\n"
-                    "[Autor 1 (Año)]: [Hallazgos clave y cómo se relacionan]\n"
-                    "[Autor 2 (Año)]: [Hallazgos clave y cómo se relacionan]\n\n"
-                    "## Metodología (Comprehensiva)\n"
-                    "### Enfoque Epistemológico\n"
-                    "[Párrafo sobre el paradigma de investigación]\n\n"
-                    "### Diseño del Estudio\n"
-                    "[Justificación y descripción detallada]\n\n"
-                    "### Muestra\n"
-                    "- **Población**: [Descripción]\n"
-                    "- **Tamaño de muestra**: [Número y justificación]\n"
-                    "- **Método de muestreo**: [Descripción]\n"
-                    "- **Criterios de inclusión**: [Lista]\n"
-                    "- **Criterios de exclusión**: [Lista]\n\n"
-                    "### Instrumentos\n"
-                    "[Descripción detallada de cada instrumento de medición]\n\n"
-                    "### Procedimientos\n"
-                    "[Descripción paso a paso de lo que se hizo]\n\n"
-                    "### Consideraciones Éticas\n"
-                    "[Descripción de protocolos éticos]\n\n"
-                    "### Análisis de Datos\n"
-                    "[Descripción comprehensiva de métodos estadísticos/cualitativos]\n\n"
-                    "## Resultados (Completos)\n"
-                    "### Estadísticas Descriptivas\n"
-                    "[Todos los datos descriptivos relevantes]\n\n"
-                    "### Hallazgos Principales por Pregunta de Investigación\n"
-                    "**PI1**: [Hallazgo con detalles completos]\n"
-                    "**PI2**: [Hallazgo con detalles completos]\n\n"
-                    "### Resultados Estadísticos\n"
-                    "[Todas las pruebas estadísticas significativas con valores]\n\n"
-                    "### Tablas y Figuras\n"
-                    "[Descripción textual de todas las tablas/figuras]\n\n"
-                    "### Hallazgos Inesperados\n"
-                    "[Descripción de resultados inesperados]\n\n"
-                    "## Discusión (En Profundidad)\n"
-                    "### Interpretación de Resultados\n"
-                    "[Interpretación exhaustiva]\n\n"
-                    "### Comparación con Investigación Previa\n"
-                    "[Comparación detallada con literatura]\n\n"
-                    "### Explicaciones Alternativas\n"
-                    "[Discusión de otras interpretaciones posibles]\n\n"
-                    "### Implicaciones Teóricas\n"
-                    "[Cómo esto avanza la teoría]\n\n"
-                    "### Implicaciones Prácticas\n"
-                    "[Aplicaciones prácticas detalladas]\n\n"
-                    "## Fortalezas y Limitaciones\n"
-                    "### Fortalezas Metodológicas\n"
-                    "- [Fortaleza 1]\n"
-                    "- [Fortaleza 2]\n\n"
-                    "### Limitaciones\n"
-                    "- [Limitación 1 con impacto]\n"
-                    "- [Limitación 2 con impacto]\n\n"
-                    "## Investigación Futura\n"
-                    "[Sugerencias detalladas para estudios futuros]\n\n"
-                    "## Referencias Clave\n"
-                    "[Lista de referencias más importantes citadas]\n\n"
-                    "## Apéndice Técnico\n"
-                    "- [Ecuaciones importantes]\n"
-                    "- [Definiciones técnicas]\n"
-                    "- [Terminología especializada]\n\n"
-                    "Sé EXTREMADAMENTE exhaustivo. Incluye TODOS los detalles.\n"
-                    "Longitud objetivo: 4,000 palabras.\n\n"
-                    "ARTÍCULO:\n{text}"
-                )
-            }
-        }
-
-        return prompts.get(level, prompts["detailed"])
+        return get_level_prompt(level)
 
     def _summarize_with_groq(self, text: str, level: str = "detailed") -> str:
         """Summarize text using Groq API with level-specific prompts."""
-        prompt_config = self._get_prompt_for_level(level)
+        messages, max_tokens = self._groq_request(text, level)
+        return get_llm_client().chat(
+            self.groq_api_key, self.groq_model, messages, max_tokens=max_tokens
+        )
 
-        headers = {
-            "Authorization": f"Bearer {self.groq_api_key}",
-            "Content-Type": "application/json",
-        }
+    def _stream_with_groq(self, text: str, level: str = "detailed") -> Iterator[str]:
+        """Like ``_summarize_with_groq``, yielding the summary as it is generated."""
+        messages, max_tokens = self._groq_request(text, level)
+        return get_llm_client().stream_chat(
+            self.groq_api_key, self.groq_model, messages, max_tokens=max_tokens
+        )
+
+    def _groq_request(self, text: str, level: str) -> Tuple[List[Dict[str, str]], int]:
+        prompt_config = self._get_prompt_for_level(level)
 
         # Increase max_tokens for longer summaries
         max_tokens_by_level = {
@@ -402,35 +456,8 @@ class ArticleSummarizer:
             "exhaustive": 16000,
         }
 
-        payload = {
-            "model": self.groq_model,
-            "temperature": 0.3,
-            "max_tokens": max_tokens_by_level.get(level, 6000),
-            "messages": [
-                {
-                    "role": "system",
-                    "content": prompt_config["system"],
-                },
-                {
-                    "role": "user",
-                    "content": prompt_config["user"].format(text=text),
-                },
-            ],
-        }
-
-        try:
-            resp = requests.post(
-                "https://api.groq.com/openai/v1/chat/completions",
-                json=payload,
-                headers=headers,
-                timeout=120,  # Increased timeout for longer summaries
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            choices = data.get("choices", [])
-            if not choices:
-                raise ValueError("Groq API returned no completion choices.")
-            content = choices[0]["message"]["content"]
-            return content.strip()
-        except requests.RequestException as exc:
-            raise RuntimeError(f"Groq API request failed: {exc}") from exc
+        messages = [
+            {"role": "system", "content": prompt_config["system"]},
+            {"role": "user", "content": prompt_config["user"].format(text=text)},
+        ]
+        return messages, max_tokens_by_level.get(level, 6000)
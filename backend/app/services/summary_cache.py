@@ -0,0 +1,253 @@
+"""
+Caché persistente de resúmenes.
+
+Un resumen depende del contenido del documento y de cómo se generó: nivel,
+método, modelo y versión de las plantillas de prompt. La tabla ``summaries``
+usa exactamente esa clave, así que repetir un resumen ya hecho es una
+consulta en lugar de una llamada al LLM. Al cambiar una plantilla basta con
+subir su versión para que las entradas antiguas dejen de coincidir.
+
+``chunk_summaries`` guarda además los resúmenes de la fase map por hash del
+texto del chunk: al pedir otro nivel del mismo documento sólo se resumen los
+chunks que cambian.
+"""
+
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models import ChunkSummary, Summary
+
+logger = logging.getLogger(__name__)
+
+# Sufijo de ``method_used`` para resúmenes a los que les falta algún chunk
+PARTIAL_SUFFIX = "_partial"
+
+
+@dataclass(frozen=True)
+class SummaryKey:
+    file_hash: str
+    level: str
+    method: str
+    model: str
+    prompt_version: str
+
+
+class SummaryCache:
+    """
+    Lectura con relleno (read-through) de ``summaries`` y contadores de aciertos.
+
+    Los contadores son del proceso; ``stats`` añade el número de entradas
+    guardadas si se le pasa una sesión.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, key: SummaryKey) -> Optional[Summary]:
+        return (
+            db.query(Summary)
+            .filter(
+                Summary.file_hash == key.file_hash,
+                Summary.level == key.level,
+                Summary.method == key.method,
+                Summary.model == key.model,
+                Summary.prompt_version == key.prompt_version,
+            )
+            .first()
+        )
+
+    def put(self, db: Session, key: SummaryKey, content: str, method_used: str) -> None:
+        """Guarda (o reemplaza) el resumen de ``key``."""
+        entry = self.get(db, key)
+        if entry is None:
+            entry = Summary(
+                file_hash=key.file_hash,
+                level=key.level,
+                method=key.method,
+                model=key.model,
+                prompt_version=key.prompt_version,
+            )
+            db.add(entry)
+        entry.content = content
+        entry.method_used = method_used
+        try:
+            db.commit()
+        except IntegrityError:
+            # Otra petición guardó el mismo resumen a la vez
+            db.rollback()
+
+    def get_or_compute(
+        self,
+        db: Session,
+        key: SummaryKey,
+        compute: Callable[[], Tuple[str, str]],
+    ) -> Tuple[str, str, bool]:
+        """
+        Devuelve el resumen guardado o lo calcula y lo guarda.
+
+        Args:
+            compute: Genera ``(summary, method_used)`` si no hay entrada
+
+        Returns:
+            Tupla (summary, method_used, cached)
+        """
+        entry = self.lookup(db, key)
+        if entry is not None:
+            return entry.content, entry.method_used, True
+
+        content, method_used = compute()
+        self.store(db, key, content, method_used)
+        return content, method_used, False
+
+    def lookup(self, db: Session, key: SummaryKey) -> Optional[Summary]:
+        """``get`` contando el acierto o el fallo."""
+        entry = self.get(db, key)
+        self._count(hit=entry is not None)
+        return entry
+
+    def store(self, db: Session, key: SummaryKey, content: str, method_used: str) -> None:
+        """``put`` de un resumen recién calculado."""
+        # Un resumen local de respaldo no se guarda bajo la clave del LLM, ni
+        # uno parcial: el próximo intento puede resumir los chunks que fallaron
+        if (
+            content
+            and method_used.startswith(key.method)
+            and not method_used.endswith(PARTIAL_SUFFIX)
+        ):
+            self.put(db, key, content, method_used)
+
+    def invalidate(self, db: Session, file_hash: Optional[str]) -> int:
+        """Borra los resúmenes de un documento (pendiente de commit)."""
+        if not file_hash:
+            return 0
+        removed = (
+            db.query(Summary)
+            .filter(Summary.file_hash == file_hash)
+            .delete(synchronize_session=False)
+        )
+        if removed:
+            logger.info(f"Invalidated {removed} cached summaries for {file_hash[:12]}")
+        return removed
+
+    def stats(self, db: Optional[Session] = None) -> Dict:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        stats = {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+        if db is not None:
+            stats["entries"] = db.query(Summary.id).count()
+        return stats
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+
+class ChunkSummaryCache:
+    """
+    Resúmenes de chunks direccionados por contenido.
+
+    Las consultas y escrituras son por lotes (una consulta para todos los
+    chunks de un documento) y las hace el hilo que tiene la sesión, no los
+    hilos de la fase map.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def chunk_hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get_many(
+        self, db: Session, hashes: Iterable[str], model: str, prompt_version: str
+    ) -> Dict[str, str]:
+        """Devuelve {chunk_hash: resumen} de los hashes que estén guardados."""
+        wanted = set(hashes)
+        if not wanted:
+            return {}
+        rows = (
+            db.query(ChunkSummary.chunk_hash, ChunkSummary.content)
+            .filter(
+                ChunkSummary.chunk_hash.in_(wanted),
+                ChunkSummary.model == model,
+                ChunkSummary.prompt_version == prompt_version,
+            )
+            .all()
+        )
+        found = {chunk_hash: content for chunk_hash, content in rows}
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(wanted) - len(found)
+        return found
+
+    def put_many(
+        self, db: Session, summaries: Dict[str, str], model: str, prompt_version: str
+    ) -> None:
+        """Guarda {chunk_hash: resumen}; los que ya existan se conservan."""
+        if not summaries:
+            return
+        existing = {
+            chunk_hash
+            for (chunk_hash,) in db.query(ChunkSummary.chunk_hash).filter(
+                ChunkSummary.chunk_hash.in_(list(summaries)),
+                ChunkSummary.model == model,
+                ChunkSummary.prompt_version == prompt_version,
+            )
+        }
+        for chunk_hash, content in summaries.items():
+            if chunk_hash not in existing:
+                db.add(
+                    ChunkSummary(
+                        chunk_hash=chunk_hash,
+                        model=model,
+                        prompt_version=prompt_version,
+                        content=content,
+                    )
+                )
+        try:
+            db.commit()
+        except IntegrityError:
+            # Otro resumen del mismo documento guardó los mismos chunks a la vez
+            db.rollback()
+
+    def stats(self, db: Optional[Session] = None) -> Dict:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        stats = {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+        if db is not None:
+            stats["entries"] = db.query(ChunkSummary.id).count()
+        return stats
+
+
+@lru_cache()
+def get_summary_cache() -> SummaryCache:
+    return SummaryCache()
+
+
+@lru_cache()
+def get_chunk_summary_cache() -> ChunkSummaryCache:
+    return ChunkSummaryCache()
@@ -0,0 +1,203 @@
+"""
+Plantillas de prompt por nivel de resumen (executive, detailed, exhaustive).
+
+Las usan ``ArticleSummarizer`` y ``ChunkedSummarizer``. ``PROMPT_VERSION``
+forma parte de la clave de la caché de resúmenes: hay que subirla al
+cambiar cualquier plantilla para no servir resúmenes hechos con la anterior.
+``MAP_PROMPT_VERSION`` cumple la misma función para la plantilla de la fase
+map, cuya caché es por contenido del chunk.
+"""
+
+from typing import Dict
+
+PROMPT_VERSION = "1"
+MAP_PROMPT_VERSION = "1"
+
+# Fase map de ChunkedSummarizer. Sólo depende del texto del chunk (ni de su
+# posición ni del nivel), así su resumen se reutiliza entre niveles y documentos.
+MAP_PROMPT = {
+    "system": (
+        "Eres un asistente experto en investigación académica. "
+        "Estás resumiendo UNA PARTE de un documento más largo. "
+        "Resume este fragmento capturando toda la información importante."
+    ),
+    "user": (
+        "Resume el siguiente fragmento de un documento académico.\n\n"
+        "CONTEXTO: Es uno de varios fragmentos consecutivos del documento.\n\n"
+        "INSTRUCCIONES:\n"
+        "- Resume este fragmento capturando TODOS los puntos importantes\n"
+        "- Mantén la estructura y organización del contenido\n"
+        "- No agregues conclusiones si este fragmento no las contiene\n"
+        "- Enfócate en los hechos y datos presentes en este fragmento\n\n"
+        "FRAGMENTO:\n"
+        "{text}\n\n"
+        "Resume este fragmento de forma completa y estructurada."
+    ),
+}
+
+LEVEL_PROMPTS = {
+    "executive": {
+        "system": (
+            "Eres un asistente experto en investigación académica. "
+            "Crea resúmenes ejecutivos concisos pero informativos de artículos científicos."
+        ),
+        "user": (
+            "Crea un RESUMEN EJECUTIVO del siguiente artículo científico.\n\n"
+            "FORMATO REQUERIDO:\n"
+            "# Resumen Ejecutivo\n\n"
+            "## Problema de Investigación\n"
+            "[2 párrafos: ¿Qué problema aborda esta investigación? ¿Por qué es importante?]\n\n"
+            "## Metodología\n"
+            "[1 párrafo: ¿Qué enfoque se utilizó para investigar el problema?]\n\n"
+            "## Hallazgos Clave\n"
+            "- [Hallazgo 1 con datos de soporte]\n"
+            "- [Hallazgo 2 con datos de soporte]\n"
+            "- [Hallazgo 3 con datos de soporte]\n"
+            "- [Hallazgo 4 si aplica]\n\n"
+            "## Conclusión Principal\n"
+            "[1 párrafo: ¿Cuál es la conclusión principal?]\n\n"
+            "Usa lenguaje académico claro. Sé específico con números y resultados.\n"
+            "Longitud objetivo: 500 palabras.\n\n"
+            "ARTÍCULO:\n{text}"
+        )
+    },
+    "detailed": {
+        "system": (
+            "Eres un asistente experto en investigación académica. "
+            "Crea resúmenes detallados y estructurados que capturen todos los aspectos importantes de artículos científicos."
+        ),
+        "user": (
+            "Crea un RESUMEN DETALLADO (3-4 páginas) del siguiente artículo científico.\n\n"
+            "FORMATO REQUERIDO:\n"
+            "# Resumen Detallado\n\n"
+            "## Introducción y Contexto\n"
+            "[2-3 párrafos explicando el contexto, la motivación y el vacío en la literatura]\n\n"
+            "## Objetivos y Preguntas de Investigación\n"
+            "- [Objetivo 1]\n"
+            "- [Objetivo 2]\n"
+            "- [Hipótesis si aplica]\n\n"
+            "## Metodología\n"
+            "### Diseño del Estudio\n"
+            "[1-2 párrafos sobre el diseño de investigación]\n\n"
+            "### Muestra y Participantes\n"
+            "[1 párrafo sobre quién/qué fue estudiado, tamaño de muestra, criterios]\n\n"
+            "### Recolección de Datos\n"
+            "- [Instrumento 1: descripción]\n"
+            "- [Instrumento 2: descripción]\n\n"
+            "### Métodos de Análisis\n"
+            "[1 párrafo sobre cómo se analizaron los datos]\n\n"
+            "## Resultados Principales\n"
+            "### Hallazgos Primarios\n"
+            "[2-3 párrafos sobre los resultados principales con números/datos específicos]\n\n"
+            "### Hallazgos Secundarios\n"
+            "- [Hallazgo 1]\n"
+            "- [Hallazgo 2]\n\n"
+            "## Discusión\n"
+            "[2-3 párrafos interpretando los resultados y comparando con literatura existente]\n\n"
+            "## Implicaciones\n"
+            "### Implicaciones Prácticas\n"
+            "- [Implicación 1]\n"
+            "- [Implicación 2]\n\n"
+            "### Implicaciones Teóricas\n"
+            "- [Implicación 1]\n"
+            "- [Implicación 2]\n\n"
+            "## Limitaciones\n"
+            "- [Limitación 1]\n"
+            "- [Limitación 2]\n\n"
+            "## Futuras Investigaciones\n"
+            "- [Sugerencia 1]\n"
+            "- [Sugerencia 2]\n\n"
+            "Sé exhaustivo y académico. Incluye todos los detalles importantes.\n"
+            "Longitud objetivo: 1,800 palabras.\n\n"
+            "ARTÍCULO:\n{text}"
+        )
+    },
+    "exhaustive": {
+        "system": (
+            "Eres un asistente experto en investigación académica. "
+            "Crea resúmenes exhaustivos y comprehensivos que extraigan TODA la información importante de artículos científicos."
+        ),
+        "user": (
+            "Crea un RESUMEN EXHAUSTIVO (8-10 páginas) del siguiente artículo científico.\n\n"
+            "TU TAREA: Extraer CADA pieza importante de información. Este resumen debe permitir "
+            "que alguien entienda la investigación profundamente sin leer el original.\n\n"
+            "FORMATO REQUERIDO:\n"
+            "# Resumen Exhaustivo\n\n"
+            "## Marco Teórico\n"
+            "[Explicación detallada de teorías, modelos y frameworks utilizados]\n\n"
+            "### Conceptos Clave\n"
+            "- **Concepto 1**: [Definición y relevancia]\n"
+            "- **Concepto 2**: [Definición y relevancia]\n\n"
+            "## Revisión de Literatura\n"
+            "[Descripción comprehensiva de la investigación relacionada citada]\n\n"
+            "### Estudios Previos\n"
+            "[Autor 1 (Año)]: [Hallazgos clave y cómo se relacionan]\n"
+            "[Autor 2 (Año)]: [Hallazgos clave y cómo se relacionan]\n\n"
+            "## Metodología (Comprehensiva)\n"
+            "### Enfoque Epistemológico\n"
+            "[Párrafo sobre el paradigma de investigación]\n\n"
+            "### Diseño del Estudio\n"
+            "[Justificación y descripción detallada]\n\n"
+            "### Muestra\n"
+            "- **Población**: [Descripción]\n"
+            "- **Tamaño de muestra**: [Número y justificación]\n"
+            "- **Método de muestreo**: [Descripción]\n"
+            "- **Criterios de inclusión**: [Lista]\n"
+            "- **Criterios de exclusión**: [Lista]\n\n"
+            "### Instrumentos\n"
+            "[Descripción detallada de cada instrumento de medición]\n\n"
+            "### Procedimientos\n"
+            "[Descripción paso a paso de lo que se hizo]\n\n"
+            "### Consideraciones Éticas\n"
+            "[Descripción de protocolos éticos]\n\n"
+            "### Análisis de Datos\n"
+            "[Descripción comprehensiva de métodos estadísticos/cualitativos]\n\n"
+            "## Resultados (Completos)\n"
+            "### Estadísticas Descriptivas\n"
+            "[Todos los datos descriptivos relevantes]\n\n"
+            "### Hallazgos Principales por Pregunta de Investigación\n"
+            "**PI1**: [Hallazgo con detalles completos]\n"
+            "**PI2**: [Hallazgo con detalles completos]\n\n"
+            "### Resultados Estadísticos\n"
+            "[Todas las pruebas estadísticas significativas con valores]\n\n"
+            "### Tablas y Figuras\n"
+            "[Descripción textual de todas las tablas/figuras]\n\n"
+            "### Hallazgos Inesperados\n"
+            "[Descripción de resultados inesperados]\n\n"
+            "## Discusión (En Profundidad)\n"
+            "### Interpretación de Resultados\n"
+            "[Interpretación exhaustiva]\n\n"
+            "### Comparación con Investigación Previa\n"
+            "[Comparación detallada con literatura]\n\n"
+            "### Explicaciones Alternativas\n"
+            "[Discusión de otras interpretaciones posibles]\n\n"
+            "### Implicaciones Teóricas\n"
+            "[Cómo esto avanza la teoría]\n\n"
+            "### Implicaciones Prácticas\n"
+            "[Aplicaciones prácticas detalladas]\n\n"
+            "## Fortalezas y Limitaciones\n"
+            "### Fortalezas Metodológicas\n"
+            "- [Fortaleza 1]\n"
+            "- [Fortaleza 2]\n\n"
+            "### Limitaciones\n"
+            "- [Limitación 1 con impacto]\n"
+            "- [Limitación 2 con impacto]\n\n"
+            "## Investigación Futura\n"
+            "[Sugerencias detalladas para estudios futuros]\n\n"
+            "## Referencias Clave\n"
+            "[Lista de referencias más importantes citadas]\n\n"
+            "## Apéndice Técnico\n"
+            "- [Ecuaciones importantes]\n"
+            "- [Definiciones técnicas]\n"
+            "- [Terminología especializada]\n\n"
+            "Sé EXTREMADAMENTE exhaustivo. Incluye TODOS los detalles.\n"
+            "Longitud objetivo: 4,000 palabras.\n\n"
+            "ARTÍCULO:\n{text}"
+        )
+    }
+}
+
+
+def get_level_prompt(level: str) -> Dict[str, str]:
+    """Plantillas ``system`` y ``user`` (con ``{text}``) del nivel, o las de "detailed"."""
+    return LEVEL_PROMPTS.get(level, LEVEL_PROMPTS["detailed"])
@@ -0,0 +1,168 @@
+"""
+División de documentos en chunks por presupuesto de tokens.
+
+Los chunks se llenan con párrafos completos hasta ``max_tokens`` según
+``token_estimator``, en lugar de cortar cada N caracteres. Si se conocen las
+secciones del documento (``DocumentStructureExtractor``), una sección nueva
+empieza chunk cuando el actual ya va por la mitad del presupuesto, y las
+secciones pequeñas se agrupan. Sólo se parte un párrafo si por sí solo no
+cabe (por frases y, en último caso, por tokens). El solape entre chunks
+consecutivos se mide en tokens y se omite en los cortes de sección.
+"""
+
+import re
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from app.services.token_estimator import estimate_tokens, tail_tokens, truncate_to_tokens
+
+# Una línea que termina así cierra un párrafo
+PARAGRAPH_END = re.compile(r"[.!?:]\s*$")
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+# Con menos, un solo carácter acentuado (2 tokens) más el solape no cabe
+MIN_CHUNK_TOKENS = 8
+
+
+def _cut_word(text: str, limit: int) -> str:
+    """Prefijo de ``text`` cuando su primera palabra sola supera ``limit`` tokens."""
+    end = min(len(text), 5 * limit)
+    while end > 1 and estimate_tokens(text[:end]) > limit:
+        end -= 1
+    return text[:end]
+
+
+class TextChunker:
+    """
+    Args:
+        max_tokens: Tokens estimados por chunk (al menos ``MIN_CHUNK_TOKENS``);
+            ningún chunk lo supera, solape incluido
+        overlap_tokens: Tokens del final de un chunk repetidos al inicio del
+            siguiente; como mucho la mitad de ``max_tokens``
+    """
+
+    def __init__(self, max_tokens: int = 3000, overlap_tokens: int = 200):
+        self.max_tokens = max(MIN_CHUNK_TOKENS, max_tokens)
+        self.overlap_tokens = max(0, min(overlap_tokens, self.max_tokens // 2))
+
+    def chunk(self, text: str, sections: Optional[Dict[str, str]] = None) -> List[str]:
+        """
+        Divide ``text`` en chunks.
+
+        Args:
+            text: Texto completo (líneas separadas por saltos de línea)
+            sections: {nombre: contenido} en orden de aparición, si se conocen
+        """
+        starts = self._section_starts(text, sections or {})
+        piece_limit = max(1, self.max_tokens - self.overlap_tokens - 1)
+
+        chunks: List[str] = []
+        current: List[str] = []
+        used = 0
+        fresh = False  # el chunk actual tiene algo más que el solape
+
+        for paragraph, starts_section in self._paragraphs(text, starts):
+            section_break = starts_section and used >= self.max_tokens // 2
+            # Un párrafo que hay que partir de todos modos empieza llenando el chunk actual
+            remaining = self.max_tokens - used - 1
+            first_limit = piece_limit
+            if fresh and not section_break and remaining >= piece_limit // 4:
+                first_limit = remaining
+            for piece in self._split_oversized(paragraph, piece_limit, first_limit):
+                tokens = estimate_tokens(piece) + 1  # + salto de línea
+                if fresh and (used + tokens > self.max_tokens or section_break):
+                    chunk = "\n".join(current)
+                    chunks.append(chunk)
+                    overlap = "" if section_break else tail_tokens(chunk, self.overlap_tokens)
+                    current = [overlap] if overlap else []
+                    used = estimate_tokens(overlap)
+                    fresh = False
+                current.append(piece)
+                used += tokens
+                fresh = True
+                section_break = False
+
+        if fresh:
+            chunks.append("\n".join(current))
+        return chunks
+
+    def estimate_chunks(self, text: str) -> int:
+        """Número aproximado de chunks sin construirlos."""
+        tokens = estimate_tokens(text)
+        if tokens <= self.max_tokens:
+            return 1
+        step = self.max_tokens - self.overlap_tokens
+        return -(-(tokens - self.overlap_tokens) // step)
+
+    @staticmethod
+    def _section_starts(text: str, sections: Dict[str, str]) -> Set[int]:
+        """Desplazamientos de las líneas de título de cada sección en ``text``."""
+        starts: Set[int] = set()
+        cursor = 0
+        for content in sections.values():
+            first_line = content.strip().split("\n", 1)[0].strip()
+            if not first_line:
+                continue
+            position = text.find(first_line, cursor)
+            if position < 0:
+                continue
+            cursor = position + len(first_line)
+            body_start = text.rfind("\n", 0, position) + 1
+            # El título es la línea anterior al cuerpo
+            starts.add(text.rfind("\n", 0, max(body_start - 1, 0)) + 1 if body_start else 0)
+        return starts
+
+    @staticmethod
+    def _paragraphs(text: str, starts: Set[int]) -> Iterator[Tuple[str, bool]]:
+        """Genera (párrafo, empieza_sección) uniendo líneas hasta un fin de párrafo."""
+        lines: List[str] = []
+        opens_section = False
+        offset = 0
+        for line in text.split("\n"):
+            if offset in starts and lines:
+                yield "\n".join(lines), opens_section
+                lines = []
+            if not lines:
+                opens_section = offset in starts
+            offset += len(line) + 1
+
+            stripped = line.strip()
+            if stripped:
+                lines.append(stripped)
+            if lines and (not stripped or PARAGRAPH_END.search(stripped)):
+                yield "\n".join(lines), opens_section
+                lines = []
+        if lines:
+            yield "\n".join(lines), opens_section
+
+    @staticmethod
+    def _split_oversized(paragraph: str, limit: int, first_limit: int) -> List[str]:
+        """
+        Parte un párrafo que no cabe en ``limit`` por frases y, si hace falta,
+        por tokens. El primer trozo tiene como mucho ``first_limit`` tokens.
+        """
+        if truncate_to_tokens(paragraph, limit) == paragraph:
+            return [paragraph]
+
+        pieces: List[str] = []
+        current: List[str] = []
+        used = 0
+        limit, rest_limit = first_limit, limit
+        for sentence in SENTENCE_SPLIT.split(paragraph):
+            while sentence:
+                tokens = estimate_tokens(sentence)
+                if used + tokens <= limit:
+                    current.append(sentence)
+                    used += tokens
+                    break
+                # Cerrar el trozo en curso y volver a medir la frase con el límite siguiente
+                if current:
+                    pieces.append(" ".join(current))
+                    current, used, limit = [], 0, rest_limit
+                    continue
+                # Una frase mayor que el límite se corta en trozos de ``limit`` tokens
+                head = truncate_to_tokens(sentence, limit) or _cut_word(sentence, limit)
+                pieces.append(head)
+                limit = rest_limit
+                sentence = sentence[len(head):].lstrip()
+        if current:
+            pieces.append(" ".join(current))
+        return pieces
@@ -0,0 +1,136 @@
+"""
+Backends de extracción de texto de PDFs.
+
+- ``pdfplumber``: extracción layout-aware, fiel pero lenta (Python puro por carácter).
+- ``pypdf``: texto del content stream, varias veces más rápido; suficiente
+  para el cuerpo del documento.
+
+``ExtractionPolicy`` decide por documento qué backend usar para cada rango de
+páginas: pdfplumber para las primeras páginas (de donde salen los metadatos)
+y el backend rápido para el cuerpo, salvo que su salida parezca corrupta.
+"""
+
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pdfplumber
+from pypdf import PdfReader
+
+logger = logging.getLogger(__name__)
+
+
+def iter_pdf_pages(
+    pdf: Any, start: int = 0, stop: Optional[int] = None
+) -> Iterator[Tuple[int, List[str]]]:
+    """
+    Itera (page_number, lines) de un PDF abierto con pdfplumber.
+
+    pdfplumber conserva los objetos de layout (chars, rects, ...) de cada
+    página visitada; aquí se liberan tras extraer el texto para que la
+    memoria no crezca con el número de páginas.
+
+    Args:
+        pdf: PDF abierto con pdfplumber
+        start: Índice (0-indexed) de la primera página
+        stop: Índice de la página donde parar (exclusivo)
+    """
+    for page_number, page in enumerate(pdf.pages[start:stop], start=start + 1):
+        try:
+            text = page.extract_text() or ""
+        finally:
+            close = getattr(page, "close", None) or page.flush_cache
+            close()
+        yield page_number, text.split("\n") if text else []
+
+
+class TextExtractionBackend(ABC):
+    """Interfaz de un backend: extrae las líneas de un rango de páginas."""
+
+    name = "base"
+
+    @abstractmethod
+    def extract_pages(self, file_path: str, start: int, stop: int) -> List[List[str]]:
+        """Líneas de las páginas ``start`` a ``stop`` (0-indexed, ``stop`` exclusivo)."""
+
+
+class PdfplumberBackend(TextExtractionBackend):
+    name = "pdfplumber"
+
+    def extract_pages(self, file_path: str, start: int, stop: int) -> List[List[str]]:
+        with pdfplumber.open(file_path) as pdf:
+            return [lines for _, lines in iter_pdf_pages(pdf, start, stop)]
+
+
+class PypdfBackend(TextExtractionBackend):
+    name = "pypdf"
+
+    def extract_pages(self, file_path: str, start: int, stop: int) -> List[List[str]]:
+        reader = PdfReader(file_path)
+        pages = []
+        for page in reader.pages[start:stop]:
+            text = page.extract_text() or ""
+            # pypdf conserva espacios de relleno y líneas en blanco del content stream
+            pages.append([line.strip() for line in text.split("\n") if line.strip()])
+        return pages
+
+
+BACKENDS: Dict[str, TextExtractionBackend] = {
+    backend.name: backend for backend in (PdfplumberBackend(), PypdfBackend())
+}
+
+
+def get_backend(name: str) -> TextExtractionBackend:
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown text extraction backend: {name}") from None
+
+
+def looks_garbled(pages: List[List[str]], min_chars_per_page: int = 20) -> bool:
+    """
+    Heurística de calidad para la salida del backend rápido.
+
+    Se considera corrupta si casi no hay texto o si la mayoría de caracteres
+    no son letras (fuentes sin ToUnicode, glifos sin mapear).
+    """
+    if not pages:
+        return False
+
+    text = "".join("".join(lines) for lines in pages)
+    visible = [ch for ch in text if not ch.isspace()]
+    if len(visible) < min_chars_per_page * len(pages):
+        return True
+
+    letters = sum(1 for ch in visible if ch.isalpha())
+    return letters / len(visible) < 0.5
+
+
+class ExtractionPolicy:
+    """
+    Selección de backend por documento.
+
+    Args:
+        backend: "auto" (política), o el nombre de un backend para usarlo en todo el documento
+        metadata_pages: Páginas iniciales que siempre se extraen con pdfplumber en modo "auto"
+    """
+
+    def __init__(self, backend: str = "auto", metadata_pages: int = 1):
+        if backend != "auto":
+            get_backend(backend)
+        self.backend = backend
+        self.metadata_pages = metadata_pages
+
+    def body_backend(self) -> TextExtractionBackend:
+        """Backend preferido para el cuerpo del documento."""
+        return get_backend("pypdf" if self.backend == "auto" else self.backend)
+
+    def head_page_count(self, page_count: int) -> int:
+        """Páginas iniciales (título, autores, DOI) que se extraen con pdfplumber."""
+        if self.backend != "auto":
+            return 0
+        return min(self.metadata_pages, page_count)
+
+    def accept_body(self, pages: List[List[str]]) -> bool:
+        """Indica si la salida del backend del cuerpo es aceptable o hay que recurrir a pdfplumber."""
+        return self.backend != "auto" or not looks_garbled(pages)
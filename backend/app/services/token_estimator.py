@@ -0,0 +1,75 @@
+"""
+Estimación local del número de tokens.
+
+Los límites del proveedor (contexto, tokens por minuto) se miden en tokens
+del tokenizador del modelo, que no está disponible localmente. La estimación
+cuenta piezas como lo hace un tokenizador BPE: una palabra corta es un token
+y las largas se parten en trozos de ~5 caracteres (uno más si llevan
+acentos, frecuentes en español); los números van en grupos de 3 cifras y
+cada signo de puntuación o salto de línea es un token. Tiende a
+sobreestimar ligeramente, que es el lado seguro para un presupuesto.
+"""
+
+import re
+from typing import Iterator, Tuple
+
+TOKEN_PATTERN = re.compile(r"\d+|[^\W\d_]+|\n+|[^\w\s]|_+")
+WHITESPACE = re.compile(r"\s")
+
+
+def _cost(piece: str) -> int:
+    if piece[0].isdigit():
+        return (len(piece) + 2) // 3
+    if piece[0].isalpha():
+        return 1 + (len(piece) - 1) // 5 + (0 if piece.isascii() else 1)
+    return 1
+
+
+def _iter_costs(text: str) -> Iterator[Tuple[re.Match, int]]:
+    for match in TOKEN_PATTERN.finditer(text):
+        yield match, _cost(match.group(0))
+
+
+def estimate_tokens(text: str) -> int:
+    """Número aproximado de tokens de ``text``."""
+    return sum(cost for _, cost in _iter_costs(text))
+
+
+def _word_start(text: str, position: int) -> int:
+    """Inicio de la palabra que contiene ``position`` (p. ej. "palabra12")."""
+    if position == 0 or text[position - 1].isspace():
+        return position
+    boundary = max(text.rfind(" ", 0, position), text.rfind("\n", 0, position))
+    return boundary + 1 if boundary >= 0 else position
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Prefijo de ``text`` de como mucho ``max_tokens`` (``text`` entero si cabe).
+
+    Se corta antes de la palabra que no cabe, salvo que sea la única.
+    """
+    used = 0
+    for match, cost in _iter_costs(text):
+        used += cost
+        if used > max_tokens:
+            return text[:_word_start(text, match.start()) or match.start()].rstrip()
+    return text
+
+
+def tail_tokens(text: str, max_tokens: int) -> str:
+    """Sufijo de ``text`` de como mucho ``max_tokens``, empezando en una palabra completa."""
+    if max_tokens <= 0:
+        return ""
+    start = len(text)
+    used = 0
+    for match in reversed(list(TOKEN_PATTERN.finditer(text))):
+        used += _cost(match.group(0))
+        if used > max_tokens:
+            break
+        start = match.start()
+    if start < len(text) and start != _word_start(text, start):
+        # No empezar a mitad de palabra
+        following = WHITESPACE.search(text, start)
+        start = following.start() if following else len(text)
+    return text[start:].lstrip()
@@ -0,0 +1,235 @@
+"""
+Subidas reanudables por rangos de bytes.
+
+El cliente crea una sesión con el tamaño total, envía rangos contiguos
+(``Content-Range: bytes start-end/total``) y la finaliza. El servidor guarda
+el offset recibido en ``upload_sessions`` y calcula el SHA-256 a medida que
+llegan los bytes; si una conexión se corta, los bytes ya escritos cuentan y
+el cliente reanuda desde el offset que devuelve la sesión.
+
+Al finalizar, el archivo temporal se entrega como ``StagedUpload`` al mismo
+camino que una subida normal (deduplicación, almacén por contenido, ingesta).
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models import UploadSession
+from app.services.file_storage import FileTooLargeError, StagedUpload, temp_upload_path
+
+logger = logging.getLogger(__name__)
+
+CONTENT_RANGE_RE = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
+
+
+class UploadOffsetMismatch(Exception):
+    """El rango enviado no empieza donde terminó lo recibido."""
+
+    def __init__(self, expected: int):
+        super().__init__(f"Upload must resume at offset {expected}")
+        self.expected = expected
+
+
+class UploadRangeMismatch(Exception):
+    """El cuerpo no tiene la longitud que declara ``Content-Range``."""
+
+
+class UploadIncomplete(Exception):
+    """Se intentó finalizar una sesión a la que aún le faltan bytes."""
+
+
+def parse_content_range(header: Optional[str]) -> Tuple[int, int, int]:
+    """
+    Interpreta ``bytes start-end/total`` (``end`` inclusivo).
+
+    Raises:
+        ValueError: Si falta o está mal formado
+    """
+    match = CONTENT_RANGE_RE.match((header or "").strip())
+    if not match:
+        raise ValueError("Content-Range must be 'bytes start-end/total'")
+    start, end, total = (int(group) for group in match.groups())
+    if end < start or end >= total:
+        raise ValueError("Invalid Content-Range bounds")
+    return start, end, total
+
+
+class ResumableUploads:
+    """
+    Gestión de sesiones de subida reanudable.
+
+    El estado del hash vive en memoria por sesión; si el proceso se reinicia
+    se reconstruye leyendo una vez la parte ya recibida del temporal.
+    """
+
+    def __init__(self, directory: Path, ttl_seconds: float = 24 * 3600):
+        self.directory = Path(directory)
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self._hashes: Dict[str, Tuple[int, "hashlib._Hash"]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def create(
+        self,
+        db: Session,
+        user_id: int,
+        filename: str,
+        extension: str,
+        total_size: int,
+        max_bytes: int,
+        category_id: Optional[int] = None,
+    ) -> UploadSession:
+        if total_size > max_bytes:
+            raise FileTooLargeError(max_bytes)
+
+        self.purge_expired(db)
+        path = temp_upload_path(self.directory)
+        path.touch()
+        session = UploadSession(
+            id=uuid.uuid4().hex,
+            user_id=user_id,
+            filename=filename,
+            extension=extension.lower(),
+            category_id=category_id,
+            total_size=total_size,
+            offset=0,
+            temp_path=str(path),
+            status="open",
+            expires_at=datetime.utcnow() + self.ttl,
+        )
+        db.add(session)
+        db.commit()
+        db.refresh(session)
+        self._hashes[session.id] = (0, hashlib.sha256())
+        return session
+
+    async def append(
+        self,
+        db: Session,
+        session: UploadSession,
+        start: int,
+        chunks: AsyncIterator[bytes],
+        end: Optional[int] = None,
+    ) -> UploadSession:
+        """
+        Añade al temporal los bytes de ``chunks``, que deben empezar en ``start``.
+
+        Los bytes recibidos antes de un corte de conexión se conservan: el
+        offset de la sesión avanza igualmente y el error se propaga. Si se
+        indica ``end`` (inclusivo), un cuerpo de otra longitud se descarta
+        entero y el offset vuelve a ``start``.
+
+        Raises:
+            UploadOffsetMismatch: Si ``start`` no coincide con el offset de la sesión
+            UploadRangeMismatch: Si el cuerpo no mide ``end - start + 1`` bytes
+            FileTooLargeError: Si se envían más bytes que ``total_size``
+        """
+        async with self._locks.setdefault(session.id, asyncio.Lock()):
+            db.refresh(session)
+            if start != session.offset:
+                raise UploadOffsetMismatch(session.offset)
+
+            sha256 = self._hash_state(session)
+            offset = session.offset
+            try:
+                with open(session.temp_path, "r+b") as buffer:
+                    # Descarta restos de un intento anterior que no llegó a contarse
+                    buffer.truncate(offset)
+                    buffer.seek(offset)
+                    async for chunk in chunks:
+                        if offset + len(chunk) > session.total_size:
+                            raise FileTooLargeError(session.total_size)
+                        if end is not None and offset + len(chunk) > end + 1:
+                            raise UploadRangeMismatch("Body is longer than the Content-Range")
+                        buffer.write(chunk)
+                        sha256.update(chunk)
+                        offset += len(chunk)
+                if end is not None and offset != end + 1:
+                    raise UploadRangeMismatch(
+                        f"Body has {offset - start} bytes, Content-Range declares {end + 1 - start}"
+                    )
+            except UploadRangeMismatch:
+                # El hash ya incluye parte del rango descartado: se rehace al reanudar
+                offset, sha256 = start, None
+                raise
+            finally:
+                if sha256 is None:
+                    self._hashes.pop(session.id, None)
+                else:
+                    self._hashes[session.id] = (offset, sha256)
+                session.offset = offset
+                session.expires_at = datetime.utcnow() + self.ttl
+                db.commit()
+
+            return session
+
+    def finalize(self, db: Session, session: UploadSession) -> StagedUpload:
+        """
+        Cierra una sesión completa y devuelve su temporal como ``StagedUpload``.
+
+        Raises:
+            UploadIncomplete: Si aún no se recibieron ``total_size`` bytes
+        """
+        if session.offset != session.total_size:
+            raise UploadIncomplete(
+                f"Received {session.offset} of {session.total_size} bytes"
+            )
+
+        sha256 = self._hash_state(session)
+        session.status = "completed"
+        db.commit()
+        self._forget(session.id)
+        return StagedUpload(
+            path=Path(session.temp_path), file_hash=sha256.hexdigest(), size=session.offset
+        )
+
+    def abort(self, db: Session, session: UploadSession) -> None:
+        Path(session.temp_path).unlink(missing_ok=True)
+        session.status = "aborted"
+        db.commit()
+        self._forget(session.id)
+
+    def purge_expired(self, db: Session) -> int:
+        """Elimina sesiones abiertas caducadas y sus temporales."""
+        expired = (
+            db.query(UploadSession)
+            .filter(UploadSession.status == "open", UploadSession.expires_at < datetime.utcnow())
+            .all()
+        )
+        for session in expired:
+            Path(session.temp_path).unlink(missing_ok=True)
+            session.status = "aborted"
+            self._forget(session.id)
+        if expired:
+            db.commit()
+            logger.info(f"Purged {len(expired)} expired upload sessions")
+        return len(expired)
+
+    def _hash_state(self, session: UploadSession) -> "hashlib._Hash":
+        covered, sha256 = self._hashes.get(session.id, (-1, None))
+        if sha256 is not None and covered == session.offset:
+            return sha256
+
+        # Otro proceso o un reinicio: rehacer el hash de lo ya recibido
+        sha256 = hashlib.sha256()
+        remaining = session.offset
+        with open(session.temp_path, "rb") as f:
+            while remaining > 0:
+                block = f.read(min(remaining, 1024 * 1024))
+                if not block:
+                    break
+                sha256.update(block)
+                remaining -= len(block)
+        self._hashes[session.id] = (session.offset, sha256)
+        return sha256
+
+    def _forget(self, session_id: str) -> None:
+        self._hashes.pop(session_id, None)
+        self._locks.pop(session_id, None)
@@ -0,0 +1,263 @@
+"""
+Benchmark de throughput de la ingesta.
+
+Genera un corpus de PDFs sintéticos (``benchmarks.synthetic_pdf``) con los
+tamaños e idiomas indicados y pasa cada documento por las etapas de la
+ingesta: hash, parseo, ``MetadataExtractor.extract_from_pdf``,
+``DocumentStructureExtractor.extract_from_pdf`` y
+``TopicClassifier.detect_topics``. Para cada etapa informa docs/s, latencia
+p50/p95 y el mayor pico de RSS sobre el de partida durante la etapa, en
+total y por (idioma, páginas). Un hilo muestrea el RSS mientras dura cada
+etapa: el máximo del proceso (``ru_maxrss``) sólo sube y atribuiría todo a
+la primera etapa que lo alcanza, y la diferencia entre antes y después no ve
+la memoria que la etapa libera al terminar. La memoria de los workers del
+pool de extracción no forma parte del RSS del proceso; el máximo de los
+hijos se informa aparte.
+
+El parseo se mide en frío (se borra el artefacto antes); metadatos y
+estructura leen el artefacto ya parseado, como en la ingesta real. Los
+resultados se guardan en JSON; con ``--baseline`` se comparan contra una
+ejecución anterior para detectar regresiones entre versiones.
+
+Uso (desde ``backend/``)::
+
+    python -m benchmarks.ingestion [--pages 5 20 100] [--languages es en]
+        [--docs 3] [--output results.json] [--baseline previous.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.synthetic_pdf import LANGUAGES, generate_corpus
+
+STAGES = ["hash", "parse", "metadata", "structure", "topics"]
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Percentil por rango más cercano."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def peak_rss_mb(who: int = resource.RUSAGE_SELF) -> float:
+    """RSS máximo (``RUSAGE_SELF`` o ``RUSAGE_CHILDREN``) en MB."""
+    # ru_maxrss está en KB en Linux y en bytes en macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return resource.getrusage(who).ru_maxrss / scale
+
+
+def current_rss_mb() -> float:
+    """RSS actual del proceso en MB; sin ``/proc`` se usa el máximo."""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return peak_rss_mb()
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+class RssSampler:
+    """
+    Pico del RSS mientras dura el bloque ``with``, muestreado en un hilo.
+
+    ``growth_mb`` es el pico menos el RSS al entrar; con un intervalo de
+    muestreo de milisegundos puede perder picos más cortos que eso.
+    """
+
+    def __init__(self, interval: float = 0.002):
+        self.interval = interval
+        self.baseline_mb = 0.0
+        self.peak_mb = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def growth_mb(self) -> float:
+        return max(0.0, self.peak_mb - self.baseline_mb)
+
+    def __enter__(self) -> "RssSampler":
+        self.baseline_mb = self.peak_mb = current_rss_mb()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, name="rss-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak_mb = max(self.peak_mb, current_rss_mb())
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak_mb = max(self.peak_mb, current_rss_mb())
+
+
+def summarize(latencies: List[float], rss_deltas: List[float]) -> Dict[str, float]:
+    total = sum(latencies)
+    return {
+        "docs": len(latencies),
+        "docs_per_sec": round(len(latencies) / total, 3) if total else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "max_rss_delta_mb": round(max(rss_deltas, default=0.0), 1),
+    }
+
+
+def run_document(path: Path, store, metadata_extractor, structure_extractor, classifier) -> Dict:
+    """Ejecuta las etapas sobre un documento; devuelve {etapa: (segundos, pico Δrss_mb)}."""
+    timings: Dict[str, tuple] = {}
+    state: Dict = {}
+
+    def timed(stage: str, fn: Callable) -> None:
+        with RssSampler() as rss:
+            start = time.perf_counter()
+            state[stage] = fn()
+            elapsed = time.perf_counter() - start
+        timings[stage] = (elapsed, rss.growth_mb)
+
+    file_path = str(path)
+    timed("hash", lambda: metadata_extractor.calculate_file_hash(file_path))
+    file_hash = state["hash"]
+    store.delete(file_hash)
+    timed("parse", lambda: store.get(file_path, file_hash))
+    timed("metadata", lambda: metadata_extractor.extract_from_pdf(file_path, file_hash))
+    timed("structure", lambda: structure_extractor.extract_from_pdf(file_path, file_hash))
+    metadata = state["metadata"]
+    timed(
+        "topics",
+        lambda: classifier.detect_topics(
+            title=metadata.get("title") or "",
+            abstract=metadata.get("abstract") or "",
+            keywords=metadata.get("keywords") or [],
+            extra_text=metadata.get("text_excerpt"),
+        ),
+    )
+    return timings
+
+
+def run(page_counts: List[int], languages: List[str], docs: int, workdir: Path) -> Dict:
+    from app.services.document_structure_extractor import DocumentStructureExtractor
+    from app.services.metadata_extractor import MetadataExtractor
+    from app.services.parsed_document import get_parsed_document_store
+    from app.services.topic_classifier import TopicClassifier
+
+    corpus = generate_corpus(workdir / "pdfs", page_counts, languages, docs)
+
+    store = get_parsed_document_store()
+    # Artefactos en el directorio temporal, no en data/processed
+    store.root = workdir / "processed"
+    metadata_extractor = MetadataExtractor()
+    structure_extractor = DocumentStructureExtractor()
+    classifier = TopicClassifier()
+
+    overall: Dict[str, Dict[str, List[float]]] = defaultdict(lambda: defaultdict(list))
+    grouped: Dict[str, Dict[str, Dict[str, List[float]]]] = defaultdict(
+        lambda: defaultdict(lambda: defaultdict(list))
+    )
+    for item in corpus:
+        timings = run_document(
+            item["path"], store, metadata_extractor, structure_extractor, classifier
+        )
+        group = f"{item['language']}/{item['pages']}p"
+        for stage, (seconds, rss_delta) in timings.items():
+            for bucket in (overall[stage], grouped[group][stage]):
+                bucket["latency"].append(seconds)
+                bucket["rss"].append(rss_delta)
+
+    return {
+        "created_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "parallel_min_pages": store.parallel_min_pages,
+            "processes": store.processes,
+            "text_backend": store.policy.backend,
+        },
+        "memory": {
+            "peak_rss_mb": round(peak_rss_mb(), 1),
+            "peak_children_rss_mb": round(peak_rss_mb(resource.RUSAGE_CHILDREN), 1),
+        },
+        "config": {"pages": page_counts, "languages": languages, "docs_per_config": docs},
+        "stages": {
+            stage: summarize(overall[stage]["latency"], overall[stage]["rss"])
+            for stage in STAGES
+        },
+        "groups": {
+            group: {
+                stage: summarize(values[stage]["latency"], values[stage]["rss"])
+                for stage in STAGES
+            }
+            for group, values in grouped.items()
+        },
+    }
+
+
+def print_report(results: Dict, baseline: Optional[Dict] = None) -> None:
+    header = f"{'stage':<10} {'docs/s':>9} {'p50 ms':>10} {'p95 ms':>10} {'Δrss MB':>8}"
+    if baseline:
+        header += f" {'Δ p50':>8} {'Δ docs/s':>9}"
+    print(header)
+    for stage, row in results["stages"].items():
+        line = (
+            f"{stage:<10} {row['docs_per_sec']:9.2f} {row['p50_ms']:10.2f} "
+            f"{row['p95_ms']:10.2f} {row['max_rss_delta_mb']:8.1f}"
+        )
+        previous = (baseline or {}).get("stages", {}).get(stage)
+        if previous:
+            line += f" {_change(previous['p50_ms'], row['p50_ms']):>8} "
+            line += f"{_change(previous['docs_per_sec'], row['docs_per_sec']):>9}"
+        print(line)
+
+    memory = results["memory"]
+    print(f"\npeak rss {memory['peak_rss_mb']:.1f} MB, workers {memory['peak_children_rss_mb']:.1f} MB")
+
+    print()
+    for group, stages in results["groups"].items():
+        cells = "  ".join(f"{stage} {row['p50_ms']:.1f}ms" for stage, row in stages.items())
+        print(f"{group:<10} {cells}")
+
+
+def _change(before: float, after: float) -> str:
+    if not before:
+        return "-"
+    return f"{(after - before) / before * 100:+.0f}%"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, nargs="+", default=[5, 20, 100])
+    parser.add_argument("--languages", nargs="+", choices=sorted(LANGUAGES), default=["es", "en"])
+    parser.add_argument("--docs", type=int, default=3, help="documentos por (idioma, páginas)")
+    parser.add_argument("--output", type=Path, help="archivo JSON de resultados")
+    parser.add_argument("--baseline", type=Path, help="resultados anteriores a comparar")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="ingestion-bench-") as tmp:
+        results = run(args.pages, args.languages, args.docs, Path(tmp))
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+    print_report(results, baseline)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"\nResults written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
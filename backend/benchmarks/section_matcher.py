@@ -0,0 +1,105 @@
+"""
+Microbenchmark del detector de secciones de DocumentStructureExtractor.
+
+Genera documentos sintéticos de hasta 1.000 páginas y mide el tiempo por
+línea de ``extract_spans``; si escala linealmente, los µs/línea se mantienen
+constantes al duplicar el tamaño. Como referencia se mide también el
+algoritmo anterior (secciones × líneas × patrones, normalizando cada línea
+una vez por sección).
+
+Uso (desde ``backend/``)::
+
+    python -m benchmarks.section_matcher [--lines-per-page 45]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from typing import List, Optional, Tuple
+
+from app.services.document_structure_extractor import DocumentStructureExtractor
+
+PAGE_COUNTS = [125, 250, 500, 1000]
+
+WORDS = (
+    "el juego en el desarrollo infantil educación música aprendizaje análisis "
+    "diseño evaluación estudiantes docentes investigación resultados método "
+    "the children learning analysis results design evaluation teachers research"
+).split()
+
+HEADINGS = [
+    "Resumen", "1. Introducción", "2. Marco teórico", "3. Metodología",
+    "4. Resultados", "5. Discusión", "6. Conclusiones", "Referencias",
+]
+
+
+def synthetic_document(pages: int, lines_per_page: int, seed: int = 7) -> List[Tuple[int, str]]:
+    """Líneas (page_number, line) con los títulos repartidos a lo largo del documento."""
+    rng = random.Random(seed)
+    total = pages * lines_per_page
+    heading_at = {int(i * total / len(HEADINGS)): h for i, h in enumerate(HEADINGS)}
+    lines = []
+    for i in range(total):
+        if i in heading_at:
+            line = heading_at[i]
+        elif rng.random() < 0.1:
+            # Líneas cortas que no son títulos (pies de figura, números de página)
+            line = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))).capitalize()
+        else:
+            line = " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 14)))
+        lines.append((i // lines_per_page + 1, line))
+    return lines
+
+
+def legacy_positions(extractor: DocumentStructureExtractor, lines: List[Tuple[int, str]]) -> dict:
+    """Detección anterior: un recorrido completo del documento por cada sección y patrón."""
+    compiled = {
+        section: [re.compile(p, re.IGNORECASE | re.UNICODE) for p in patterns]
+        for section, patterns in extractor.SECTION_PATTERNS.items()
+    }
+    positions = {}
+    for section, patterns in compiled.items():
+        for i, (_, line) in enumerate(lines):
+            normalized = extractor._normalize_text(line.strip())
+            if any(p.match(normalized) for p in patterns) and len(line.strip()) < 50:
+                positions[section] = i
+                break
+    return positions
+
+
+def _timed(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines-per-page", type=int, default=45)
+    args = parser.parse_args(argv)
+
+    extractor = DocumentStructureExtractor()
+    print(f"{'pages':>6} {'lines':>8} {'single-pass s':>14} {'µs/line':>8} {'legacy s':>10} {'µs/line':>8}")
+    for pages in PAGE_COUNTS:
+        lines = synthetic_document(pages, args.lines_per_page)
+        spans = extractor.extract_spans(iter(lines))
+        legacy_order = sorted(legacy_positions(extractor, lines).items(), key=lambda kv: kv[1])
+        assert [s.name for s in spans] == [name for name, _ in legacy_order]
+
+        current = _timed(lambda: extractor.extract_spans(iter(lines)))
+        legacy = _timed(lambda: legacy_positions(extractor, lines), repeat=1)
+        n = len(lines)
+        print(
+            f"{pages:6d} {n:8d} {current:14.3f} {current / n * 1e6:8.2f} "
+            f"{legacy:10.3f} {legacy / n * 1e6:8.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
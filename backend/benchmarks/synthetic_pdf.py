@@ -0,0 +1,149 @@
+"""
+Generador de PDFs sintéticos para benchmarks.
+
+Escribe PDFs de texto (Helvetica, WinAnsiEncoding) sin dependencias
+externas, con la estructura de un artículo académico: título, autores, DOI,
+resumen, palabras clave y secciones numeradas repartidas entre las páginas.
+"""
+
+import random
+import zlib
+from pathlib import Path
+from typing import Dict, List
+
+LANGUAGES: Dict[str, Dict[str, List[str]]] = {
+    "es": {
+        "headings": [
+            "Resumen", "1. Introducción", "2. Marco teórico", "3. Metodología",
+            "4. Resultados", "5. Discusión", "6. Conclusiones", "Referencias",
+        ],
+        "keywords_label": ["Palabras clave"],
+        "words": (
+            "el juego en el desarrollo infantil educación música aprendizaje análisis "
+            "diseño evaluación estudiantes docentes investigación escuela pedagogía "
+            "currículo sociedad cultura niños actividad proceso estrategia enseñanza"
+        ).split(),
+    },
+    "en": {
+        "headings": [
+            "Abstract", "1. Introduction", "2. Related Work", "3. Methods",
+            "4. Results", "5. Discussion", "6. Conclusions", "References",
+        ],
+        "keywords_label": ["Keywords"],
+        "words": (
+            "the children learning analysis results design evaluation teachers research "
+            "school pedagogy curriculum society culture activity process strategy "
+            "teaching model data students machine study framework approach"
+        ).split(),
+    },
+}
+
+LINES_PER_PAGE = 48
+CHARS_PER_LINE = 90
+
+
+def _escape(text: str) -> bytes:
+    encoded = text.encode("cp1252", errors="replace")
+    return encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def _paragraph_lines(rng: random.Random, words: List[str], count: int) -> List[str]:
+    lines = []
+    for _ in range(count):
+        line: List[str] = []
+        while sum(len(w) + 1 for w in line) < CHARS_PER_LINE:
+            line.append(rng.choice(words))
+        lines.append(" ".join(line))
+    return lines
+
+
+def document_lines(pages: int, language: str = "es", seed: int = 0) -> List[List[str]]:
+    """Líneas de cada página de un artículo sintético."""
+    spec = LANGUAGES[language]
+    rng = random.Random(seed)
+    words = spec["words"]
+
+    body = _paragraph_lines(rng, words, pages * LINES_PER_PAGE)
+    headings = spec["headings"]
+    # Títulos repartidos a lo largo del cuerpo, con el resumen en la primera página
+    positions = [8] + [
+        8 + int(i * (len(body) - 8) / len(headings)) for i in range(1, len(headings))
+    ]
+    for position, heading in zip(reversed(positions), reversed(headings)):
+        body.insert(position, heading)
+
+    front = [
+        " ".join(rng.choice(words) for _ in range(8)).title(),
+        "Ana García, John Smith, Lucía Pérez",
+        f"DOI: 10.{rng.randint(1000, 9999)}/synthetic.{seed}",
+        f"{spec['keywords_label'][0]}: {', '.join(rng.sample(words, 4))}",
+        "2023",
+    ]
+    lines = front + body
+    return [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)][:pages]
+
+
+def write_pdf(path: Path, pages: List[List[str]], title: str = "") -> Path:
+    """Escribe un PDF mínimo con una página por lista de líneas."""
+    objects: List[bytes] = []
+
+    def add(obj: bytes) -> int:
+        objects.append(obj)
+        return len(objects)
+
+    catalog = add(b"")  # se completa al final
+    pages_id = add(b"")
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+
+    page_ids = []
+    for lines in pages:
+        stream = b"BT /F1 10 Tf 12 TL 50 790 Td " + b" ".join(
+            b"(" + _escape(line) + b") Tj T*" for line in lines
+        ) + b" ET"
+        content = add(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        page_ids.append(
+            add(
+                b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] "
+                b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+                % (pages_id, font, content)
+            )
+        )
+
+    info = add(b"<< /Title (" + _escape(title) + b") >>") if title else None
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % page_id for page_id in page_ids),
+        len(page_ids),
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + obj + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    trailer = b"<< /Size %d /Root %d 0 R" % (len(objects) + 1, catalog)
+    if info:
+        trailer += b" /Info %d 0 R" % info
+    out += b"trailer\n" + trailer + b" >>\nstartxref\n%d\n%%%%EOF\n" % xref
+
+    path.write_bytes(bytes(out))
+    return path
+
+
+def generate_corpus(
+    directory: Path, page_counts: List[int], languages: List[str], docs_per_config: int = 3
+) -> List[Dict]:
+    """Genera el corpus y devuelve [{path, pages, language}]."""
+    directory.mkdir(parents=True, exist_ok=True)
+    corpus = []
+    for language in languages:
+        for pages in page_counts:
+            for i in range(docs_per_config):
+                seed = zlib.crc32(f"{language}:{pages}:{i}".encode()) & 0xFFFF
+                path = directory / f"synthetic_{language}_{pages}p_{i}.pdf"
+                write_pdf(path, document_lines(pages, language, seed))
+                corpus.append({"path": path, "pages": pages, "language": language})
+    return corpus
@@ -0,0 +1,113 @@
+"""
+Benchmark de backends de extracción de texto.
+
+Compara throughput (páginas/s) y calidad de cada backend sobre los PDFs de
+``data/uploads`` (o las rutas indicadas). La calidad es el F1 de palabras
+frente a la salida de pdfplumber, que se toma como referencia.
+
+Uso (desde ``backend/``)::
+
+    python -m benchmarks.text_extraction [pdf ...]
+"""
+
+import argparse
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app.services.parsed_document import parse_pdf
+from app.services.text_extraction import BACKENDS, ExtractionPolicy
+
+UPLOADS_DIR = Path(__file__).resolve().parent.parent / "data" / "uploads"
+
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def word_f1(reference: str, candidate: str) -> float:
+    """F1 entre los multiconjuntos de palabras de dos textos."""
+    ref = Counter(w.lower() for w in WORD_RE.findall(reference))
+    cand = Counter(w.lower() for w in WORD_RE.findall(candidate))
+    if not ref and not cand:
+        return 1.0
+    overlap = sum((ref & cand).values())
+    if not overlap:
+        return 0.0
+    precision = overlap / sum(cand.values())
+    recall = overlap / sum(ref.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def _text(pages: List[List[str]]) -> str:
+    return "\n".join("\n".join(lines) for lines in pages)
+
+
+def _timed(fn) -> Tuple[List[List[str]], float]:
+    start = time.perf_counter()
+    pages = fn()
+    return pages, time.perf_counter() - start
+
+
+def benchmark_file(path: Path) -> Optional[Dict[str, Tuple[int, float, float]]]:
+    """Devuelve {modo: (páginas, segundos, f1)} o None si el PDF no se puede leer."""
+    results: Dict[str, Tuple[int, float, float]] = {}
+    try:
+        reference, elapsed = _timed(
+            lambda: BACKENDS["pdfplumber"].extract_pages(str(path), 0, None)
+        )
+    except Exception as e:
+        print(f"  skipped {path.name}: {e}", file=sys.stderr)
+        return None
+    reference_text = _text(reference)
+    results["pdfplumber"] = (len(reference), elapsed, 1.0)
+
+    for name, backend in BACKENDS.items():
+        if name == "pdfplumber":
+            continue
+        pages, elapsed = _timed(lambda: backend.extract_pages(str(path), 0, None))
+        results[name] = (len(pages), elapsed, word_f1(reference_text, _text(pages)))
+
+    document, elapsed = _timed(
+        lambda: parse_pdf(str(path), "benchmark", policy=ExtractionPolicy("auto")).pages
+    )
+    results["auto"] = (len(document), elapsed, word_f1(reference_text, _text(document)))
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("pdfs", nargs="*", type=Path, help="PDFs a medir (por defecto data/uploads)")
+    args = parser.parse_args(argv)
+
+    # Los ficheros se guardan en subdirectorios por hash; los .upload-*.part
+    # son subidas a medio escribir
+    paths = args.pdfs or sorted(
+        path for path in UPLOADS_DIR.rglob("*.pdf") if not path.name.startswith(".upload-")
+    )
+    totals: Dict[str, List[float]] = {}
+
+    print(f"{'file':40} {'mode':12} {'pages':>5} {'sec':>8} {'pages/s':>8} {'f1':>6}")
+    for path in paths:
+        results = benchmark_file(path)
+        if not results:
+            continue
+        for mode, (pages, elapsed, f1) in results.items():
+            rate = pages / elapsed if elapsed else 0.0
+            print(f"{path.name[:40]:40} {mode:12} {pages:5d} {elapsed:8.3f} {rate:8.1f} {f1:6.3f}")
+            acc = totals.setdefault(mode, [0, 0.0, 0.0, 0])
+            acc[0] += pages
+            acc[1] += elapsed
+            acc[2] += f1
+            acc[3] += 1
+
+    print()
+    for mode, (pages, elapsed, f1_sum, files) in totals.items():
+        rate = pages / elapsed if elapsed else 0.0
+        print(f"{'TOTAL':40} {mode:12} {int(pages):5d} {elapsed:8.3f} {rate:8.1f} {f1_sum / files:6.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
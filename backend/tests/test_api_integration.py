@@ -3,6 +3,7 @@ from fastapi.testclient import TestClient
 from app.main import app
 from app.models import User, Article, UserLibrary
 from app.core.security import get_password_hash
+from app.services.file_storage import ContentAddressedStore
 
 client = TestClient(app)
 
@@ -99,6 +100,254 @@ class TestArticlesAPI:
         )
         assert response.status_code == 401
 
+    def test_upload_queues_ingestion_job(self, test_client, auth_token, db, monkeypatch, tmp_path):
+        from app.api.routes import articles as articles_routes
+        from app.services.ingestion import get_ingestion_pipeline
+        from tests.conftest import TestingSessionLocal
+
+        pipeline = get_ingestion_pipeline()
+        monkeypatch.setattr(articles_routes, "upload_store", ContentAddressedStore(tmp_path))
+        monkeypatch.setattr(pipeline, "session_factory", TestingSessionLocal)
+        monkeypatch.setattr(pipeline._executor, "submit", lambda fn, *args: fn(*args))
+        headers = {"Authorization": f"Bearer {auth_token}"}
+
+        response = test_client.post(
+            "/api/articles/upload",
+            files={"file": ("notes.txt", "Educación infantil y aprendizaje.".encode(), "text/plain")},
+            headers=headers,
+        )
+        assert response.status_code == 202
+        job = response.json()
+        assert job["status"] == "queued"
+
+        response = test_client.get(f"/api/articles/jobs/{job['id']}", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["status"] == "completed"
+        assert response.json()["stages"]["topics"]["status"] == "completed"
+
+        response = test_client.get(f"/api/articles/{job['article_id']}/text", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["pages"] == [
+            {"page_number": 1, "text": "Educación infantil y aprendizaje."}
+        ]
+
+        article = db.query(Article).filter(Article.id == job["article_id"]).first()
+        assert article.file_path.startswith(str(tmp_path / article.file_hash[:2] / article.file_hash[2:4]))
+
+    def test_upload_rejects_duplicate_before_parsing(self, test_client, auth_token, db, monkeypatch, tmp_path):
+        import hashlib
+        from app.api.routes import articles as articles_routes
+
+        content = b"%PDF-1.4 duplicate"
+        db.add(Article(
+            title="Existing",
+            status="active",
+            file_path="existing.pdf",
+            file_hash=hashlib.sha256(content).hexdigest(),
+        ))
+        db.commit()
+        monkeypatch.setattr(articles_routes, "upload_store", ContentAddressedStore(tmp_path))
+
+        response = test_client.post(
+            "/api/articles/upload",
+            files={"file": ("copy.pdf", content, "application/pdf")},
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+        assert response.status_code == 400
+        assert list(tmp_path.iterdir()) == []
+
+    def test_upload_retries_failed_article(self, test_client, auth_token, db, monkeypatch, tmp_path):
+        import hashlib
+        from app.api.routes import articles as articles_routes
+        from app.services.ingestion import get_ingestion_pipeline
+
+        content = "Educación infantil y aprendizaje.".encode()
+        failed = Article(
+            title="Broken",
+            status="failed",
+            file_path="missing.txt",
+            file_hash=hashlib.sha256(content).hexdigest(),
+        )
+        db.add(failed)
+        db.commit()
+        pipeline = get_ingestion_pipeline()
+        monkeypatch.setattr(articles_routes, "upload_store", ContentAddressedStore(tmp_path))
+        monkeypatch.setattr(pipeline._executor, "submit", lambda fn, *args: None)
+
+        response = test_client.post(
+            "/api/articles/upload",
+            files={"file": ("notes.txt", content, "text/plain")},
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+        assert response.status_code == 202
+        assert response.json()["article_id"] == failed.id
+
+        db.refresh(failed)
+        assert failed.status == "processing"
+        assert failed.title == "notes.txt"
+        assert db.query(Article).count() == 1
+
+    def test_bulk_url_upload_streams_results(self, test_client, auth_token, db, monkeypatch, tmp_path):
+        import json
+        import httpx
+        from app.api.routes import articles as articles_routes
+        from app.services.http_fetcher import HttpFetcher
+        from app.services.ingestion import get_ingestion_pipeline
+        from app.services.pdf_link_resolver import PdfLinkResolver
+        from tests.conftest import TestingSessionLocal
+
+        sessions = []
+
+        def session_factory():
+            sessions.append(TestingSessionLocal())
+            return sessions[-1]
+
+        def handler(request):
+            if request.url.path.endswith(".pdf"):
+                return httpx.Response(200, headers={"Content-Type": "application/pdf"}, content=b"%PDF-1.4 bulk")
+            return httpx.Response(200, headers={"Content-Type": "text/html"}, text="<html>no links</html>")
+
+        fetcher = HttpFetcher()
+        fetcher._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(articles_routes, "get_http_fetcher", lambda: fetcher)
+        resolver = PdfLinkResolver()
+        monkeypatch.setattr(articles_routes, "get_pdf_link_resolver", lambda: resolver)
+        monkeypatch.setattr(articles_routes, "upload_store", ContentAddressedStore(tmp_path))
+        monkeypatch.setattr(get_ingestion_pipeline()._executor, "submit", lambda fn, *args: None)
+        monkeypatch.setattr(articles_routes, "SessionLocal", session_factory)
+
+        response = test_client.post(
+            "/api/articles/upload-urls",
+            json={"urls": ["https://example.org/paper.pdf", "https://example.org/landing"]},
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+        assert response.status_code == 200
+        results = {item["url"]: item for item in map(json.loads, response.text.splitlines())}
+        assert results["https://example.org/paper.pdf"]["success"] is True
+        assert results["https://example.org/paper.pdf"]["job_id"]
+        assert results["https://example.org/landing"]["success"] is False
+        assert results["https://example.org/landing"]["status_code"] == 400
+        # One session per URL: the failed landing page cannot roll back the stored PDF
+        assert len(sessions) == 2
+        assert db.query(Article).filter(Article.id == results["https://example.org/paper.pdf"]["article_id"]).first()
+
+    def test_resumable_upload(self, test_client, auth_token, db, monkeypatch, tmp_path):
+        import hashlib
+        from app.api.routes import articles as articles_routes
+        from app.services.ingestion import get_ingestion_pipeline
+        from app.services.upload_sessions import ResumableUploads
+
+        monkeypatch.setattr(articles_routes, "upload_store", ContentAddressedStore(tmp_path))
+        monkeypatch.setattr(articles_routes, "upload_sessions", ResumableUploads(tmp_path))
+        monkeypatch.setattr(get_ingestion_pipeline()._executor, "submit", lambda fn, *args: None)
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        content = b"%PDF-1.4 " + b"x" * 1000
+
+        response = test_client.post(
+            "/api/articles/uploads", json={"filename": "book.pdf", "size": len(content)}, headers=headers
+        )
+        assert response.status_code == 201
+        session_id = response.json()["id"]
+        url = f"/api/articles/uploads/{session_id}"
+
+        response = test_client.put(
+            url, content=content[:400], headers={**headers, "Content-Range": f"bytes 0-399/{len(content)}"}
+        )
+        assert response.json()["offset"] == 400
+
+        # A body shorter or longer than its Content-Range is rejected and not counted
+        for body in (content[400:410], content[400:500]):
+            response = test_client.put(
+                url, content=body, headers={**headers, "Content-Range": f"bytes 400-449/{len(content)}"}
+            )
+            assert response.status_code == 400
+        assert test_client.get(url, headers=headers).json()["offset"] == 400
+
+        # A retried range that does not start at the offset is rejected with the offset to resume from
+        response = test_client.put(
+            url, content=content[:400], headers={**headers, "Content-Range": f"bytes 0-399/{len(content)}"}
+        )
+        assert response.status_code == 409
+        assert response.headers["Upload-Offset"] == "400"
+
+        assert test_client.post(f"{url}/complete", headers=headers).status_code == 409
+
+        response = test_client.put(
+            url,
+            content=content[400:],
+            headers={**headers, "Content-Range": f"bytes 400-{len(content) - 1}/{len(content)}"},
+        )
+        assert response.json()["offset"] == len(content)
+
+        response = test_client.post(f"{url}/complete", headers=headers)
+        assert response.status_code == 202
+        article = db.query(Article).filter(Article.id == response.json()["article_id"]).first()
+        assert article.file_hash == hashlib.sha256(content).hexdigest()
+        assert test_client.get(url, headers=headers).status_code == 404
+
+    def test_expired_upload_session_is_gone(self, test_client, auth_token, db, monkeypatch, tmp_path):
+        from datetime import datetime, timedelta
+        from app.api.routes import articles as articles_routes
+        from app.models import UploadSession
+        from app.services.upload_sessions import ResumableUploads
+
+        monkeypatch.setattr(articles_routes, "upload_sessions", ResumableUploads(tmp_path))
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        response = test_client.post(
+            "/api/articles/uploads", json={"filename": "book.pdf", "size": 10}, headers=headers
+        )
+        session_id = response.json()["id"]
+        db.query(UploadSession).filter(UploadSession.id == session_id).update(
+            {"expires_at": datetime.utcnow() - timedelta(seconds=1)}
+        )
+        db.commit()
+
+        url = f"/api/articles/uploads/{session_id}"
+        response = test_client.put(url, content=b"0123456789", headers={**headers, "Content-Range": "bytes 0-9/10"})
+        assert response.status_code == 410
+        assert list(tmp_path.glob("*.part")) == []
+        assert test_client.get(url, headers=headers).status_code == 404
+
+    def test_get_ingestion_job_not_found(self, test_client, auth_token):
+        response = test_client.get(
+            "/api/articles/jobs/missing",
+            headers={"Authorization": f"Bearer {auth_token}"}
+        )
+        assert response.status_code == 404
+
+    def test_recover_requeues_interrupted_jobs(self, test_user, db, monkeypatch):
+        from app.models import IngestionJob
+        from app.services.ingestion import IngestionPipeline
+        from tests.conftest import TestingSessionLocal
+
+        interrupted = Article(title="Interrupted", status="processing", uploaded_by=test_user.id)
+        orphan = Article(title="Orphan", status="processing", uploaded_by=test_user.id)
+        db.add_all([interrupted, orphan])
+        db.flush()
+        db.add(IngestionJob(
+            id="interrupted",
+            user_id=test_user.id,
+            article_id=interrupted.id,
+            status="running",
+            stage="metadata",
+            stages={"parse": {"status": "completed"}},
+        ))
+        db.commit()
+
+        pipeline = IngestionPipeline(max_workers=1, session_factory=TestingSessionLocal)
+        submitted = []
+        monkeypatch.setattr(pipeline._executor, "submit", lambda fn, *args: submitted.append(args))
+
+        assert pipeline.recover() == 1
+        assert submitted == [("interrupted",)]
+
+        db.expire_all()
+        job = db.query(IngestionJob).filter(IngestionJob.id == "interrupted").one()
+        assert job.status == "queued"
+        assert job.stages["parse"] == {"status": "pending"}
+        assert db.get(Article, interrupted.id).status == "processing"
+        assert db.get(Article, orphan.id).status == "failed"
+
 
 class TestRecommendationsAPI:
     def test_get_recommendations_no_auth(self, test_client):
@@ -1,12 +1,65 @@
 import pytest
+import asyncio
+import hashlib
+import io
+import json
 import os
 import tempfile
+import time
 from pathlib import Path
+import httpx
+from fastapi import UploadFile
 from app.services.metadata_extractor import MetadataExtractor
 from app.services.classifier import ArticleClassifier
 from app.services.recommender import ArticleRecommender
 from app.services.bibliography_generator import BibliographyGenerator
-from app.models import Article, User, UserLibrary, Category
+from app.services.document_structure_extractor import DocumentStructureExtractor
+from app.services.metadata_scanner import (
+    ABSTRACT_MAX_CHARS,
+    EXCERPT_MAX_CHARS,
+    KEYWORDS_MAX_CHARS,
+    MAX_KEYWORDS,
+    scan_metadata,
+)
+from app.services.parsed_document import ParsedDocument, ParsedDocumentStore, page_ranges
+from app.services.text_extraction import (
+    ExtractionPolicy,
+    TextExtractionBackend,
+    iter_pdf_pages,
+    looks_garbled,
+)
+from app.services.http_fetcher import HttpFetcher
+from app.services.pdf_link_resolver import PdfLinkResolver
+from app.utils.cache import TTLCache
+from app.services.file_storage import (
+    ContentAddressedStore,
+    FileTooLargeError,
+    StagedUpload,
+    stage_upload,
+)
+from app.services.article_text_store import ArticleTextStore, compress_text, decompress_text
+from app.services.section_index import SectionIndex
+from app.services.near_duplicates import NearDuplicateIndex
+from app.services.summarizer import ArticleSummarizer
+from app.services.chunked_summarizer import ChunkedSummarizer
+from app.services.llm_client import LLMClient, LLMError
+from app.services.text_chunker import TextChunker
+from app.services.token_estimator import estimate_tokens, tail_tokens, truncate_to_tokens
+from app.services.llm_scheduler import (
+    AdaptiveConcurrency,
+    CircuitBreaker,
+    CircuitOpenError,
+    LLMScheduler,
+    TokenBucket,
+)
+from app.services.summary_cache import (
+    SummaryCache,
+    SummaryKey,
+    get_chunk_summary_cache,
+    get_summary_cache,
+)
+from app.services.upload_sessions import parse_content_range
+from app.models import Article, User, UserLibrary, Category, StoredFile
 from sqlalchemy.orm import Session
 
 
@@ -42,6 +95,1207 @@ class TestMetadataExtractor:
         assert result["authors"] == []
         assert result["abstract"] is None
 
+    def test_extract_from_parsed_document(self):
+        document = ParsedDocument(
+            file_hash="abc",
+            pages=[[
+                "A Study of Play in Early Childhood",
+                "doi: 10.1234/play.2021",
+                "Abstract: Play supports cognitive development in children.",
+                "",
+                "Keywords: play; childhood; learning",
+                "Introduction",
+            ]],
+            metadata={"Author": "Ana Pérez, Juan Gómez"},
+        )
+        result = MetadataExtractor.extract_from_pdf("/unused.pdf", document=document)
+        assert result["title"] == "A Study of Play in Early Childhood"
+        assert result["authors"] == ["Ana Pérez", "Juan Gómez"]
+        assert result["doi"] == "10.1234/play.2021"
+        assert result["publication_year"] == 2021
+        assert result["keywords"] == ["play", "childhood", "learning"]
+
+
+class TestMetadataScanner:
+    ADVERSARIAL = {
+        # Marcadores repetidos sin ningún cierre: cuadrático con (.*?) + lookahead
+        "markers": lambda n: [["abstract keywords resumen " * (n // 26)]],
+        "lines_without_blank": lambda n: [["Abstract: play keywords music, art"] * (n // 36)],
+        "doi_whitespace": lambda n: [["doi:" + " " * n + "10.1234/x"]],
+        "digits": lambda n: [["10." + "1" * n]],
+    }
+
+    @staticmethod
+    def _scan_seconds(pages) -> float:
+        document = ParsedDocument(file_hash="x", pages=pages)
+        best = float("inf")
+        for _ in range(3):
+            start = time.perf_counter()
+            scan_metadata(document.iter_lines())
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    def test_fields_in_one_pass(self):
+        lines = [
+            "El juego en el desarrollo infantil",
+            "Revista de Educación, 2019",
+            "DOI:",
+            "10.5555/juego.2019",
+            "Resumen",
+            "",
+            "El juego favorece el desarrollo",
+            "cognitivo de los niños.",
+            "Palabras clave: juego; infancia, música",
+            "",
+            "1. Introducción",
+        ]
+        result = scan_metadata((1, line) for line in lines)
+        assert result["title"] == "El juego en el desarrollo infantil"
+        assert result["doi"] == "10.5555/juego.2019"
+        assert result["publication_year"] == 2019
+        assert result["abstract"] == "El juego favorece el desarrollo cognitivo de los niños."
+        assert result["keywords"] == ["juego", "infancia", "música"]
+
+    def test_unterminated_abstract_is_discarded(self):
+        result = scan_metadata((1, line) for line in ["Abstract: a b c", "more text"])
+        assert result["abstract"] is None
+
+    def test_fallback_abstract_end(self):
+        lines = ["Abstract: Play matters.", "Objective: measure it"]
+        assert scan_metadata((1, line) for line in lines)["abstract"] == "Play matters."
+
+    def test_fields_continue_across_page_breaks(self):
+        pages = [
+            ["A Study of Play in Early Childhood", "Abstract: Play matters"],
+            ["a lot for children.", "Keywords: play; early", "childhood; music"],
+            ["", "Introduction"],
+        ]
+        result = scan_metadata(ParsedDocument(file_hash="x", pages=pages).iter_lines())
+        assert result["abstract"] == "Play matters a lot for children."
+        # Las líneas de un campo se unen con un espacio
+        assert result["keywords"] == ["play", "early childhood", "music"]
+
+    def test_empty_abstract_before_keywords_on_next_page(self):
+        pages = [
+            ["A Study of Play in Early Childhood", "Abstract:"],
+            ["Keywords: play; music", "", "Introduction"],
+        ]
+        result = scan_metadata(ParsedDocument(file_hash="x", pages=pages).iter_lines())
+        # La línea de palabras clave no se toma como resumen
+        assert result["abstract"] is None
+        assert result["keywords"] == ["play", "music"]
+
+    def test_only_first_pages(self):
+        pages = [["filler"]] * 5 + [["Keywords: late", ""]]
+        document = ParsedDocument(file_hash="x", pages=pages + [["x"]])
+        assert scan_metadata(document.iter_lines())["keywords"] == []
+
+    def test_fuzz_respects_field_limits(self):
+        import random
+
+        tokens = [
+            "Abstract", "Resumen:", "Keywords:", "Key words", "Palabras clave", "Introduction",
+            "1.", "Methods", "Objective:", "doi:", "DOI: ", "10.12345/abc", "2021", "a, b; c",
+            "juego", "\n", "\n", "\n\n", " ", "x" * 5000,
+        ]
+        rng = random.Random(7)
+        for _ in range(300):
+            text = " ".join(rng.choice(tokens) for _ in range(rng.randint(1, 200)))
+            pages = [page.split("\n") for page in text.split("2021")]
+            result = scan_metadata(ParsedDocument(file_hash="x", pages=pages).iter_lines())
+            assert result["abstract"] is None or len(result["abstract"]) <= ABSTRACT_MAX_CHARS
+            assert len(result["keywords"]) <= MAX_KEYWORDS
+            assert all(len(k) <= KEYWORDS_MAX_CHARS for k in result["keywords"])
+            assert result["text_excerpt"] is None or len(result["text_excerpt"]) <= EXCERPT_MAX_CHARS
+            assert result["title"] is None or len(result["title"]) < 200
+
+    @pytest.mark.parametrize("case", sorted(ADVERSARIAL))
+    def test_linear_time_on_adversarial_input(self, case):
+        build = self.ADVERSARIAL[case]
+        small = self._scan_seconds(build(250_000))
+        large = self._scan_seconds(build(1_000_000))
+        # 4x input: lineal ~4x, cuadrático ~16x; margen para ruido del runner
+        assert large < 2.0
+        assert large < max(small, 0.005) * 8
+
+
+class TestParsedDocumentStore:
+    def _document(self) -> ParsedDocument:
+        return ParsedDocument(
+            file_hash="f" * 64,
+            pages=[["Page one", "second line"], [], ["Page three"]],
+            metadata={"Title": "Stored"},
+        )
+
+    def test_text_skips_empty_pages(self):
+        document = self._document()
+        assert document.page_count == 3
+        assert document.text() == "Page one\nsecond line\nPage three"
+        assert document.text(max_pages=1) == "Page one\nsecond line"
+        assert list(document.iter_pages()) == [(1, "Page one\nsecond line"), (3, "Page three")]
+
+    def test_save_and_load_roundtrip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            ParsedDocumentStore(Path(tmp)).save(self._document())
+
+            loaded = ParsedDocumentStore(Path(tmp)).load("f" * 64)
+            assert loaded is not None
+            assert loaded.pages == self._document().pages
+            assert loaded.metadata == {"Title": "Stored"}
+
+    def test_get_uses_artifact_without_parsing(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = ParsedDocumentStore(Path(tmp))
+            store.save(self._document())
+            # The file does not exist: a cache miss would fail to open it
+            document = store.get("/nonexistent/file.pdf", file_hash="f" * 64)
+            assert document.page_text(3) == "Page three"
+
+    def test_delete_removes_artifact(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = ParsedDocumentStore(Path(tmp))
+            store.save(self._document())
+            store.delete("f" * 64)
+            assert store.load("f" * 64) is None
+
+    def test_iter_pdf_pages_releases_each_page(self):
+        class FakePage:
+            def __init__(self, text):
+                self.text = text
+                self.closed = False
+
+            def extract_text(self):
+                assert not self.closed
+                return self.text
+
+            def close(self):
+                self.closed = True
+
+        class FakePdf:
+            pages = [FakePage("a\nb"), FakePage(None)]
+
+        pages = iter_pdf_pages(FakePdf())
+        assert next(pages) == (1, ["a", "b"])
+        assert FakePdf.pages[0].closed and not FakePdf.pages[1].closed
+        assert list(pages) == [(2, [])]
+        assert FakePdf.pages[1].closed
+
+    def test_parallel_extraction_matches_sequential(self, tmp_path, monkeypatch):
+        from benchmarks.synthetic_pdf import document_lines, write_pdf
+        from app.services import parsed_document
+
+        path = str(write_pdf(tmp_path / "paper.pdf", document_lines(pages=6, seed=1)))
+        policy = ExtractionPolicy(metadata_pages=1)
+        sequential = parsed_document.parse_pdf(path, "a" * 64, policy=policy)
+
+        monkeypatch.setattr(parsed_document, "_extraction_pool", None)
+        try:
+            parallel = parsed_document.parse_pdf(
+                path, "a" * 64, parallel_min_pages=2, processes=2, policy=policy
+            )
+            assert parsed_document._extraction_pool is not None
+        finally:
+            if parsed_document._extraction_pool is not None:
+                parsed_document._extraction_pool.shutdown()
+
+        assert parallel.page_count == 6 and all(parallel.pages)
+        assert parallel.pages == sequential.pages
+
+    def test_broken_pool_falls_back_to_sequential(self, tmp_path, monkeypatch):
+        from concurrent.futures import Future
+        from concurrent.futures.process import BrokenProcessPool
+        from benchmarks.synthetic_pdf import document_lines, write_pdf
+        from app.services import parsed_document
+        from app.services.text_extraction import get_backend
+
+        class BrokenPool:
+            shut_down = False
+
+            def submit(self, *args):
+                future = Future()
+                future.set_exception(BrokenProcessPool("worker died"))
+                return future
+
+            def shutdown(self, wait=True, cancel_futures=False):
+                self.shut_down = True
+
+        path = str(write_pdf(tmp_path / "paper.pdf", document_lines(pages=4, seed=2)))
+        backend = get_backend("pypdf")
+        pool = BrokenPool()
+        monkeypatch.setattr(parsed_document, "_extraction_pool", pool)
+
+        pages = parsed_document._extract_pages(path, backend, 0, 4, parallel_min_pages=2, processes=2)
+        assert pages == backend.extract_pages(path, 0, 4)
+        # El pool roto se descarta: la siguiente extracción crea uno nuevo
+        assert pool.shut_down
+        assert parsed_document._extraction_pool is None
+
+    def test_page_ranges_cover_document_in_order(self):
+        assert page_ranges(10, 3) == [(0, 4), (4, 7), (7, 10)]
+        assert page_ranges(2, 8) == [(0, 1), (1, 2)]
+        ranges = page_ranges(501, 16)
+        assert ranges[0][0] == 0 and ranges[-1][1] == 501
+        assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+
+
+class TestExtractionPolicy:
+    def test_auto_uses_pdfplumber_for_head_and_pypdf_for_body(self):
+        policy = ExtractionPolicy(metadata_pages=2)
+        assert policy.head_page_count(10) == 2
+        assert policy.head_page_count(1) == 1
+        assert policy.body_backend().name == "pypdf"
+
+    def test_fixed_backend_for_whole_document(self):
+        policy = ExtractionPolicy(backend="pdfplumber")
+        assert policy.head_page_count(10) == 0
+        assert policy.body_backend().name == "pdfplumber"
+        assert policy.accept_body([[]])
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            ExtractionPolicy(backend="ocr")
+
+    def test_backends_must_implement_extract_pages(self):
+        class Incomplete(TextExtractionBackend):
+            name = "incomplete"
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+    def test_rejects_garbled_body(self):
+        policy = ExtractionPolicy()
+        prose = ["El juego es una actividad central en el desarrollo infantil."]
+        assert policy.accept_body([prose, prose])
+        assert not policy.accept_body([prose, []] + [[]] * 4)
+        assert looks_garbled([["\x01\x02 ## 12 34 ?? !! %% && ** ((" * 3]])
+
+
+class TestDocumentStructureExtractor:
+    def test_extract_from_document(self):
+        body = "Contenido de la sección con suficiente texto para superar el umbral mínimo. " * 3
+        document = ParsedDocument(
+            file_hash="abc",
+            pages=[
+                ["Resumen", body],
+                ["1. Introducción", body],
+                ["Conclusiones", body, "Referencias", "Autor, A. (2020)."],
+            ],
+        )
+        sections = DocumentStructureExtractor().extract_from_document(document)
+        assert list(sections) == ["abstract", "introduction", "conclusions"]
+        assert sections["introduction"] == body.strip()
+
+    def test_extract_from_lines_consumes_generator_once(self):
+        body = "Texto de metodología suficientemente largo para contar como sección. " * 3
+        consumed = []
+
+        def lines():
+            for item in [(1, "Preámbulo"), (1, "Methods"), (2, body), (2, "  "), (3, "Results"), (3, body)]:
+                consumed.append(item)
+                yield item
+
+        sections = DocumentStructureExtractor().extract_from_lines(lines())
+        assert len(consumed) == 6
+        assert sections == {"methodology": body.strip(), "results": body.strip()}
+
+    def test_combined_heading_pattern(self):
+        extractor = DocumentStructureExtractor()
+        found = {}
+        assert extractor._match_section_heading("2. Marco Teórico", found) == "literature_review"
+        assert extractor._match_section_heading("Materials and Methods", found) == "methodology"
+        assert extractor._match_section_heading("Results and Discussion", found) == "discussion"
+        assert extractor._match_section_heading("BIBLIOGRAFÍA", found) == "references"
+        assert extractor._match_section_heading("Results of the survey", found) is None
+        found["abstract"] = None
+        assert extractor._match_section_heading("Resumen", found) is None
+
+    def test_extract_spans_records_boundaries(self):
+        body = "Contenido de la sección con suficiente texto para superar el umbral mínimo. " * 3
+        lines = [(1, "Título"), (1, "Abstract"), (1, body), (2, "Introduction"), (2, body), (2, "fin")]
+        full_text = "\n".join(line for _, line in lines)
+
+        spans = DocumentStructureExtractor().extract_spans(iter(lines))
+        abstract, introduction = spans
+        assert (abstract.start_page, abstract.start_line) == (1, 1)
+        assert (abstract.end_page, abstract.end_line) == (2, 0)
+        assert (introduction.end_page, introduction.end_line) == (2, 3)
+        assert full_text[abstract.char_start:abstract.char_end] == body
+        assert full_text[introduction.char_start:introduction.char_end] == body + "\nfin"
+
+
+class TestStageUpload:
+    async def test_hashes_while_streaming(self, tmp_path):
+        content = b"%PDF-1.4 " + os.urandom(3000)
+        upload = UploadFile(file=io.BytesIO(content), filename="paper.pdf")
+
+        staged = await stage_upload(upload, tmp_path, max_bytes=10_000, chunk_size=1024)
+
+        assert staged.size == len(content)
+        assert staged.file_hash == hashlib.sha256(content).hexdigest()
+        assert staged.path.read_bytes() == content
+
+    async def test_rejects_oversized_upload(self, tmp_path):
+        upload = UploadFile(file=io.BytesIO(b"x" * 5000), filename="big.pdf")
+
+        with pytest.raises(FileTooLargeError):
+            await stage_upload(upload, tmp_path, max_bytes=4096, chunk_size=1024)
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestParseContentRange:
+    def test_valid_range(self):
+        assert parse_content_range("bytes 0-1023/4096") == (0, 1023, 4096)
+
+    @pytest.mark.parametrize("header", [None, "bytes */4096", "bytes 10-5/4096", "bytes 0-4096/4096"])
+    def test_invalid_range(self, header):
+        with pytest.raises(ValueError):
+            parse_content_range(header)
+
+
+class TestHttpFetcher:
+    def _fetcher(self, handler) -> HttpFetcher:
+        fetcher = HttpFetcher(per_host_limit=1)
+        fetcher._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return fetcher
+
+    async def test_returns_html_for_landing_pages(self, tmp_path):
+        fetcher = self._fetcher(lambda request: httpx.Response(
+            200, headers={"Content-Type": "text/html; charset=utf-8"}, text="<html>ok</html>"
+        ))
+        result = await fetcher.fetch("https://example.org/paper", tmp_path, max_bytes=1024)
+        assert result.is_html
+        assert result.html == "<html>ok</html>"
+        assert list(tmp_path.iterdir()) == []
+
+    async def test_streams_pdf_to_disk(self, tmp_path):
+        content = b"%PDF-1.4 " + b"0" * 4000
+        fetcher = self._fetcher(lambda request: httpx.Response(
+            200, headers={"Content-Type": "application/pdf"}, content=content
+        ))
+        result = await fetcher.fetch("https://example.org/paper.pdf", tmp_path, max_bytes=10_000)
+        assert result.staged.file_hash == hashlib.sha256(content).hexdigest()
+        assert result.staged.path.read_bytes() == content
+
+    async def test_spaces_requests_to_same_host(self, tmp_path):
+        fetcher = self._fetcher(lambda request: httpx.Response(
+            200, headers={"Content-Type": "text/html"}, text="<html></html>"
+        ))
+        fetcher.min_host_interval = 0.2
+
+        started = time.monotonic()
+        await asyncio.gather(*[
+            fetcher.fetch(f"https://example.org/{i}", tmp_path, max_bytes=1024) for i in range(3)
+        ])
+        assert time.monotonic() - started >= 0.4
+
+    async def test_aborts_oversized_download(self, tmp_path):
+        fetcher = self._fetcher(lambda request: httpx.Response(
+            200, headers={"Content-Type": "application/pdf"}, content=b"x" * 5000
+        ))
+        with pytest.raises(FileTooLargeError):
+            await fetcher.fetch("https://example.org/big.pdf", tmp_path, max_bytes=1000)
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestPdfLinkResolver:
+    def test_prefers_citation_meta_over_earlier_links(self):
+        html = """
+        <html><body>
+          <a href="/files/other.pdf">Other</a>
+          <a class="btn download-pdf" href="/download/42">Download</a>
+          <meta name="citation_pdf_url" content="https://journal.org/article/42.pdf">
+        </body></html>
+        """
+        url = PdfLinkResolver().resolve(html, "https://journal.org/article/42")
+        assert url == "https://journal.org/article/42.pdf"
+
+    def test_falls_back_through_tiers(self):
+        html = """
+        <a href="/about">About</a>
+        <a title="Get PDF" href="/get/7">Get it</a>
+        <a href="/view/pdf/7">View</a>
+        """
+        url = PdfLinkResolver().resolve(html, "https://journal.org/article/7")
+        assert url == "https://journal.org/view/pdf/7"
+
+    def test_multi_class_download_link(self):
+        html = '<a class="btn pdf-download" href="/d/9">PDF</a><a href="/x.pdf">x</a>'
+        url = PdfLinkResolver().resolve(html, "https://journal.org/a/9")
+        assert url == "https://journal.org/d/9"
+
+    def test_site_specific_patterns(self):
+        resolver = PdfLinkResolver()
+        scholar = '<div class="gs_ggsW"><a href="https://host.org/p.pdf">host.org</a></div>'
+        assert resolver.resolve(scholar, "https://scholar.google.com/scholar?q=x") == "https://host.org/p.pdf"
+        assert (
+            resolver.resolve("", "https://arxiv.org/abs/2101.00001")
+            == "https://arxiv.org/pdf/2101.00001.pdf"
+        )
+
+    def test_caches_results_by_landing_url(self):
+        resolver = PdfLinkResolver()
+        html = '<a href="/paper.pdf">paper</a>'
+        assert resolver.lookup("https://journal.org/a") is None
+        resolver.resolve(html, "https://journal.org/a/final", cache_key="https://journal.org/a")
+        assert resolver.lookup("https://journal.org/a") == "https://journal.org/paper.pdf"
+        # Negative results are cached too
+        assert resolver.resolve("<html></html>", "https://journal.org/b") is None
+        assert resolver.cache.lookup("https://journal.org/b") == (True, None)
+
+
+class TestTTLCache:
+    def test_expires_entries(self):
+        cache = TTLCache(ttl_seconds=0.05)
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        time.sleep(0.1)
+        assert cache.lookup("a") == (False, None)
+
+    def test_evicts_least_recently_used(self):
+        cache = TTLCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert len(cache) == 2
+
+
+class TestContentAddressedStore:
+    def _stage(self, directory: Path, content: bytes) -> StagedUpload:
+        path = directory / f"{len(list(directory.iterdir()))}.part"
+        path.write_bytes(content)
+        return StagedUpload(path=path, file_hash=hashlib.sha256(content).hexdigest(), size=len(content))
+
+    def test_sharded_path(self, tmp_path):
+        store = ContentAddressedStore(tmp_path)
+        file_hash = "abcdef" + "0" * 58
+        assert store.path_for(file_hash, "PDF") == tmp_path / "ab" / "cd" / f"{file_hash}.pdf"
+
+    def test_acquire_is_idempotent_per_hash(self, db: Session, tmp_path):
+        store = ContentAddressedStore(tmp_path / "store")
+        staging = tmp_path / "staging"
+        staging.mkdir()
+
+        first = store.acquire(db, self._stage(staging, b"same pdf"), "pdf")
+        second = store.acquire(db, self._stage(staging, b"same pdf"), "pdf")
+        db.commit()
+
+        assert first is second
+        assert list(staging.iterdir()) == []
+        assert db.query(StoredFile).count() == 1
+
+    def test_release_keeps_file_until_unlinked_after_commit(self, db: Session, tmp_path):
+        store = ContentAddressedStore(tmp_path / "store")
+        staging = tmp_path / "staging"
+        staging.mkdir()
+        stored = store.acquire(db, self._stage(staging, b"pdf"), "pdf")
+        db.commit()
+
+        path = store.release(db, stored.file_hash)
+        assert path == Path(stored.path)
+        db.rollback()
+        assert path.exists()
+        assert db.query(StoredFile).count() == 1
+
+        path = store.release(db, stored.file_hash)
+        db.commit()
+        assert path.exists()
+        store.unlink(path)
+        assert not path.exists()
+        assert db.query(StoredFile).count() == 0
+
+    def test_release_unknown_hash(self, db: Session, tmp_path):
+        assert ContentAddressedStore(tmp_path).release(db, "missing") is None
+
+
+class TestArticleTextStore:
+    def test_compression_roundtrip(self):
+        text = "Educación musical y desarrollo infantil. " * 200
+        data = compress_text(text)
+        assert len(data) < len(text.encode("utf-8")) // 10
+        assert decompress_text(data) == text
+
+    def test_page_range(self, db: Session):
+        article = Article(title="Paged", status="active")
+        db.add(article)
+        db.commit()
+
+        store = ArticleTextStore()
+        store.save_pages(db, article.id, ["uno", "", "tres", "cuatro"])
+        db.commit()
+
+        assert store.page_count(db, article.id) == 4
+        assert store.get_pages(db, article.id, 2, 3) == [(2, ""), (3, "tres")]
+        assert store.get_text(db, article, max_pages=3) == "uno\ntres"
+
+
+class TestSectionIndex:
+    def test_indexes_stored_text_once(self, db: Session):
+        body = "Contenido de la sección con suficiente texto para superar el umbral mínimo. " * 3
+        article = Article(title="Indexed", status="active", file_path="/nonexistent/a.pdf")
+        db.add(article)
+        db.commit()
+        ArticleTextStore().save_pages(db, article.id, [f"Resumen\n{body}", f"Conclusiones\n{body}"])
+        db.commit()
+
+        index = SectionIndex()
+        assert list(index.get_sections(db, article)) == ["abstract", "conclusions"]
+        section = index.get_section(db, article.id, "conclusions")
+        assert (section.start_page, section.position) == (2, 1)
+        assert index.ensure(db, article) == 2
+
+    def test_article_without_sections_is_indexed_once(self, db: Session, monkeypatch):
+        article = Article(title="Plain", status="active", file_path="/nonexistent/b.pdf")
+        db.add(article)
+        db.commit()
+        ArticleTextStore().save_pages(db, article.id, ["Texto corrido sin títulos de sección."])
+        db.commit()
+
+        index = SectionIndex()
+        calls = []
+        extract_spans = index.extractor.extract_spans
+        monkeypatch.setattr(
+            index.extractor, "extract_spans", lambda lines: calls.append(1) or extract_spans(lines)
+        )
+        assert index.get_sections(db, article) == {}
+        assert index.ensure(db, article) == 0
+        assert len(calls) == 1
+        assert article.sections_indexed_at is not None
+
+
+class TestLLMClient:
+    @staticmethod
+    def _client(handler, scheduler=None):
+        return LLMClient(
+            base_url="https://llm.test/v1",
+            scheduler=scheduler or LLMScheduler(max_retries=0),
+            transport=httpx.MockTransport(handler),
+        )
+
+    def test_chat_reuses_pooled_client(self):
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return httpx.Response(200, json={"choices": [{"message": {"content": " Resumen "}}]})
+
+        client = self._client(handler)
+        messages = [{"role": "user", "content": "hola"}]
+        assert client.chat("key", "model", messages, max_tokens=10) == "Resumen"
+        assert client.chat("key", "model", messages, max_tokens=10) == "Resumen"
+        assert str(seen[0].url) == "https://llm.test/v1/chat/completions"
+        assert seen[0].headers["Authorization"] == "Bearer key"
+        assert json.loads(seen[0].content)["max_tokens"] == 10
+
+    def test_errors_raise_llm_error(self):
+        client = self._client(lambda request: httpx.Response(429, json={}))
+        with pytest.raises(LLMError):
+            client.chat("key", "model", [], max_tokens=10)
+
+        client = self._client(lambda request: httpx.Response(200, json={"choices": []}))
+        with pytest.raises(LLMError):
+            client.chat("key", "model", [], max_tokens=10)
+
+    async def test_async_chat(self):
+        client = self._client(
+            lambda request: httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]})
+        )
+        assert await client.achat("key", "model", [], max_tokens=10) == "ok"
+        await client.aclose()
+
+    def test_retries_rate_limit_honoring_retry_after(self, monkeypatch):
+        sleeps = []
+        monkeypatch.setattr("app.services.llm_scheduler.time.sleep", sleeps.append)
+        responses = [
+            httpx.Response(429, headers={"Retry-After": "2"}, json={}),
+            httpx.Response(503, json={}),
+            httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]}),
+        ]
+        scheduler = LLMScheduler(max_retries=3, backoff_base=0.5, max_concurrency=4)
+        client = self._client(lambda request: responses.pop(0), scheduler)
+
+        assert client.chat("key", "model", [], max_tokens=10) == "ok"
+        assert scheduler.retries == 2
+        # Retry-After es el mínimo de la primera espera (más jitter ≤ 0.5 s)
+        waits = [s for s in sleeps if s > 0]
+        assert 2.0 <= waits[0] <= 2.5
+        assert scheduler.concurrency.limit < 4
+
+    def test_stream_chat_yields_deltas(self):
+        events = [
+            {"choices": [{"delta": {"role": "assistant"}}]},
+            {"choices": [{"delta": {"content": "Hola"}}]},
+            {"choices": [{"delta": {"content": " mundo"}}]},
+        ]
+        body = "".join(f"data: {json.dumps(event)}\n\n" for event in events) + "data: [DONE]\n\n"
+        seen = []
+
+        def handler(request):
+            seen.append(json.loads(request.content))
+            return httpx.Response(200, text=body, headers={"Content-Type": "text/event-stream"})
+
+        client = self._client(handler)
+        pieces = list(client.stream_chat("key", "model", [], max_tokens=10))
+        assert pieces == ["Hola", " mundo"]
+        assert seen[0]["stream"] is True
+
+    def test_stream_retries_only_before_first_token(self, monkeypatch):
+        monkeypatch.setattr("app.services.llm_scheduler.time.sleep", lambda seconds: None)
+        scheduler = LLMScheduler(max_retries=3, backoff_base=0.01)
+        attempts = []
+
+        def flaky():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise LLMError("overloaded", retryable=True)
+            yield "parte"
+            raise LLMError("connection reset", retryable=True)
+
+        stream = scheduler.stream(flaky, tokens=10)
+        assert next(stream) == "parte"
+        with pytest.raises(LLMError):
+            next(stream)
+        assert len(attempts) == 2
+        assert scheduler.concurrency.in_flight == 0
+
+    def test_reservation_is_bounded_and_settled(self):
+        now = [0.0]
+        scheduler = LLMScheduler(max_retries=0, tokens_per_minute=12000, clock=lambda: now[0])
+        reserved = []
+        reserve = scheduler.tokens.reserve
+        scheduler.tokens.reserve = lambda amount: reserved.append(amount) or reserve(amount)
+
+        def handler(request):
+            usage = {"total_tokens": 3000}
+            return httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}], "usage": usage})
+
+        client = self._client(handler, scheduler)
+        messages = [{"role": "user", "content": "hola"}]
+        # Un resumen exhaustivo pide 16000 tokens de salida: no se reserva la cuota entera
+        assert client.chat("key", "model", messages, max_tokens=16000) == "ok"
+        assert reserved == [1 + client.output_reserve_tokens]
+        # Se cobra lo usado de verdad, aunque supere la reserva
+        assert scheduler.tokens.reserve(9000) == 0.0
+        assert scheduler.tokens.reserve(1) > 0
+
+    def test_client_errors_are_not_retried(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(400, json={})
+
+        client = self._client(handler, LLMScheduler(max_retries=3))
+        with pytest.raises(LLMError) as info:
+            client.chat("key", "model", [], max_tokens=10)
+        assert not info.value.retryable
+        assert len(calls) == 1
+
+
+class TestLLMScheduler:
+    def test_token_bucket_waits_for_refill(self):
+        now = [0.0]
+        bucket = TokenBucket(60, clock=lambda: now[0])
+        assert bucket.reserve(60) == 0.0
+        # Sin saldo: 1 token/s
+        assert bucket.reserve(3) == pytest.approx(3.0)
+        now[0] = 10.0
+        assert bucket.reserve(5) == 0.0
+        assert TokenBucket(0).reserve(10 ** 6) == 0.0
+
+    def test_stream_settles_to_received_text(self):
+        now = [0.0]
+        scheduler = LLMScheduler(max_retries=0, tokens_per_minute=600, clock=lambda: now[0])
+        assert list(scheduler.stream(lambda: iter(["uno", " dos"]), tokens=500, prompt_tokens=100)) == [
+            "uno",
+            " dos",
+        ]
+        assert scheduler.tokens.reserve(498) == 0.0
+        assert scheduler.tokens.reserve(1) > 0
+
+    def test_settings_require_largest_call_within_token_quota(self):
+        from app.core.config import Settings
+
+        with pytest.raises(ValueError, match="LLM_TOKENS_PER_MINUTE"):
+            Settings(llm_tokens_per_minute=6000, summary_reduce_tokens=6000, llm_output_reserve_tokens=2000)
+        assert Settings(llm_tokens_per_minute=0, summary_reduce_tokens=6000).llm_tokens_per_minute == 0
+        assert Settings(llm_tokens_per_minute=8000, summary_reduce_tokens=6000, llm_output_reserve_tokens=2000)
+
+    def test_adaptive_concurrency_halves_and_grows(self):
+        limit = AdaptiveConcurrency(8)
+        limit.decrease()
+        limit.decrease()
+        assert int(limit.limit) == 2
+        for _ in range(4):
+            limit.increase()
+        assert int(limit.limit) == 3
+        assert limit.try_acquire() and limit.try_acquire() and limit.try_acquire()
+        assert not limit.try_acquire()
+
+    def test_circuit_breaker_opens_and_half_opens(self):
+        now = [0.0]
+        scheduler = LLMScheduler(
+            max_retries=0, failure_threshold=2, reset_timeout=30, clock=lambda: now[0]
+        )
+
+        def failing():
+            raise LLMError("server error", retryable=True)
+
+        for _ in range(2):
+            with pytest.raises(LLMError):
+                scheduler.call(failing, tokens=1)
+        assert scheduler.breaker.state == CircuitBreaker.OPEN
+        with pytest.raises(CircuitOpenError):
+            scheduler.call(lambda: ("ok", None), tokens=1)
+
+        now[0] = 31.0
+        assert scheduler.call(lambda: ("ok", None), tokens=1) == "ok"
+        assert scheduler.breaker.state == CircuitBreaker.CLOSED
+
+    def test_stream_article_emits_tokens_and_done(self, monkeypatch):
+        summarizer = ArticleSummarizer(groq_api_key="key")
+        monkeypatch.setattr(
+            summarizer, "_stream_with_groq", lambda text, level="detailed": iter(["Uno ", "dos"])
+        )
+        article = Article(title="Suelos", abstract="Estudio de suelos agrícolas. " * 5)
+
+        events = list(summarizer.stream_article(article, method="auto", use_structure_extraction=False))
+        assert events == [
+            ("token", {"text": "Uno "}),
+            ("token", {"text": "dos"}),
+            ("done", {"method": "groq", "cached": False}),
+        ]
+
+    def test_abandoned_probe_stream_releases_breaker_and_slot(self):
+        now = [0.0]
+        scheduler = LLMScheduler(
+            max_retries=0,
+            max_concurrency=1,
+            tokens_per_minute=600,
+            failure_threshold=1,
+            reset_timeout=30,
+            clock=lambda: now[0],
+        )
+
+        def failing():
+            raise LLMError("server error", retryable=True)
+
+        with pytest.raises(LLMError):
+            scheduler.call(failing, tokens=1)
+        assert scheduler.breaker.state == CircuitBreaker.OPEN
+
+        closed = []
+
+        def pieces():
+            try:
+                yield "uno"
+                yield "dos"
+            finally:
+                closed.append(True)
+
+        # La llamada de prueba es un stream que el cliente abandona a medias
+        now[0] = 31.0
+        stream = scheduler.stream(pieces, tokens=100)
+        assert next(stream) == "uno"
+        stream.close()
+        assert closed == [True]
+        assert scheduler.concurrency.in_flight == 0
+        assert scheduler.breaker.state == CircuitBreaker.CLOSED
+        assert scheduler.call(lambda: ("ok", None), tokens=1) == "ok"
+
+        # Interrumpida antes del primer fragmento: se liberan la prueba y la reserva
+        with pytest.raises(LLMError):
+            scheduler.call(failing, tokens=1)
+        now[0] = 100.0
+
+        def interrupted():
+            raise KeyboardInterrupt
+            yield  # pragma: no cover
+
+        with pytest.raises(KeyboardInterrupt):
+            next(scheduler.stream(interrupted, tokens=100))
+        assert scheduler.breaker.state == CircuitBreaker.HALF_OPEN
+        assert scheduler.tokens.reserve(600) == 0.0
+        assert scheduler.call(lambda: ("ok", None), tokens=1) == "ok"
+
+    def test_rate_limited_probe_reopens_breaker(self):
+        now = [0.0]
+        scheduler = LLMScheduler(
+            max_retries=3,
+            backoff_base=0,
+            failure_threshold=1,
+            reset_timeout=30,
+            clock=lambda: now[0],
+        )
+
+        def server_error():
+            raise LLMError("server error", retryable=True)
+
+        def rate_limited():
+            raise LLMError("rate limited", retryable=True, rate_limited=True)
+
+        with pytest.raises(LLMError):
+            scheduler.call(server_error, tokens=1)
+
+        # La prueba recibe un 429: se reabre en vez de quedarse semiabierto
+        now[0] = 31.0
+        with pytest.raises(LLMError) as raised:
+            scheduler.call(rate_limited, tokens=1)
+        assert not isinstance(raised.value, CircuitOpenError)
+        assert scheduler.breaker.state == CircuitBreaker.OPEN
+
+        # Igual si el 429 llega al abrir un stream
+        now[0] = 62.0
+
+        def rate_limited_stream():
+            rate_limited()
+            yield  # pragma: no cover
+
+        with pytest.raises(LLMError):
+            list(scheduler.stream(rate_limited_stream, tokens=1))
+        assert scheduler.breaker.state == CircuitBreaker.OPEN
+
+        now[0] = 93.0
+        assert scheduler.call(lambda: ("ok", None), tokens=1) == "ok"
+        assert scheduler.breaker.state == CircuitBreaker.CLOSED
+
+    def test_auto_summary_falls_back_to_local_when_llm_unavailable(self, monkeypatch):
+        summarizer = ArticleSummarizer(groq_api_key="key")
+
+        def unavailable(text, level="detailed"):
+            raise CircuitOpenError("circuit breaker is open")
+
+        monkeypatch.setattr(summarizer, "_summarize_with_groq", unavailable)
+        text = "La agricultura de precisión mejora el rendimiento. " * 10
+        summary, method_used = summarizer.summarize_text(text, method="auto")
+        assert method_used == "local" and summary
+        with pytest.raises(LLMError):
+            summarizer.summarize_text(text, method="groq")
+
+
+class TestChunkedSummarizer:
+    def test_map_phase_runs_chunks_concurrently_in_order(self, monkeypatch):
+        summarizer = ChunkedSummarizer("key", max_concurrency=4)
+        active = []
+        peak = []
+
+        def fake_chunk(chunk, chunk_number, total_chunks, level):
+            active.append(chunk_number)
+            peak.append(len(active))
+            time.sleep(0.1)
+            active.remove(chunk_number)
+            if chunk_number == 3:
+                raise RuntimeError("provider error")
+            return f"summary {chunk_number}"
+
+        monkeypatch.setattr(summarizer, "_summarize_chunk", fake_chunk)
+        chunks = [f"chunk {i}" for i in range(8)]
+
+        start = time.perf_counter()
+        summaries = summarizer._map_chunks(chunks, "detailed")
+        elapsed = time.perf_counter() - start
+
+        assert summaries == [f"summary {i}" for i in (1, 2, 4, 5, 6, 7, 8)]
+        assert max(peak) <= 4
+        # 8 chunks de 0.1 s con 4 a la vez: ~0.2 s en lugar de 0.8 s
+        assert elapsed < 0.6
+
+    def test_tree_reduce_fits_every_prompt_in_budget(self, monkeypatch):
+        summarizer = ChunkedSummarizer("key", max_concurrency=4, reduce_budget_tokens=100)
+        calls = []
+
+        def fake_groq(text, level, is_final=False, custom_prompt=None):
+            calls.append((is_final, custom_prompt))
+            return "intermedio " * 30  # ~80 tokens, más de medio presupuesto
+
+        monkeypatch.setattr(summarizer, "_summarize_with_groq", fake_groq)
+        # 64 resúmenes de ~50 tokens: no caben en un solo prompt
+        summaries = [f"resumen {i:02d} " + "x" * 190 for i in range(64)]
+        summarizer._merge_summaries(summaries, level="exhaustive")
+
+        intermediate = [prompt for final, prompt in calls if not final]
+        finals = [prompt for final, prompt in calls if final]
+        assert len(finals) == 1
+        # Nivel 1: 32 lotes de 2; luego 16, 8, 4, 2 → 62 reducciones intermedias
+        assert len(intermediate) == 62
+        assert all(f"resumen {i:02d}" in "".join(intermediate) for i in range(64))
+        for prompt in intermediate + finals:
+            body = prompt.split("RESÚMENES PARCIALES", 1)[1].rsplit("\n\n", 1)[0]
+            assert estimate_tokens(body) <= 100 + 10  # separadores entre resúmenes
+
+    def test_short_input_reduces_in_one_call(self, monkeypatch):
+        summarizer = ChunkedSummarizer("key", reduce_budget_tokens=6000)
+        calls = []
+        monkeypatch.setattr(
+            summarizer,
+            "_summarize_with_groq",
+            lambda text, level, is_final=False, custom_prompt=None: calls.append(is_final) or "final",
+        )
+        assert summarizer._merge_summaries(["uno", "dos", "tres"], level="detailed") == "final"
+        assert calls == [True]
+
+    def test_stream_reports_chunk_progress_then_tokens(self, monkeypatch):
+        summarizer = ChunkedSummarizer("key", chunk_size_tokens=30, overlap_tokens=5)
+        monkeypatch.setattr(
+            summarizer, "_summarize_chunk", lambda chunk, chunk_number, total_chunks, level: "parcial"
+        )
+        prompts = []
+
+        def fake_stream(text, level, is_final=False, custom_prompt=None):
+            prompts.append(custom_prompt)
+            return iter(["Resumen ", "final"])
+
+        monkeypatch.setattr(summarizer, "_stream_with_groq", fake_stream)
+        events = list(summarizer.stream_long_document("palabra " * 60, level="executive"))
+
+        progress = [data for event, data in events if event == "progress"]
+        assert [p["completed"] for p in progress[:-1]] == list(range(1, len(progress)))
+        assert progress[-2]["total"] == len(progress) - 1
+        assert progress[-1] == {"stage": "reduce", "depth": 1, "batches": 1}
+        assert "".join(data["text"] for event, data in events if event == "token") == "Resumen final"
+        assert "parcial" in prompts[0]
+
+
+class TestTextChunker:
+    @staticmethod
+    def _paragraph(index: int, sentences: int = 6) -> str:
+        return " ".join(
+            f"El párrafo {index} describe la parcela {j} con datos de suelo y clima." for j in range(sentences)
+        )
+
+    def test_token_estimator(self):
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("de la") == 2
+        # Palabras largas y con acentos cuentan más que las cortas
+        assert estimate_tokens("investigación") > estimate_tokens("casa")
+        assert estimate_tokens("2024, 1000000") == 6
+        text = "uno dos tres cuatro cinco seis"
+        assert truncate_to_tokens(text, 3) == "uno dos tres"
+        assert tail_tokens(text, 2) == "cinco seis"
+        assert truncate_to_tokens(text, 100) == text
+
+    def test_packs_whole_paragraphs_under_budget(self):
+        paragraphs = [self._paragraph(i) for i in range(12)]
+        text = "\n".join(paragraphs)
+        chunker = TextChunker(max_tokens=250, overlap_tokens=0)
+
+        chunks = chunker.chunk(text)
+        assert len(chunks) > 1
+        assert all(estimate_tokens(chunk) <= 250 for chunk in chunks)
+        # Ningún párrafo queda partido entre chunks
+        for paragraph in paragraphs:
+            assert any(paragraph in chunk for chunk in chunks)
+        # Chunks llenos: ningún par de chunks consecutivos cabría en uno
+        sizes = [estimate_tokens(chunk) for chunk in chunks]
+        assert all(a + b > 250 for a, b in zip(sizes, sizes[1:]))
+
+    def test_sections_start_new_chunks(self):
+        intro = "\n".join(self._paragraph(i, 3) for i in range(3))
+        methods = "\n".join(self._paragraph(i, 3) for i in range(3, 6))
+        text = f"Introducción\n{intro}\nMetodología\n{methods}"
+        chunker = TextChunker(max_tokens=250, overlap_tokens=20)
+
+        assert len(chunker.chunk(text + "\n" + text)) > 1
+        chunks = chunker.chunk(text, {"introduction": intro, "methodology": methods})
+        assert len(chunks) == 2
+        assert chunks[1].startswith("Metodología")
+        assert "Metodología" not in chunks[0]
+
+    def test_overlap_and_oversized_paragraphs(self):
+        paragraph = " ".join(f"palabra{i}" for i in range(600))  # sin puntos: se corta por tokens
+        chunker = TextChunker(max_tokens=200, overlap_tokens=20)
+
+        chunks = chunker.chunk(paragraph)
+        assert all(estimate_tokens(chunk) <= 200 for chunk in chunks)
+        for previous, chunk in zip(chunks, chunks[1:]):
+            overlap = tail_tokens(previous, 20)
+            assert chunk.startswith(overlap) and 0 < estimate_tokens(overlap) <= 20
+        words = " ".join(chunks).split()
+        assert all(f"palabra{i}" in words for i in range(600))
+
+    @pytest.mark.parametrize("max_tokens,overlap_tokens", [(20, 50), (50, 50), (100, 50), (100, 5), (300, 200)])
+    def test_fuzz_chunks_never_exceed_budget(self, max_tokens, overlap_tokens):
+        import random
+
+        tokens = [
+            "educación", "aprendizaje", "niños", "juego", "2024", "1000000", "sobre-", "¿qué?",
+            "a", "de", "la", "x" * 40, "é" * 30, "música.", "Fin!", "\n", "\n\n",
+        ]
+        rng = random.Random(3)
+        chunker = TextChunker(max_tokens=max_tokens, overlap_tokens=overlap_tokens)
+        for _ in range(60):
+            text = " ".join(rng.choice(tokens) for _ in range(rng.randint(1, 400)))
+            chunks = chunker.chunk(text)
+            assert chunks
+            assert all(estimate_tokens(chunk) <= max_tokens for chunk in chunks)
+
+
+class TestSummaryCache:
+    def test_read_through_and_invalidate(self, db: Session):
+        cache = SummaryCache()
+        key = SummaryKey("a" * 64, "detailed", "groq", "llama", "1")
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return "Resumen", "groq_chunked"
+
+        assert cache.get_or_compute(db, key, compute) == ("Resumen", "groq_chunked", False)
+        assert cache.get_or_compute(db, key, compute) == ("Resumen", "groq_chunked", True)
+        assert len(calls) == 1
+
+        # Otra versión de prompt es otra entrada
+        cache.get_or_compute(db, SummaryKey("a" * 64, "detailed", "groq", "llama", "2"), compute)
+        assert len(calls) == 2
+        assert cache.stats(db) == {"hits": 1, "misses": 2, "hit_rate": 0.3333, "entries": 2}
+
+        assert cache.invalidate(db, "a" * 64) == 2
+        db.commit()
+        assert cache.get(db, key) is None
+
+    def test_summarizer_key(self):
+        article = Article(title="T", file_hash="b" * 64)
+        local = ArticleSummarizer(db=None).summary_key(article, "unknown", "auto")
+        assert (local.level, local.method, local.model) == ("detailed", "local", "")
+        remote = ArticleSummarizer("key", "llama").summary_key(article, "executive", "auto")
+        assert (remote.method, remote.model) == ("groq", "llama")
+        assert ArticleSummarizer().summary_key(Article(title="T"), "detailed", "local") is None
+
+    def test_long_articles_are_cached_from_the_chunked_path(self, db: Session, monkeypatch):
+        from app.api.routes.articles import summarize_articles
+        from app.core.schemas import BatchSummaryRequest
+
+        article = Article(title="Largo", status="active", file_hash="c" * 64)
+        db.add(article)
+        db.commit()
+        monkeypatch.setattr(
+            ArticleSummarizer, "get_article_text", lambda self, article, max_pages=5, truncate=True: "x " * 40000
+        )
+        monkeypatch.setattr(
+            ArticleSummarizer,
+            "summarize_text",
+            lambda self, *args, **kwargs: pytest.fail("the batch must not use the truncated path"),
+        )
+        monkeypatch.setattr(
+            "app.services.summarizer.ChunkedSummarizer.summarize_long_document",
+            lambda self, text, level="detailed", sections=None: ("Resumen completo", "groq_map_reduce"),
+        )
+        monkeypatch.setattr("app.api.routes.articles.settings.groq_api_key", "key")
+
+        response = summarize_articles(BatchSummaryRequest(article_ids=[article.id]), current_user=None, db=db)
+        assert response.results[0].summary == "Resumen completo"
+        assert response.results[0].method == "groq_chunked"
+
+        summary, method_used, cached = ArticleSummarizer("key", db=db).summarize_article_cached(article)
+        assert (summary, method_used, cached) == ("Resumen completo", "groq_chunked", True)
+
+    def test_partial_map_results_are_not_cached(self, db: Session, monkeypatch):
+        article = Article(title="Largo", status="active", file_hash="d" * 64)
+        db.add(article)
+        db.commit()
+        text = "\n".join(f"Sección {i}: el ensayo midió el rendimiento del cultivo." * 8 for i in range(80))
+        monkeypatch.setattr(
+            ArticleSummarizer, "get_article_text", lambda self, article, max_pages=5, truncate=True: text
+        )
+
+        def summarize_chunk(self, chunk, chunk_number, total_chunks, level):
+            if chunk_number == 2:
+                raise LLMError("server error", retryable=True)
+            return "parcial"
+
+        monkeypatch.setattr(ChunkedSummarizer, "_summarize_chunk", summarize_chunk)
+        monkeypatch.setattr(
+            ChunkedSummarizer,
+            "_summarize_with_groq",
+            lambda self, text, level, is_final=False, custom_prompt=None: "final",
+        )
+        monkeypatch.setattr(
+            ChunkedSummarizer,
+            "_stream_with_groq",
+            lambda self, text, level, is_final=False, custom_prompt=None: iter(["final"]),
+        )
+        summarizer = ArticleSummarizer("key", "llama", db=db)
+        key = summarizer.summary_key(article, "detailed", "groq")
+
+        for _ in range(2):
+            assert summarizer.summarize_article_cached(article, "groq") == (
+                "final", "groq_chunked_partial", False
+            )
+        events = list(summarizer.stream_article(article, "groq"))
+        assert events[-1] == ("done", {"method": "groq_chunked_partial", "cached": False})
+        assert get_summary_cache().get(db, key) is None
+
+
+class TestChunkSummaryCache:
+    def test_level_change_only_summarizes_new_chunks(self, db: Session, monkeypatch):
+        paragraphs = [
+            f"Sección {i}: el ensayo {i} midió el rendimiento del cultivo en la parcela {i}." * 8
+            for i in range(40)
+        ]
+        calls = []
+
+        def summarize(text: str) -> int:
+            summarizer = ChunkedSummarizer("key", "llama", chunk_size_tokens=300, overlap_tokens=0, db=db)
+            monkeypatch.setattr(
+                summarizer,
+                "_summarize_chunk",
+                lambda chunk, chunk_number, total_chunks, level: calls.append(chunk) or "parcial",
+            )
+            monkeypatch.setattr(
+                summarizer,
+                "_summarize_with_groq",
+                lambda text, level, is_final=False, custom_prompt=None: "final",
+            )
+            before = len(calls)
+            summarizer.summarize_long_document(text, level="executive")
+            return len(calls) - before
+
+        short, full = "\n".join(paragraphs[:20]), "\n".join(paragraphs)
+        chunker = TextChunker(max_tokens=300, overlap_tokens=0)
+        short_chunks, full_chunks = chunker.chunk(short), chunker.chunk(full)
+
+        assert summarize(short) == len(short_chunks)
+        # Mismo prefijo con más páginas (otro nivel): sólo se resumen los chunks nuevos
+        assert summarize(full) == len(set(full_chunks) - set(short_chunks)) < len(full_chunks) - 1
+        assert summarize(full) == 0
+        assert get_chunk_summary_cache().stats(db)["entries"] == len(set(calls))
+
+
+class TestNearDuplicateIndex:
+    def _text(self, seed: int, words: int = 3000) -> str:
+        import random
+
+        rng = random.Random(seed)
+        vocabulary = "juego desarrollo infantil niño aprendizaje escuela juguete cultura maestro".split()
+        return " ".join(rng.choice(vocabulary) for _ in range(words))
+
+    def test_signature_similarity(self):
+        index = NearDuplicateIndex()
+        original = self._text(1)
+        words = original.split()
+        # Same paper re-encoded: a page header inserted, the tail cut off and accents dropped
+        reencoded = " ".join(words[:1500] + ["Página", "2"] + words[1500:2900]).replace("ñ", "n")
+
+        first, second = index.signature(original), index.signature(reencoded)
+        assert index.similarity(first, second) > 0.9
+        assert index.similarity(first, index.signature(self._text(2))) < 0.2
+        assert index.signature("demasiado corto") is None
+
+    def test_find_similar_uses_lsh_buckets(self, db: Session):
+        index = NearDuplicateIndex()
+        original = Article(title="Original", status="active")
+        other = Article(title="Other", status="active")
+        db.add_all([original, other])
+        db.commit()
+        index.add(db, original.id, index.signature(self._text(1)))
+        index.add(db, other.id, index.signature(self._text(2)))
+        db.commit()
+
+        matches = index.find_similar(db, index.signature(self._text(1)[:-20]))
+        assert [article_id for article_id, _ in matches] == [original.id]
+
 
 class TestArticleClassifier:
     def test_classifier_initialization(self):
@@ -85,6 +85,10 @@ export default function Upload() {
 
       if (!response) return;
 
+      setUploadProgress([{ ...newProgress, status: "uploading", progress: 30 }]);
+      const job = await articlesAPI.waitForIngestion(response.data.id);
+      response = await articlesAPI.get(job.article_id!);
+
       const articleId = response.data.id;
       const autoTopics = response.data.auto_topics || [];
       setUploadProgress([{ ...newProgress, status: "uploading", progress: 50, articleId, autoTopics }]);
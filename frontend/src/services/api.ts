@@ -115,6 +115,17 @@ export interface BatchSummaryResponse {
   combined_method?: string;
 }
 
+export interface IngestionJob {
+  id: string;
+  article_id?: number;
+  status: "queued" | "running" | "completed" | "failed";
+  stage?: string;
+  stages: Record<string, { status: string; detail?: Record<string, any> }>;
+  error?: string;
+  created_at: string;
+  updated_at: string;
+}
+
 export const articlesAPI = {
   list: (filters?: ArticleFilters) =>
     apiClient.get("/api/articles/", { params: filters }),
@@ -133,6 +144,23 @@ export const articlesAPI = {
       category_id: categoryId,
     });
   },
+  getJob: (jobId: string) =>
+    apiClient.get<IngestionJob>(`/api/articles/jobs/${jobId}`),
+  waitForIngestion: async (
+    jobId: string,
+    intervalMs = 1000,
+    timeoutMs = 10 * 60 * 1000,
+  ): Promise<IngestionJob> => {
+    // Uploads return 202 with a job; poll until the background stages finish
+    const deadline = Date.now() + timeoutMs;
+    for (;;) {
+      const { data: job } = await articlesAPI.getJob(jobId);
+      if (job.status === "completed") return job;
+      if (job.status === "failed") throw new Error(job.error || "Ingestion failed");
+      if (Date.now() >= deadline) throw new Error("Ingestion is taking too long; check the article later");
+      await new Promise((resolve) => setTimeout(resolve, intervalMs));
+    }
+  },
   update: (id: number, data: any) =>
     apiClient.put(`/api/articles/${id}`, data),
   delete: (id: number) => apiClient.delete(`/api/articles/${id}`),